@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the pre-commit hook on a generated tree
+
+Creates a git repository with `--files` test files, then stages `--staged` of them with
+new, untagged requirements and times the hook, both in process and as the command pre-commit runs.
+Exits with 1 when the median of either is over the latency budget of the hook.
+
+    python benchmarks/bench_precommit.py --files 2000 --staged 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TAGGED = '''
+def test_tagged_{index}():
+    """
+    TEST INFO: {{"test_id": {index}, "time_stamp": "2016-07-01T10:45:56.539011"}}
+    TEST DESCRIPTION BEGIN
+    Requirement number {index} shall hold
+    TEST DESCRIPTION END
+    """
+'''
+
+UNTAGGED = '''
+def test_new_{index}_{run}():
+    """
+    TEST INFO:
+    TEST DESCRIPTION BEGIN
+    A new requirement
+    TEST DESCRIPTION END
+    """
+'''
+
+
+def create_tree(path, files, per_file):
+    package = os.path.join(path, 'tests')
+    os.makedirs(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+
+    index = 0
+    for number in range(files):
+        with open(os.path.join(package, 'test_file_{0}.py'.format(number)), 'w') as f:
+            for _ in range(per_file):
+                index += 1
+                f.write(TAGGED.format(index=index))
+
+    subprocess.run(['git', 'init', '-q'], cwd=path, check=True)
+    subprocess.run(['git', 'add', '.'], cwd=path, check=True)
+    subprocess.run(['git', '-c', 'user.name=bench', '-c', 'user.email=bench@example.com',
+                    'commit', '-q', '-m', 'tree'], cwd=path, check=True)
+
+
+def stage_changes(path, staged, run):
+    filenames = []
+
+    for number in range(staged):
+        filename = os.path.join('tests', 'test_file_{0}.py'.format(number))
+        with open(os.path.join(path, filename), 'a') as f:
+            f.write(UNTAGGED.format(index=number, run=run))
+        filenames.append(filename)
+
+    subprocess.run(['git', 'add', '--'] + filenames, cwd=path, check=True)
+
+    return filenames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the pre-commit hook')
+    parser.add_argument('--files', type=int, default=2000, help='Files in the tree')
+    parser.add_argument('--per-file', type=int, default=5, help='Tagged requirements in each file')
+    parser.add_argument('--staged', type=int, default=5, help='Files staged for each commit')
+    parser.add_argument('--runs', type=int, default=10, help='Commits to time')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, PACKAGE_ROOT)
+    from easy_python_requirements import precommit
+
+    with tempfile.TemporaryDirectory() as path:
+        create_tree(path, args.files, args.per_file)
+        os.chdir(path)
+
+        start = time.perf_counter()
+        precommit.reserve_tree_ids('tests')
+        print('Reading the test ids of {0} files: {1:.0f} ms'.format(args.files, (time.perf_counter() - start) * 1000))
+
+        in_process = []
+        for run in range(args.runs):
+            filenames = stage_changes(path, args.staged, run)
+            start = time.perf_counter()
+            precommit.main(['--root', 'tests'] + filenames)
+            in_process.append(time.perf_counter() - start)
+
+        command = []
+        environment = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+        for run in range(args.runs, 2 * args.runs):
+            filenames = stage_changes(path, args.staged, run)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-m', 'easy_python_requirements.precommit', '--root', 'tests']
+                           + filenames, env=environment, check=True, stdout=subprocess.DEVNULL)
+            command.append(time.perf_counter() - start)
+
+        untagged = subprocess.run(['git', 'grep', '-c', 'TEST INFO:$'], stdout=subprocess.PIPE,
+                                  universal_newlines=True).stdout
+        if untagged.strip():
+            print('Some staged requirements were not tagged:\n' + untagged)
+            return 1
+
+    over_budget = False
+    for name, timings in (('In process', in_process), ('Command', command)):
+        print('{0}: median {1:.1f} ms, max {2:.1f} ms, for {3} staged of {4} files'.format(
+            name, statistics.median(timings) * 1000, max(timings) * 1000, args.staged, args.files))
+
+        if statistics.median(timings) > precommit.LATENCY_BUDGET:
+            print('{0}: over the budget of {1:.0f} ms'.format(name, precommit.LATENCY_BUDGET * 1000))
+            over_budget = True
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,4 +3,5 @@ config = {
     'requirement_end': 'TEST DESCRIPTION END',
     'requirement_info': 'TEST INFO:',
     'info_format': ['test_id', 'time_stamp'],
+    'desc_hash': False,
 }
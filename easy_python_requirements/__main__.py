@@ -0,0 +1,5 @@
+import sys
+
+from easy_python_requirements.easy_python_requirements import main
+
+sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio API, to scan requirements from an event loop without blocking it
+
+Files are read from source, nothing is imported. Reading and parsing run in an executor.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.records import FileRecord
+from easy_python_requirements.source import read_source, record_source
+from easy_python_requirements.update import find_files
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_CONCURRENCY = 8
+
+
+def record_source_file(filename):
+    """
+    Record the requirements of a file from its source
+
+    Returns:
+        FileRecord: The record of the file, skipped if it could not be read or parsed
+    """
+    start = time.perf_counter()
+
+    try:
+        requirements = record_source(read_source(filename), filename)
+    except (SyntaxError, UnicodeDecodeError, ValueError, MultipleStringError, OSError) as e:
+        logger.warning('Could not record %s: %s', filename, str(e))
+        return FileRecord(filename, elapsed=time.perf_counter() - start, skipped=True, reason=str(e))
+
+    return FileRecord(filename, requirements, time.perf_counter() - start)
+
+
+async def _record_files(filenames, concurrency, executor):
+    loop = asyncio.get_running_loop()
+    filenames = iter(filenames)
+    pending = set()
+
+    try:
+        while True:
+            while len(pending) < concurrency:
+                filename = next(filenames, None)
+                if filename is None:
+                    break
+                pending.add(loop.run_in_executor(executor, record_source_file, filename))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def iter_file_records(foldername, recursive=True, concurrency=DEFAULT_CONCURRENCY, executor=None):
+    """
+    Record the files of a folder in an executor, yielding each file as soon as it is done
+
+    At most `concurrency` files are in the executor at once. Closing or cancelling the
+    iteration cancels the files that have not started yet.
+
+    Args:
+        foldername (str or list): The folder to scan, or a list of folders
+        recursive (bool): Scan the packages inside of the folder as well
+        concurrency (int): The number of files to record at the same time
+        executor (concurrent.futures.Executor): Where to run the work, None for the loop's default executor
+
+    Yields:
+        FileRecord: The record of each file, in the order they finish
+    """
+    loop = asyncio.get_running_loop()
+    filenames = await loop.run_in_executor(executor, find_files, foldername, recursive)
+
+    records = _record_files(filenames, concurrency, executor)
+    try:
+        async for file_record in records:
+            yield file_record
+    finally:
+        # Cancel the pending files now, not when the generator is garbage collected
+        await records.aclose()
+
+
+async def iter_requirements(foldername, recursive=True, concurrency=DEFAULT_CONCURRENCY, executor=None):
+    """
+    Record the requirements of a folder, see `iter_file_records`
+
+    Yields:
+        RequirementRecord: The record of each requirement, a file at a time in the order the files finish
+    """
+    records = iter_file_records(foldername, recursive, concurrency, executor)
+    try:
+        async for file_record in records:
+            for requirement in file_record.requirements:
+                yield requirement
+    finally:
+        await records.aclose()
+
+
+async def scan_folder(foldername, recursive=True, concurrency=DEFAULT_CONCURRENCY, executor=None):
+    """
+    Record every file of a folder, see `iter_file_records`
+
+    Returns:
+        OrderedDict: file name -> `FileRecord`, in the order of the files in the folder
+    """
+    loop = asyncio.get_running_loop()
+    filenames = await loop.run_in_executor(executor, find_files, foldername, recursive)
+    recorded = {}
+
+    async for file_record in _record_files(filenames, concurrency, executor):
+        recorded[file_record.filename] = file_record
+
+    return OrderedDict((filename, recorded[filename]) for filename in filenames)
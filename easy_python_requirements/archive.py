@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Read requirements from the python files inside of zip, wheel and tar archives, without extracting them
+"""
+
+import importlib.util
+import logging
+import sys
+import tarfile
+import zipfile
+from collections import OrderedDict
+
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.source import record_source
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+ZIP_SUFFIXES = ('.zip', '.whl')
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+def is_archive(path):
+    return isinstance(path, str) and path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def member_name(archive, member):
+    """
+    Get the name the requirements of an archive member are recorded with, i.e. `dist.whl/package/test_file.py`
+    """
+    return archive + '/' + member
+
+
+def iter_archive_sources(archive):
+    """
+    Read the python files of an archive, one member at a time
+
+    Tar archives are read as a stream, in a single pass.
+
+    Args:
+        archive (str): The .zip, .whl or .tar(.gz, .bz2, .xz) file
+
+    Yields:
+        (str, bytes): The name of each python file inside of the archive and its contents
+    """
+    if archive.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(archive) as opened:
+            for info in opened.infolist():
+                if not info.is_dir() and info.filename.endswith('.py'):
+                    yield info.filename, opened.read(info)
+    else:
+        with tarfile.open(archive, 'r|*') as opened:
+            for info in opened:
+                if info.isfile() and info.name.endswith('.py'):
+                    yield info.name, opened.extractfile(info).read()
+
+
+def record_archive(archive):
+    """
+    Record the requirements of the python files inside of an archive
+
+    Returns:
+        OrderedDict: `member_name` -> (the `RequirementRecord` objects, None or why the member could not be recorded)
+    """
+    recorded = OrderedDict()
+
+    for member, contents in iter_archive_sources(archive):
+        filename = member_name(archive, member)
+
+        try:
+            recorded[filename] = (record_source(importlib.util.decode_source(contents), filename), None)
+        except (SyntaxError, ValueError, MultipleStringError) as e:
+            logger.warning('Could not record %s: %s', filename, str(e))
+            recorded[filename] = ([], str(e))
+
+    return recorded
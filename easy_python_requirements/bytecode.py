@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Read docstrings from the compiled `__pycache__` files of a tree, without parsing or importing the source
+
+A `.pyc` file is only used when its header shows it was compiled from the current source,
+otherwise the source is parsed as usual.
+"""
+
+import dis
+import importlib.util
+import inspect
+import logging
+import marshal
+import os
+import struct
+import sys
+
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.source import SourceDocstring, read_source, record_source
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+PYC_HEADER = struct.Struct('<4sI8s')
+FLAG_HASH_BASED = 1
+
+# Python 3.14 flags the functions with a docstring, before it the first constant is the docstring or None
+CO_HAS_DOCSTRING = getattr(inspect, 'CO_HAS_DOCSTRING', None)
+CLASS_FLAGS = inspect.CO_OPTIMIZED | inspect.CO_NEWLOCALS
+
+
+def read_fresh_pyc(filename):
+    """
+    Read the code of the compiled `__pycache__` file of a source file, if it is up to date
+
+    The header of the `.pyc` file has to match the source modification time and size,
+    or for hash based files, the hash of the source.
+
+    Returns:
+        code: The module code object, None if there is no fresh `.pyc` file
+    """
+    try:
+        pyc_name = importlib.util.cache_from_source(filename)
+        with open(pyc_name, 'rb') as f:
+            data = f.read()
+        stat = os.stat(filename)
+    except (OSError, NotImplementedError, ValueError):
+        return None
+
+    if len(data) <= PYC_HEADER.size:
+        return None
+
+    magic, flags, validation = PYC_HEADER.unpack_from(data)
+    if magic != importlib.util.MAGIC_NUMBER:
+        return None
+
+    if flags & FLAG_HASH_BASED:
+        with open(filename, 'rb') as f:
+            if importlib.util.source_hash(f.read()) != validation:
+                return None
+    else:
+        mtime, size = struct.unpack('<II', validation)
+        if mtime != int(stat.st_mtime) & 0xFFFFFFFF or size != stat.st_size & 0xFFFFFFFF:
+            return None
+
+    try:
+        return marshal.loads(data[PYC_HEADER.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def code_docstring(code):
+    """
+    Get the docstring of a class body or function code object, None if it has none
+    """
+    if code.co_flags & CLASS_FLAGS != CLASS_FLAGS:
+        # A class body stores its docstring in `__doc__`
+        previous = None
+        for instruction in dis.get_instructions(code):
+            if instruction.opname == 'STORE_NAME' and instruction.argval == '__doc__':
+                return previous if isinstance(previous, str) else None
+            previous = instruction.argval if instruction.opname == 'LOAD_CONST' else None
+
+        return None
+
+    if CO_HAS_DOCSTRING is not None and not code.co_flags & CO_HAS_DOCSTRING:
+        return None
+    if code.co_consts and isinstance(code.co_consts[0], str):
+        return code.co_consts[0]
+
+    return None
+
+
+def _iter_code(code, prefix=''):
+    for const in code.co_consts:
+        if not inspect.iscode(const) or const.co_name.startswith('<'):
+            continue
+
+        qualname = getattr(const, 'co_qualname', prefix + const.co_name)
+        if const.co_flags & CLASS_FLAGS != CLASS_FLAGS:
+            yield qualname, 'class', const
+            yield from _iter_code(const, qualname + '.')
+        else:
+            yield qualname, 'function', const
+
+
+def iter_bytecode_docstrings(code, filename):
+    """
+    Find the docstrings of the classes and functions in a module code object
+
+    Classes are searched recursively, function bodies are not. Unlike `iter_docstrings`,
+    definitions nested in module level statements such as `if` blocks are found as well.
+
+    Yields:
+        SourceDocstring: Each docstring, in source order. The line of the docstring itself is not known.
+    """
+    found = []
+
+    for qualname, obj_type, const in _iter_code(code):
+        docstring = code_docstring(const)
+        if docstring is not None:
+            found.append(SourceDocstring(const.co_name, qualname, obj_type, filename,
+                                         const.co_firstlineno, docstring, None))
+
+    yield from sorted(found, key=lambda docstring: docstring.line_number)
+
+
+def record_bytecode(filename):
+    """
+    Record the requirements of a file from its compiled `__pycache__` file
+
+    Returns:
+        list: The `RequirementRecord` objects, None if there is no fresh `.pyc` file
+    """
+    code = read_fresh_pyc(filename)
+    if code is None:
+        return None
+
+    matcher = get_matcher()
+    requirements = []
+
+    for docstring in iter_bytecode_docstrings(code, filename):
+        if not matcher.search(docstring.docstring):
+            continue
+
+        requirement = docstring.to_record()
+        if requirement is not None:
+            requirements.append(requirement)
+
+    return requirements
+
+
+def record_compiled(filename):
+    """
+    Record the requirements of a file, from its `.pyc` file when it is fresh and from its source otherwise
+
+    Returns:
+        list: The `RequirementRecord` objects
+    """
+    requirements = record_bytecode(filename)
+
+    if requirements is None:
+        logger.debug('No fresh compiled file for %s, parsing the source', filename)
+        requirements = record_source(read_source(filename), filename)
+
+    return requirements
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from easy_python_requirements import config
+from easy_python_requirements.archive import is_archive, member_name, record_archive
+from easy_python_requirements.bytecode import record_compiled
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.search import SearchIndex
+from easy_python_requirements.source import read_source, record_source
+from easy_python_requirements.update import find_files
+from easy_python_requirements.util import file_signature
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = '.easy_python_requirements_cache.json'
+
+
+class CachedFile:
+    """
+    The requirement records of a file, as of its signature
+
+    Attributes:
+        filename (str): The name of the file
+        signature (list): The `file_signature` of the file when it was recorded
+        requirements (list): The `RequirementRecord` objects of the file
+        error (str): Why the file could not be recorded, None if it could
+    """
+
+    def __init__(self, filename, signature, requirements=None, error=None):
+        self.filename = filename
+        self.signature = signature
+        self.requirements = requirements if requirements is not None else []
+        self.error = error
+
+    def to_dict(self):
+        return {
+            'signature': self.signature,
+            'requirements': [requirement.to_dict() for requirement in self.requirements],
+            'error': self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, filename, data):
+        return cls(filename,
+                   data['signature'],
+                   [RequirementRecord(**requirement) for requirement in data['requirements']],
+                   data['error'],
+                   )
+
+
+class ParseCache:
+    """
+    Requirement records of source files, where a file is only parsed again when it changes
+
+    Files are read from source, nothing is imported.
+
+    Args:
+        index (SearchIndex): A search index to keep up to date with the cache, None for no index
+        compiled (bool): Read the docstrings from fresh `__pycache__` files when there are any,
+            see `record_compiled`
+
+    Attributes:
+        files (OrderedDict): file name -> `CachedFile`
+    """
+
+    def __init__(self, index=None, compiled=False):
+        self.files = OrderedDict()
+        self.index = index
+        self.compiled = compiled
+
+    def record(self, filename, signature):
+        try:
+            if self.compiled:
+                requirements = record_compiled(filename)
+            else:
+                requirements = record_source(read_source(filename), filename)
+        except (SyntaxError, UnicodeDecodeError, ValueError, MultipleStringError) as e:
+            logger.warning('Could not record %s: %s', filename, str(e))
+            return CachedFile(filename, signature, error=str(e))
+
+        return CachedFile(filename, signature, requirements)
+
+    def refresh(self, filenames, max_workers=None):
+        """
+        Bring the cache up to date with a list of files
+
+        Changed files are parsed in parallel.
+
+        Args:
+            filenames (list): Every file that should be in the cache
+            max_workers (int): The number of files to parse at the same time
+
+        Returns:
+            (list, list): The names of the changed or new files, and the names of the removed files
+        """
+        changed = []
+        wanted = set(filenames)
+        removed = [filename for filename in self.files if filename not in wanted]
+
+        for filename in removed:
+            del self.files[filename]
+
+        refreshed = OrderedDict()
+        for filename in filenames:
+            signature = file_signature(filename)
+            cached = self.files.get(filename)
+
+            if cached is None or cached.signature != signature:
+                cached = signature
+                changed.append(filename)
+
+            refreshed[filename] = cached
+
+        if changed:
+            with ThreadPoolExecutor(max_workers) as executor:
+                recorded = executor.map(lambda filename: self.record(filename, refreshed[filename]), changed)
+
+                for cached in recorded:
+                    refreshed[cached.filename] = cached
+
+        self.files = refreshed
+
+        if self.index is not None:
+            for filename in removed:
+                self.index.remove_file(filename)
+            for filename in changed:
+                self.index.update_file(filename, self.files[filename].requirements)
+
+        return changed, removed
+
+    def refresh_folder(self, foldername, recursive=True, max_workers=None):
+        """
+        Bring the cache up to date with a folder, or with several folders that share the cache,
+        or with an archive, see `refresh_archive`
+        """
+        if is_archive(foldername):
+            return self.refresh_archive(foldername)
+
+        return self.refresh(find_files(foldername, recursive), max_workers)
+
+    def refresh_archive(self, archive):
+        """
+        Bring the cache up to date with the python files inside of an archive, without extracting it
+
+        The files are recorded as `archive/member`, and recorded again only when the archive changes.
+
+        Returns:
+            (list, list): The names of the changed or new files, and the names of the removed files
+        """
+        signature = file_signature(archive)
+
+        # An archive is replaced as a whole, so its members share its signature
+        if self.files and all(cached.signature == signature and cached.filename.startswith(member_name(archive, ''))
+                              for cached in self.files.values()):
+            return [], []
+
+        removed = list(self.files)
+        self.files = OrderedDict(
+            (filename, CachedFile(filename, signature, requirements, error))
+            for filename, (requirements, error) in record_archive(archive).items()
+        )
+        changed = list(self.files)
+
+        if self.index is not None:
+            for filename in removed:
+                self.index.remove_file(filename)
+            for filename in changed:
+                self.index.update_file(filename, self.files[filename].requirements)
+
+        return changed, [filename for filename in removed if filename not in self.files]
+
+    def iter_requirements(self):
+        for cached in self.files.values():
+            yield from cached.requirements
+
+    def save(self, filename=DEFAULT_CACHE_FILE):
+        """
+        Save the cache, and its search index, to a JSON file
+        """
+        data = {
+            'version': CACHE_VERSION,
+            'config': config,
+            'files': OrderedDict((name, cached.to_dict()) for name, cached in self.files.items()),
+            'index': self.index.to_dict() if self.index is not None else None,
+        }
+
+        with open(filename, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_CACHE_FILE, index=False, compiled=False):
+        """
+        Load a cache saved with `save`
+
+        A cache that is missing, unreadable, or saved with other settings is started over.
+
+        Args:
+            filename (str): The cache file
+            index (bool): Keep a search index with the cache
+            compiled (bool): Read changed files from fresh `__pycache__` files when there are any
+
+        Returns:
+            ParseCache: The cache
+        """
+        cache = cls(SearchIndex() if index else None, compiled)
+
+        # The settings of the project have to be loaded before comparing them with the saved ones
+        get_matcher()
+
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if data.get('version') != CACHE_VERSION or data.get('config') != config:
+            logger.info('Ignoring cache %s, it was saved with other settings', filename)
+            return cache
+
+        for name, cached in data['files'].items():
+            cache.files[name] = CachedFile.from_dict(name, cached)
+
+        if index:
+            if data['index'] is not None:
+                cache.index = SearchIndex.from_dict(data['index'])
+            else:
+                for name, cached in cache.files.items():
+                    cache.index.update_file(name, cached.requirements)
+
+        return cache
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import sys
+
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.parsed import parse_doc
+from easy_python_requirements.source import iter_docstrings, read_source
+from easy_python_requirements.update import find_files
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class Violation:
+    """
+    A requirement that `update_file` would have to change
+
+    Attributes:
+        filename (str): The file of the requirement
+        line (int): The TEST INFO line, or the docstring line if there is none
+        qualname (str): The object whose docstring holds the requirement
+        reason (str): What is wrong
+    """
+
+    def __init__(self, filename, line, qualname, reason):
+        self.filename = filename
+        self.line = line
+        self.qualname = qualname
+        self.reason = reason
+
+    def to_dict(self):
+        return {'filename': self.filename, 'line': self.line, 'qualname': self.qualname, 'reason': self.reason}
+
+    def __repr__(self):
+        return '<Violation: {0}:{1} {2}>'.format(self.filename, self.line, self.reason)
+
+
+def check_file(filename, fail_fast=False):
+    """
+    Find the requirements of a file that require an update, without writing anything
+
+    Args:
+        filename (str): The file to check
+        fail_fast (bool): Stop at the first violation
+
+    Returns:
+        list: The `Violation` objects found
+    """
+    violations = []
+
+    source = read_source(filename)
+    if not get_matcher().search(source):
+        return violations
+
+    try:
+        docstrings = list(iter_docstrings(source, filename))
+    except SyntaxError as e:
+        return [Violation(filename, e.lineno, None, 'Syntax error: {0}'.format(e.msg))]
+
+    for docstring in docstrings:
+        info_lines = docstring.info_lines()
+        line = info_lines[0][0] + 1 if info_lines else docstring.doc_line
+
+        try:
+            obj_dict = parse_doc(docstring.docstring)
+        except MultipleStringError:
+            violations.append(Violation(filename, line, docstring.qualname, 'Multiple TEST INFO lines'))
+        else:
+            if obj_dict['description'] is None or not obj_dict['requires_update']:
+                continue
+
+            if info_lines:
+                reason = 'TEST INFO is missing or not valid'
+            else:
+                reason = 'No TEST INFO line'
+            violations.append(Violation(filename, line, docstring.qualname, reason))
+
+        if fail_fast:
+            break
+
+    return violations
+
+
+def check_folder(path, recursive=True, fail_fast=False):
+    """
+    Find the requirements of a folder that require an update, without writing anything
+
+    Args:
+        path (str): The folder to check
+        recursive (bool): Check the packages inside of the folder as well
+        fail_fast (bool): Stop at the first violation
+
+    Returns:
+        list: The `Violation` objects found
+    """
+    violations = []
+
+    for filename in find_files(path, recursive):
+        violations.extend(check_file(filename, fail_fast))
+
+        if fail_fast and violations:
+            break
+
+    return violations
+
+
+def violations_to_json(violations):
+    return json.dumps([violation.to_dict() for violation in violations])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thin client for the requirement daemon.
+
+It only imports the standard library, so it starts quickly.
+"""
+
+import argparse
+import http.client
+import socket
+import sys
+from urllib.parse import urlencode
+
+DEFAULT_PORT = 8765
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=10):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def query(path, host='127.0.0.1', port=DEFAULT_PORT, socket_path=None, method='GET', timeout=10):
+    """
+    Send a query to the daemon
+
+    Returns:
+        (int, str): The HTTP status and the body of the answer
+    """
+    if socket_path is not None:
+        connection = UnixHTTPConnection(socket_path, timeout)
+    else:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    try:
+        connection.request(method, path)
+        response = connection.getresponse()
+        return response.status, response.read().decode('utf-8')
+    finally:
+        connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query a running requirement daemon')
+    parser.add_argument('query', choices=['requirements', 'search', 'report', 'status', 'refresh'],
+                        help='What to ask the daemon for')
+    parser.add_argument('filters', nargs='*',
+                        help='Filters of the form key=value, i.e. file=test/test_file.py, test_id=4 or q=timeout')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', dest='socket_path', default=None,
+                        help='Unix domain socket of the daemon, instead of host and port')
+
+    args = parser.parse_args(argv)
+
+    path = '/' + args.query
+    if args.filters:
+        path += '?' + urlencode([f.partition('=')[::2] for f in args.filters])
+
+    try:
+        status, body = query(path, args.host, args.port, args.socket_path,
+                             'POST' if args.query == 'refresh' else 'GET')
+    except OSError as e:
+        sys.stderr.write('Could not reach the daemon: {0}\n'.format(e))
+        return 2
+
+    sys.stdout.write(body)
+    if not body.endswith('\n'):
+        sys.stdout.write('\n')
+
+    return 0 if status == 200 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from easy_python_requirements.cache import ParseCache
+from easy_python_requirements.fragments import FragmentCache
+from easy_python_requirements.report import requirements_to_markdown
+from easy_python_requirements.search import SearchIndex
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_PORT = 8765
+
+
+class RequirementDaemon:
+    """
+    Keep the requirements of a folder in memory, and up to date while its files change
+
+    Args:
+        foldername (str): The folder to serve
+        recursive (bool): Serve the packages inside of the folder as well
+        interval (float): Seconds between checks for changed files
+    """
+
+    def __init__(self, foldername, recursive=True, interval=1.0):
+        self.foldername = foldername
+        self.recursive = recursive
+        self.interval = interval
+        self.cache = ParseCache(SearchIndex())
+        self.fragments = FragmentCache()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.last_refresh = None
+
+    def refresh(self):
+        """
+        Parse the files that changed since the last refresh
+
+        Returns:
+            (list, list): The names of the changed or new files, and the names of the removed files
+        """
+        with self.lock:
+            changed, removed = self.cache.refresh_folder(self.foldername, self.recursive)
+            self.last_refresh = time.time()
+
+        if changed or removed:
+            logger.info('Refreshed %d changed and %d removed files', len(changed), len(removed))
+
+        return changed, removed
+
+    def watch(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Could not refresh %s', self.foldername)
+
+    def requirements(self, params=None):
+        """
+        Get the requirements, optionally filtered
+
+        Args:
+            params (dict): Filters, each a list of accepted values:
+                `file`, `test_id`, `qualname`, `requires_update` and `modified`
+
+        Returns:
+            list: The matching `RequirementRecord` objects
+        """
+        params = params or {}
+
+        with self.lock:
+            requirements = list(self.cache.iter_requirements())
+
+        if 'file' in params:
+            files = set(os.path.normpath(f) for f in params['file'])
+            requirements = [r for r in requirements if os.path.normpath(r.filename) in files]
+        if 'test_id' in params:
+            test_ids = set(int(test_id) for test_id in params['test_id'])
+            requirements = [r for r in requirements if r.test_id in test_ids]
+        if 'qualname' in params:
+            requirements = [r for r in requirements if r.qualname in params['qualname']]
+        for flag in ('requires_update', 'modified'):
+            if flag in params:
+                wanted = params[flag][0].lower() in ('1', 'true', 'yes')
+                requirements = [r for r in requirements if getattr(r, flag) is wanted]
+
+        return requirements
+
+    def query(self, path, params):
+        """
+        Answer a request
+
+        Returns:
+            (int, str, str): The HTTP status, the content type and the body
+        """
+        if path == '/requirements':
+            body = json.dumps([r.to_dict() for r in self.requirements(params)])
+            return 200, 'application/json', body
+        elif path == '/search':
+            with self.lock:
+                hits = self.cache.index.search(' '.join(params.get('q', [])))
+            return 200, 'application/json', json.dumps([hit.to_dict() for hit in hits])
+        elif path == '/report':
+            signatures = None
+            # Filters other than `file` keep parts of files, which do not match the signature of the whole file.
+            # Signatures are taken before the requirements, so a refresh in between never stores an old render under a new signature
+            if set(params) <= {'file'}:
+                with self.lock:
+                    signatures = {name: cached.signature for name, cached in self.cache.files.items()}
+
+            requirements = self.requirements(params)
+            with self.lock:
+                body = requirements_to_markdown(requirements, self.fragments, signatures)
+            return 200, 'text/markdown', body
+        elif path == '/status':
+            with self.lock:
+                status = {
+                    'folder': self.foldername,
+                    'files': len(self.cache.files),
+                    'requirements': sum(len(c.requirements) for c in self.cache.files.values()),
+                    'last_refresh': self.last_refresh,
+                }
+            return 200, 'application/json', json.dumps(status)
+        elif path == '/refresh':
+            changed, removed = self.refresh()
+            return 200, 'application/json', json.dumps({'changed': changed, 'removed': removed})
+
+        return 404, 'text/plain', 'Unknown query {0}\n'.format(path)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        try:
+            status, content_type, body = self.server.daemon.query(url.path, parse_qs(url.query))
+        except ValueError as e:
+            status, content_type, body = 400, 'text/plain', str(e) + '\n'
+
+        encoded = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type + '; charset=utf-8')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    do_POST = do_GET
+
+    def address_string(self):
+        # Unix domain socket clients have no address
+        return str(self.client_address[0]) if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        logger.debug('%s - %s', self.address_string(), format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(daemon, host='127.0.0.1', port=DEFAULT_PORT, socket_path=None):
+    """
+    Create the server of a daemon, on a Unix domain socket if `socket_path` is set,
+    and on localhost HTTP otherwise
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+
+    server.daemon = daemon
+
+    return server
+
+
+def serve(foldername, host='127.0.0.1', port=DEFAULT_PORT, socket_path=None, recursive=True, interval=1.0):
+    """
+    Serve the requirements of a folder until interrupted
+    """
+    daemon = RequirementDaemon(foldername, recursive, interval)
+    daemon.refresh()
+
+    watcher = threading.Thread(target=daemon.watch, daemon=True)
+    watcher.start()
+
+    server = create_server(daemon, host, port, socket_path)
+    logger.info('Serving %s on %s', foldername, socket_path or '{0}:{1}'.format(host, port))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stopped.set()
+        server.server_close()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import re
+import sys
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DOCUMENT_CONFIG = '.doorstop.yml'
+
+
+def item_uid(test_id: int, prefix='REQ', digits=3, sep=''):
+    """
+    Get the Doorstop UID of a test id, i.e. REQ004
+    """
+    return '{0}{1}{2:0{3}d}'.format(prefix, sep, test_id, digits)
+
+
+def item_pattern(prefix='REQ', digits=3, sep=''):
+    """
+    Compile a pattern that matches the item file names of `item_uid`, i.e. REQ004.yml but not REQUIREMENTS.yml
+    """
+    return re.compile(r'^{0}{1}\d{{{2},}}\.yml$'.format(re.escape(prefix), re.escape(sep), digits))
+
+
+def item_attributes(requirement):
+    """
+    Map a requirement record to the attributes of a Doorstop item
+
+    Args:
+        requirement (RequirementRecord): The requirement to map
+
+    Returns:
+        dict: The item attributes
+    """
+    return {
+        'active': True,
+        'derived': False,
+        'header': requirement.qualname,
+        'level': '1.{0}'.format(requirement.test_id),
+        'links': [],
+        'normative': True,
+        'ref': '',
+        'references': [{'path': requirement.filename.replace('\\', '/'), 'type': 'file'}],
+        'reviewed': None,
+        'text': requirement.description + '\n',
+    }
+
+
+def item_content(requirement):
+    return yaml.safe_dump(item_attributes(requirement), default_flow_style=False)
+
+
+def write_if_changed(filename, content):
+    """
+    Write the content to a file, unless the file already contains it
+
+    Returns:
+        bool: True if the file was written
+    """
+    encoded = content.encode('utf-8')
+
+    try:
+        with open(filename, 'rb') as f:
+            if f.read() == encoded:
+                return False
+    except FileNotFoundError:
+        pass
+
+    with open(filename, 'wb') as f:
+        f.write(encoded)
+
+    return True
+
+
+def export_doorstop(requirements, path, prefix='REQ', digits=3, sep='', prune=False, max_workers=None):
+    """
+    Export requirements as a Doorstop document, with one item file per requirement
+
+    Items are written in parallel, and only when their content changed.
+    Requirements without a test id are skipped, since they have no UID yet,
+    and so are later uses of a duplicated test id, which `i --fix` gives fresh ids.
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects to export
+        path (str): The directory of the Doorstop document
+        prefix (str): The prefix of the document and its item UIDs
+        digits (int): The number of digits in item UIDs
+        sep (str): The separator between the prefix and the number of UIDs
+        prune (bool): Remove item files of this prefix, digits and separator that were not exported
+        max_workers (int): Number of writer threads, see `ThreadPoolExecutor`
+
+    Returns:
+        dict: The number of items `written`, `unchanged` and `removed`
+    """
+    os.makedirs(path, exist_ok=True)
+
+    document_config = {'settings': {'digits': digits, 'prefix': prefix, 'sep': sep}}
+    write_if_changed(os.path.join(path, DOCUMENT_CONFIG), yaml.safe_dump(document_config, default_flow_style=False))
+
+    items = {}
+    for requirement in requirements:
+        if requirement.requires_update or requirement.test_id < 0:
+            logger.warning('Skipping %s:%s, it has no test id', requirement.filename, requirement.qualname)
+            continue
+
+        item_name = item_uid(requirement.test_id, prefix, digits, sep) + '.yml'
+        if item_name in items:
+            logger.warning('Skipping %s:%s, its test id %d is already used by %s:%s. '
+                           'Run the `i` mode with --fix to give it a new id',
+                           requirement.filename, requirement.qualname, requirement.test_id,
+                           items[item_name].filename, items[item_name].qualname)
+            continue
+
+        items[item_name] = requirement
+
+    def export_item(item):
+        item_name, requirement = item
+        return write_if_changed(os.path.join(path, item_name), item_content(requirement))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(export_item, items.items()))
+
+    removed = 0
+    if prune:
+        pattern = item_pattern(prefix, digits, sep)
+        for name in os.listdir(path):
+            if pattern.match(name) and name not in items:
+                os.remove(os.path.join(path, name))
+                removed += 1
+
+    written = sum(results)
+    logger.info('Exported %d Doorstop items to %s, %d changed', len(results), path, written)
+
+    return {'written': written, 'unchanged': len(results) - written, 'removed': removed}
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import sys
+from collections import OrderedDict
+
+from easy_python_requirements import config
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.source import iter_docstrings, read_source
+from easy_python_requirements.test_info import write_json_infos
+from easy_python_requirements.update import find_files
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class InfoLocation:
+    """
+    The location of a TEST INFO line
+
+    Attributes:
+        filename (str): The file of the line
+        index (int): The 0-based line number in the file
+        qualname (str): The object whose docstring contains the line
+        info (dict): The json info of the line, None if it is malformed
+        error (str): Why the line is malformed, None if it is not
+    """
+
+    def __init__(self, filename, index, qualname, info=None, error=None):
+        self.filename = filename
+        self.index = index
+        self.qualname = qualname
+        self.info = info
+        self.error = error
+
+    @property
+    def test_id(self):
+        return self.info['test_id']
+
+    def to_dict(self):
+        location = {'filename': self.filename, 'line': self.index + 1, 'qualname': self.qualname}
+        if self.error:
+            location['error'] = self.error
+
+        return location
+
+    def __repr__(self):
+        return '<InfoLocation: {0}:{1}>'.format(self.filename, self.index + 1)
+
+
+def parse_info_line(line):
+    """
+    Read the json info of a TEST INFO line
+
+    Returns:
+        (dict, str): The json info, or None and the reason it is malformed.
+            Both are None for a placeholder line that was never filled in.
+    """
+    text = get_matcher().split_info(line)[1].strip()
+    if not text:
+        return None, None
+
+    try:
+        info = json.loads(text)
+    except ValueError as e:
+        return None, 'Invalid JSON: {0}'.format(e)
+
+    if not isinstance(info, dict) or not all(key in info for key in config['info_format']):
+        return None, 'Missing one of {0}'.format(', '.join(config['info_format']))
+
+    if not isinstance(info['test_id'], int):
+        return None, 'test_id is not an integer'
+
+    return info, None
+
+
+class IdIndex:
+    """
+    Index of every test id in a tree, built in one pass without importing anything
+
+    Attributes:
+        locations (dict): test_id -> list of `InfoLocation`, in scan order
+        malformed (list): `InfoLocation` of TEST INFO lines that could not be read,
+            or that appear more than once in one docstring
+        highest_id (int): The highest test id found
+    """
+
+    def __init__(self):
+        self.locations = {}
+        self.malformed = []
+        self.highest_id = 0
+
+    def add_file(self, filename):
+        source = read_source(filename)
+        if not get_matcher().search(source):
+            return
+
+        try:
+            docstrings = list(iter_docstrings(source, filename))
+        except SyntaxError as e:
+            self.malformed.append(InfoLocation(filename, (e.lineno or 1) - 1, None,
+                                               error='Syntax error: {0}'.format(e.msg)))
+            return
+
+        for docstring in docstrings:
+            info_lines = docstring.info_lines()
+
+            for index, line in info_lines:
+                if len(info_lines) > 1:
+                    self.malformed.append(InfoLocation(filename, index, docstring.qualname,
+                                                       error='Multiple TEST INFO lines in one docstring'))
+                    continue
+
+                info, error = parse_info_line(line)
+                if error is not None:
+                    self.malformed.append(InfoLocation(filename, index, docstring.qualname, error=error))
+                elif info is not None:
+                    self.locations.setdefault(info['test_id'], []).append(
+                        InfoLocation(filename, index, docstring.qualname, info))
+                    self.highest_id = max(self.highest_id, info['test_id'])
+
+    def add_folder(self, foldername, recursive=True):
+        for filename in find_files(foldername, recursive):
+            self.add_file(filename)
+
+    def duplicates(self):
+        """
+        Get every test id that is used more than once
+
+        Returns:
+            OrderedDict: test_id -> list of `InfoLocation`, sorted by test id
+        """
+        return OrderedDict((test_id, locations)
+                           for test_id, locations in sorted(self.locations.items())
+                           if len(locations) > 1)
+
+    def to_json(self):
+        return json.dumps({
+            'duplicates': {test_id: [location.to_dict() for location in locations]
+                           for test_id, locations in self.duplicates().items()},
+            'malformed': [location.to_dict() for location in self.malformed],
+        })
+
+
+def index_ids(foldername, recursive=True):
+    """
+    Build the test id index of a folder
+
+    Returns:
+        IdIndex: The index
+    """
+    index = IdIndex()
+    index.add_folder(foldername, recursive)
+
+    return index
+
+
+def repair_duplicates(index: IdIndex):
+    """
+    Give every later use of a duplicated test id a fresh id
+
+    The use with the oldest time stamp keeps the id, ties are broken by scan order.
+    Every file is rewritten once, no matter how many of its ids change.
+
+    Returns:
+        list: (InfoLocation, new test id) for every changed TEST INFO line
+    """
+    next_id = index.highest_id
+    changes = []
+    files = OrderedDict()
+
+    for test_id, locations in index.duplicates().items():
+        ordered = sorted(locations, key=lambda location: str(location.info.get('time_stamp', '')))
+
+        for location in ordered[1:]:
+            next_id += 1
+
+            info = OrderedDict(location.info)
+            info['test_id'] = next_id
+            files.setdefault(location.filename, {})[location.index] = json.dumps(info)
+
+            changes.append((location, next_id))
+            logger.info('Changing test id %d of %s:%s to %d', test_id, location.filename, location.qualname, next_id)
+
+    for filename, infos in files.items():
+        write_json_infos(filename, infos)
+
+    return changes
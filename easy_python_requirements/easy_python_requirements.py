@@ -10,38 +10,254 @@ logging.basicConfig(stream=sys.stdout)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Modes whose output is read by other programs, so the log has to stay out of stdout
+MACHINE_READABLE_MODES = ('c', 'f', 'i', 'n', 't')
 
-if __name__ == "__main__":
+
+def log_to_stderr():
+    """
+    Move the log of the root logger from stdout to stderr, so warnings never mix with the output
+    """
+    for handler in logging.getLogger().handlers:
+        # Exactly StreamHandler, so log files and the handlers of test runners are left alone
+        if type(handler) is logging.StreamHandler:
+            handler.stream = sys.stderr
+
+
+def write_output(output, output_file=None):
+    if output_file:
+        with open(output_file, 'w+') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+def write_report(report, output_file=None, split_roots=False, fragments=None):
+    """
+    Write a report, or with `split_roots` one report per root folder,
+    named after the folder inside of the `output_file` directory
+    """
+    if not split_roots:
+        write_output(report.to_markdown(fragments), output_file)
+        return
+
+    if output_file:
+        os.makedirs(output_file, exist_ok=True)
+
+    for root, output in report.to_markdown_per_root(fragments).items():
+        if output_file:
+            name = os.path.normpath(root).strip(os.sep).replace(os.sep, '_') or 'root'
+            write_output(output, os.path.join(output_file, name + '.md'))
+        else:
+            write_output(output)
+
+
+def _refreshed_cache(args, folders, index=False):
+    """
+    Load the parse cache of `args.cache_file`, bring it up to date with the folders and save it again
+
+    Args:
+        args (argparse.Namespace): The parsed command line
+        folders (str or list): The folder, folders or archive to read
+        index (bool): Keep a search index with the cache
+
+    Returns:
+        ParseCache: The cache
+    """
+    from easy_python_requirements.cache import ParseCache
+
+    cache = ParseCache.load(args.cache_file, index=index, compiled=args.compiled)
+    cache.refresh_folder(folders)
+    cache.save(args.cache_file)
+
+    return cache
+
+
+def main(argv=None):
     logger.debug('Appending `{0}` to sys.path'.format(os.getcwd()))
     sys.path.append(os.getcwd())
 
+    # Imported here, so the current directory is importable first
+    from easy_python_requirements.archive import is_archive
+    from easy_python_requirements.cache import DEFAULT_CACHE_FILE, ParseCache
+    from easy_python_requirements.check import check_folder, violations_to_json
+    from easy_python_requirements.daemon import DEFAULT_PORT, serve
+    from easy_python_requirements.duplicates import index_ids, repair_duplicates
+    from easy_python_requirements.feed import DEFAULT_STATE_FILE, update_feed
+    from easy_python_requirements.fragments import FragmentCache
+    from easy_python_requirements.markers import configure
+    from easy_python_requirements.report import Report, requirements_to_markdown
+    from easy_python_requirements.selection import SelectionIndex, changed_files, keyword_expression
+    from easy_python_requirements.shards import write_markdown_shards
+    from easy_python_requirements.similarity import (DEFAULT_SIGNATURE_FILE, DEFAULT_THRESHOLD, SignatureCache,
+                                                     find_near_duplicates, near_duplicates_to_json)
+    from easy_python_requirements.snapshot import DEFAULT_SNAPSHOT_FILE, write_snapshot
+    from easy_python_requirements.stats import DEFAULT_STATS_FILE, RequirementStats
+    from easy_python_requirements.update import update_folder
+
     parser = argparse.ArgumentParser(description='Update and report on test requirements')
-    parser.add_argument('folder_name', type=str,
-                        help='The folder name to run the operation on')
-    parser.add_argument('mode', choices=['u', 'r', 'a'],
-                        help='Choose what mode to run in.\n`u`: update\n`r`: report\n`a`: all')
+    parser.add_argument('folder_name', type=str, nargs='+',
+                        help='The folder name to run the operation on. '
+                             'Several folders are scanned together, sharing their test ids. '
+                             'The `r` mode and the modes that use the cache also read a single '
+                             '.zip, .whl or .tar.gz archive in place')
+    parser.add_argument('mode', choices=['u', 'r', 'a', 'i', 'd', 's', 'c', 't', 'b', 'p', 'n', 'f'],
+                        help='Choose what mode to run in.\n`u`: update\n`r`: report\n`a`: all\n'
+                             '`i`: check for duplicate and malformed test ids\n'
+                             '`d`: serve the requirements from a daemon, query it with '
+                             '`python -m easy_python_requirements.client`\n'
+                             '`s`: search the requirement descriptions\n'
+                             '`c`: check that nothing needs an update, without writing any file\n'
+                             '`t`: count the requirements by status, per file and per directory\n'
+                             '`b`: write a binary snapshot of every requirement, read it with '
+                             '`easy_python_requirements.snapshot.SnapshotReader`\n'
+                             '`p`: print the pytest node ids of the requirements in changed files or with given ids\n'
+                             '`n`: find requirements with nearly the same description\n'
+                             '`f`: append the requirement changes since the last `f` run to a JSON lines feed')
     parser.add_argument('-o', '--output', dest='output_file', default=None,
                         help='Output file for created report')
+    parser.add_argument('--fix', action='store_true',
+                        help='`i` mode: give the later uses of duplicated test ids fresh ids')
+    parser.add_argument('--bump-modified', action='store_true',
+                        help='`u` and `a` modes: give requirements whose description changed a new time stamp')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='`d` mode: localhost port to serve on')
+    parser.add_argument('--socket', dest='socket_path', default=None,
+                        help='`d` mode: serve on this Unix domain socket instead of a port')
+    parser.add_argument('-q', '--query', default='',
+                        help='`s` mode: terms, "quoted phrases" and prefix* terms that must all match')
+    parser.add_argument('--cache', dest='cache_file', default=DEFAULT_CACHE_FILE,
+                        help='`s`, `b`, `p`, `n` and `f` modes: the file that keeps parsed requirements and the search index between runs')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='`c` mode: stop at the first requirement that needs an update')
+    parser.add_argument('--stats', dest='stats_file', default=DEFAULT_STATS_FILE,
+                        help='`t` mode: the file that keeps the counts between runs, so only changed files are counted')
+    parser.add_argument('--prometheus', dest='prometheus_file', default=None,
+                        help='`t` mode: also write the counts to this Prometheus textfile')
+    parser.add_argument('--changed', nargs='*', default=[],
+                        help='`p` mode: select the requirements of these files')
+    parser.add_argument('--since', default=None,
+                        help='`p` mode: select the requirements of the files changed since this git revision')
+    parser.add_argument('--ids', nargs='*', type=int, default=[],
+                        help='`p` mode: select the requirements with these test ids')
+    parser.add_argument('--keyword', action='store_true',
+                        help='`p` mode: print a `pytest -k` expression instead of node ids')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='`n` mode: the lowest description similarity to report, from 0 to 1')
+    parser.add_argument('--signatures', dest='signature_file', default=DEFAULT_SIGNATURE_FILE,
+                        help='`n` mode: the file that keeps description signatures between runs')
+    parser.add_argument('--state', dest='state_file', default=DEFAULT_STATE_FILE,
+                        help='`f` mode: the file that keeps the requirements of the last run to compare with')
+    parser.add_argument('--compiled', action='store_true',
+                        help='Modes that use the cache: read docstrings from up to date `__pycache__` files '
+                             'instead of parsing the source')
+    parser.add_argument('--sharded', action='store_true',
+                        help='`r` mode: write one report per top level directory and an index into the output '
+                             'directory, rendering only the parts that changed. Reads the source through the cache')
+    parser.add_argument('--fragments', dest='fragment_file', default=None,
+                        help='`r` and `a` modes: the file that keeps the rendered report of each file between runs, '
+                             'so only changed files are rendered again')
+    parser.add_argument('--split-roots', action='store_true',
+                        help='`r` and `a` modes: one report per folder, written inside of the output directory')
+    parser.add_argument('--max-rss', dest='max_rss', type=int, default=None,
+                        help='`r` and `a` modes: memory budget in bytes, beyond it the files are imported in subprocesses')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='`r` and `a` modes: seconds a single file may take to import in a subprocess, '
+                             'slower files and files that fail to import are skipped')
+
+    args = parser.parse_args(argv)
+    if args.mode in MACHINE_READABLE_MODES:
+        log_to_stderr()
 
-    args = parser.parse_args()
-    print(args)
-
-#     if args.mode == 'r':
-#         report = create_report(args.folder_name)
-
-#         if args.output_file:
-#             with open(args.output_file, 'w+') as f:
-#                 f.write(report)
-#         else:
-#             print(report)
-#     elif args.mode == 'u':
-#         update_folder(args.folder_name)
-#     elif args.mode == 'a':
-#         update_folder(args.folder_name)
-
-#         report = create_report(args.folder_name)
-#         if args.output_file:
-#             with open(args.output_file, 'r') as f:
-#                 f.write(report)
-#         else:
-#             print(report)
+    configure()
+    folders = args.folder_name[0] if len(args.folder_name) == 1 else args.folder_name
+    fragments = FragmentCache.load(args.fragment_file) if args.fragment_file else None
+
+    if args.mode == 'r' and args.sharded:
+        cache = _refreshed_cache(args, folders)
+
+        signatures = {name: cached.signature for name, cached in cache.files.items()}
+        write_markdown_shards(cache.iter_requirements(), args.output_file or 'requirements', signatures=signatures)
+    elif args.mode == 'r' and is_archive(folders):
+        cache = ParseCache()
+        cache.refresh_archive(folders)
+        signatures = {name: cached.signature for name, cached in cache.files.items()}
+        write_output(requirements_to_markdown(cache.iter_requirements(), fragments, signatures), args.output_file)
+    elif args.mode == 'r':
+        with Report(folders, max_rss=args.max_rss, timeout=args.timeout) as report:
+            write_report(report, args.output_file, args.split_roots, fragments)
+    elif args.mode == 'u':
+        update_folder(folders, bump_modified=args.bump_modified)
+    elif args.mode == 'a':
+        update_folder(folders, bump_modified=args.bump_modified)
+        with Report(folders, max_rss=args.max_rss, timeout=args.timeout) as report:
+            write_report(report, args.output_file, args.split_roots, fragments)
+    elif args.mode == 'i':
+        index = index_ids(folders)
+        write_output(index.to_json(), args.output_file)
+
+        if args.fix:
+            repair_duplicates(index)
+
+        if index.malformed or (index.duplicates() and not args.fix):
+            return 1
+    elif args.mode == 's':
+        cache = _refreshed_cache(args, folders, index=True)
+
+        hits = cache.index.search(args.query)
+        write_output('\n'.join('{0}\t{1}::{2}'.format(hit.test_id, hit.filename, hit.qualname) for hit in hits),
+                     args.output_file)
+    elif args.mode == 'c':
+        violations = check_folder(folders, fail_fast=args.fail_fast)
+        write_output(violations_to_json(violations), args.output_file)
+
+        if violations:
+            return 1
+    elif args.mode == 't':
+        stats = RequirementStats.load(args.stats_file)
+        stats.refresh_folder(folders)
+        stats.save(args.stats_file)
+
+        write_output(stats.to_json(), args.output_file)
+        if args.prometheus_file:
+            stats.write_prometheus(args.prometheus_file)
+    elif args.mode == 'b':
+        cache = _refreshed_cache(args, folders)
+
+        write_snapshot(cache.iter_requirements(), args.output_file or DEFAULT_SNAPSHOT_FILE)
+    elif args.mode == 'p':
+        cache = _refreshed_cache(args, folders)
+
+        files = list(args.changed)
+        if args.since is not None:
+            files.extend(changed_files(args.since))
+
+        node_ids = SelectionIndex(cache.iter_requirements()).select(files, args.ids)
+        write_output(keyword_expression(node_ids) if args.keyword else '\n'.join(node_ids), args.output_file)
+    elif args.mode == 'n':
+        cache = _refreshed_cache(args, folders)
+
+        signatures = SignatureCache.load(args.signature_file)
+        pairs = find_near_duplicates(cache.iter_requirements(), args.threshold, cache=signatures)
+        signatures.save(args.signature_file)
+
+        write_output(near_duplicates_to_json(pairs), args.output_file)
+    elif args.mode == 'f':
+        cache = _refreshed_cache(args, folders)
+
+        if args.output_file:
+            with open(args.output_file, 'a') as f:
+                update_feed(cache.iter_requirements(), f, args.state_file)
+        else:
+            update_feed(cache.iter_requirements(), sys.stdout, args.state_file)
+    elif args.mode == 'd':
+        serve(folders, port=args.port, socket_path=args.socket_path)
+
+    if fragments is not None:
+        fragments.save(args.fragment_file)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,3 +8,18 @@ class RequirementInfoException(Exception):
 class MultipleStringError(Exception):
     def __init__(self, *args, **kwargs):
         Exception.__init__(self, *args, **kwargs)
+
+
+class ImportWorkerError(Exception):
+    def __init__(self, *args, **kwargs):
+        Exception.__init__(self, *args, **kwargs)
+
+
+class ImportTimeoutError(ImportWorkerError):
+    def __init__(self, *args, **kwargs):
+        ImportWorkerError.__init__(self, *args, **kwargs)
+
+
+class SnapshotError(Exception):
+    def __init__(self, *args, **kwargs):
+        Exception.__init__(self, *args, **kwargs)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feed of the requirement changes between two scans, as newline delimited JSON
+
+Each line is one event:
+
+- `added`: a requirement that was not there before
+- `removed`: a requirement that is gone
+- `moved`: a test id now found in another file or under another name
+- `description_changed`: a requirement with a new description
+- `id_assigned`: a requirement that got its test id since the last scan
+"""
+
+import json
+import logging
+import sys
+from collections import OrderedDict
+from datetime import datetime
+
+from easy_python_requirements.test_info import description_hash
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+STATE_VERSION = 1
+DEFAULT_STATE_FILE = '.easy_python_requirements_state.json'
+
+
+def requirement_state(requirement):
+    """
+    Get what is kept of a requirement between scans
+
+    Returns:
+        dict: The file, qualified name, test id, line and description hash of the requirement
+    """
+    return OrderedDict([
+        ('filename', requirement.filename),
+        ('qualname', requirement.qualname),
+        ('test_id', requirement.test_id),
+        ('line_number', requirement.line_number),
+        ('desc_hash', description_hash(requirement.description or '')),
+    ])
+
+
+def load_state(filename=DEFAULT_STATE_FILE):
+    """
+    Load the state saved by the last scan
+
+    Returns:
+        list: The `requirement_state` of each requirement, empty if there was no earlier scan
+    """
+    try:
+        with open(filename) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if data.get('version') != STATE_VERSION:
+        logger.info('Ignoring state %s, it was saved by another version', filename)
+        return []
+
+    return data['requirements']
+
+
+def save_state(states, filename=DEFAULT_STATE_FILE):
+    with open(filename, 'w') as f:
+        json.dump({'version': STATE_VERSION, 'requirements': states}, f)
+
+
+def _event(kind, state, **extra):
+    event = OrderedDict([('event', kind)])
+    event.update((key, state[key]) for key in ('test_id', 'filename', 'qualname', 'line_number'))
+    event.update(extra)
+
+    return event
+
+
+def diff_states(previous, current):
+    """
+    Compare the states of two scans
+
+    A requirement is matched by its file and qualified name first, then by its test id.
+
+    Args:
+        previous (list): The `requirement_state` of each requirement in the earlier scan
+        current (list): The `requirement_state` of each requirement in the later scan
+
+    Yields:
+        OrderedDict: The events, removed requirements last
+    """
+    by_key = OrderedDict(((state['filename'], state['qualname']), state) for state in previous)
+    current_keys = set((state['filename'], state['qualname']) for state in current)
+
+    # Only requirements that are gone from their place can have moved
+    by_id = {}
+    for key, state in by_key.items():
+        if key not in current_keys and state['test_id'] >= 0:
+            by_id.setdefault(state['test_id'], []).append(key)
+
+    matched = set()
+    for state in current:
+        key = (state['filename'], state['qualname'])
+        old = by_key.get(key)
+
+        if old is None and state['test_id'] >= 0 and by_id.get(state['test_id']):
+            old_key = by_id[state['test_id']].pop(0)
+            old = by_key[old_key]
+            matched.add(old_key)
+            yield _event('moved', state, previous={'filename': old['filename'], 'qualname': old['qualname']})
+        elif old is None:
+            yield _event('added', state)
+            continue
+        else:
+            matched.add(key)
+
+        if old['test_id'] < 0 <= state['test_id']:
+            yield _event('id_assigned', state)
+        if old['desc_hash'] != state['desc_hash']:
+            yield _event('description_changed', state)
+
+    for key, state in by_key.items():
+        if key not in matched:
+            yield _event('removed', state)
+
+
+def write_feed(events, stream):
+    """
+    Write events as newline delimited JSON, each with the time of the scan
+
+    Returns:
+        int: The number of events written
+    """
+    time_stamp = str(datetime.today().isoformat())
+    count = 0
+
+    for event in events:
+        event['time_stamp'] = time_stamp
+        stream.write(json.dumps(event) + '\n')
+        count += 1
+
+    return count
+
+
+def update_feed(requirements, stream, state_file=DEFAULT_STATE_FILE):
+    """
+    Write the changes since the last scan to a feed, and keep the state for the next scan
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects of this scan
+        stream (file): Where to write the events, i.e. a file opened for appending
+        state_file (str): The state of the last scan
+
+    Returns:
+        int: The number of events written
+    """
+    current = [requirement_state(requirement) for requirement in requirements]
+    count = write_feed(diff_states(load_state(state_file), current), stream)
+    save_state(current, state_file)
+
+    return count
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import sys
+from collections import OrderedDict
+
+from easy_python_requirements import config
+from easy_python_requirements.markers import get_matcher
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+FRAGMENT_VERSION = 2
+DEFAULT_FRAGMENT_FILE = '.easy_python_requirements_fragments.json'
+DEFAULT_MAX_FRAGMENTS = 10000
+
+
+def fragment_key(output_format, renderer_version, *parts):
+    """
+    Hash everything a rendered fragment depends on
+
+    The parts are hashed by their `repr`, which is much cheaper than JSON and just as stable
+    for strings, numbers, booleans, None, lists and tuples.
+
+    Args:
+        output_format (str): The format of the fragment, i.e. 'markdown'
+        renderer_version (int): The version of the renderer of the format
+        parts: Inputs of the fragment, i.e. its file name and file signature
+
+    Returns:
+        str: The key of the fragment
+    """
+    data = repr((output_format, renderer_version) + parts)
+
+    return hashlib.sha1(data.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class FragmentCache:
+    """
+    Rendered report fragments by `fragment_key`, so unchanged parts of a report are not rendered again
+
+    The least recently used fragments are dropped beyond `max_fragments`.
+
+    Attributes:
+        fragments (OrderedDict): key -> rendered fragment, least recently used first
+        hits (int): Fragments found in the cache
+        misses (int): Fragments that had to be rendered
+    """
+
+    def __init__(self, max_fragments=DEFAULT_MAX_FRAGMENTS):
+        self.max_fragments = max_fragments
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """
+        Get a fragment, rendering it with `render()` if it is not cached
+        """
+        fragment = self.fragments.get(key)
+
+        if fragment is None:
+            self.misses += 1
+            fragment = render()
+            self.fragments[key] = fragment
+
+            if len(self.fragments) > self.max_fragments:
+                self.fragments.popitem(last=False)
+        else:
+            self.hits += 1
+            self.fragments.move_to_end(key)
+
+        return fragment
+
+    def save(self, filename=DEFAULT_FRAGMENT_FILE):
+        with open(filename, 'w') as f:
+            json.dump({'version': FRAGMENT_VERSION, 'config': config, 'fragments': self.fragments}, f)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_FRAGMENT_FILE, max_fragments=DEFAULT_MAX_FRAGMENTS):
+        """
+        Load fragments saved with `save`, started over if they are missing, unreadable, or saved with other settings
+
+        Fragments looked up by file signature depend on the settings the files were parsed with.
+        """
+        cache = cls(max_fragments)
+
+        # The settings of the project have to be loaded before comparing them with the saved ones
+        get_matcher()
+
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if data.get('version') == FRAGMENT_VERSION and data.get('config') == config:
+            cache.fragments = OrderedDict(data['fragments'])
+
+        return cache
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+from easy_python_requirements.util import get_module_name
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# When several tests cover one requirement, the most severe status wins
+STATUS_PRIORITY = ['not run', 'skipped', 'passed', 'failed', 'error']
+
+
+class TestCaseResult:
+    """
+    The result of a single JUnit testcase
+
+    Attributes:
+        classname (str): The dotted module and class of the test, i.e. `test.test_file.TestClass`
+        name (str): The name of the test, without any parametrization
+        file (str): The file of the test, if the XML contains it
+        status (str): One of 'passed', 'failed', 'error', 'skipped'
+        time (float): The seconds the test took
+        message (str): The failure, error or skip message
+    """
+    __test__ = False
+
+    def __init__(self, classname, name, file=None, status='passed', time=0.0, message=None):
+        self.classname = classname
+        self.name = name
+        self.file = file
+        self.status = status
+        self.time = time
+        self.message = message
+
+    @classmethod
+    def from_element(cls, element):
+        status = 'passed'
+        message = None
+        for child in element:
+            if child.tag in ('failure', 'error', 'skipped'):
+                status = 'failed' if child.tag == 'failure' else child.tag
+                message = child.get('message')
+                break
+
+        return cls(element.get('classname', ''),
+                   element.get('name', '').split('[')[0],
+                   element.get('file'),
+                   status,
+                   float(element.get('time') or 0),
+                   message,
+                   )
+
+    @property
+    def full_name(self):
+        if self.classname:
+            return self.classname + '.' + self.name
+
+        return self.name
+
+    def keys(self):
+        """
+        Get the index keys of the requirements this testcase covers,
+        the requirement of its function first and then the one of its class
+        """
+        keys = [self.full_name, self.classname]
+
+        if self.file:
+            module = get_module_name(self.file.replace('\\', '/')) + '.'
+            for name in (self.full_name, self.classname):
+                if name.startswith(module):
+                    keys.append((self.file.replace('\\', '/'), name[len(module):]))
+
+        return keys
+
+
+def iter_testcases(xml_file):
+    """
+    Stream the testcases of a JUnit XML file
+
+    Every testcase is removed from the tree once it is yielded,
+    so memory use does not grow with the number of testcases.
+
+    Args:
+        xml_file: A file name or file object
+
+    Yields:
+        TestCaseResult: The result of each testcase
+    """
+    stack = []
+
+    for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            stack.append(element)
+            continue
+
+        stack.pop()
+        if element.tag == 'testcase':
+            yield TestCaseResult.from_element(element)
+
+            if stack:
+                stack[-1].remove(element)
+
+
+def requirement_keys(requirement):
+    """
+    Get the index keys of a requirement: its dotted name, i.e. `test.test_file.TestClass.test_func`,
+    and its (file, qualname) pair
+    """
+    filename = requirement.filename.replace('\\', '/')
+
+    return [get_module_name(filename) + '.' + requirement.qualname, (filename, requirement.qualname)]
+
+
+class RequirementStatus:
+    """
+    The combined status of every test that covers a requirement
+
+    Attributes:
+        requirement (RequirementRecord): The requirement
+        status (str): The most severe status of the tests, 'not run' without any tests
+        tests (int): The number of tests that covered the requirement
+        time (float): The total seconds of the tests
+        message (str): The message of the test that decided the status
+    """
+
+    def __init__(self, requirement):
+        self.requirement = requirement
+        self.status = 'not run'
+        self.tests = 0
+        self.time = 0.0
+        self.message = None
+
+    def add(self, result: TestCaseResult):
+        self.tests += 1
+        self.time += result.time
+
+        if STATUS_PRIORITY.index(result.status) > STATUS_PRIORITY.index(self.status):
+            self.status = result.status
+            self.message = result.message
+
+    def to_dict(self):
+        return {
+            'test_id': self.requirement.test_id,
+            'filename': self.requirement.filename,
+            'qualname': self.requirement.qualname,
+            'status': self.status,
+            'tests': self.tests,
+            'time': self.time,
+            'message': self.message,
+        }
+
+
+class Traceability:
+    """
+    Join requirements with the results of the tests that cover them
+
+    A testcase covers the requirement of its function, and the requirement of its class.
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects to trace
+    """
+
+    def __init__(self, requirements):
+        self.statuses = OrderedDict()
+        self._index = {}
+
+        for requirement in requirements:
+            status = RequirementStatus(requirement)
+            self.statuses[(requirement.filename, requirement.qualname)] = status
+
+            for key in requirement_keys(requirement):
+                self._index.setdefault(key, []).append(status)
+
+        self.unmatched = 0
+
+    def add_result(self, result: TestCaseResult):
+        matched = set()
+
+        for key in result.keys():
+            for status in self._index.get(key, []):
+                # The dotted name and the file key can both point to the same requirement
+                if id(status) not in matched:
+                    status.add(result)
+                    matched.add(id(status))
+
+        if not matched:
+            self.unmatched += 1
+
+    def add_junit(self, xml_file):
+        """
+        Add the results of a JUnit XML file
+        """
+        for result in iter_testcases(xml_file):
+            self.add_result(result)
+
+        logger.info('Traced %s, %d testcases without a requirement', str(xml_file), self.unmatched)
+
+    def summary(self):
+        """
+        Count the requirements per status
+
+        Returns:
+            OrderedDict: status -> number of requirements
+        """
+        counts = OrderedDict((status, 0) for status in STATUS_PRIORITY)
+        for status in self.statuses.values():
+            counts[status.status] += 1
+
+        return counts
+
+    def to_json(self):
+        return json.dumps({
+            'summary': self.summary(),
+            'requirements': [status.to_dict() for status in self.statuses.values()],
+        })
+
+    def to_markdown(self):
+        lines = ['# Requirement status', '']
+
+        for status, count in self.summary().items():
+            lines.append('- {0}: {1}'.format(status, count))
+
+        lines.append('')
+        lines.append('| Test ID | Requirement | Status | Tests |')
+        lines.append('| --- | --- | --- | --- |')
+        for status in self.statuses.values():
+            lines.append('| {0} | {1}::{2} | {3} | {4} |'.format(
+                status.requirement.test_id,
+                status.requirement.filename,
+                status.requirement.qualname,
+                status.status,
+                status.tests,
+            ))
+
+        return '\n'.join(lines) + '\n'
+
+
+def join_junit(requirements, xml_file):
+    """
+    Join requirements with the results of a JUnit XML file
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects to trace
+        xml_file: A file name or file object
+
+    Returns:
+        Traceability: The status of every requirement
+    """
+    traceability = Traceability(requirements)
+    traceability.add_junit(xml_file)
+
+    return traceability
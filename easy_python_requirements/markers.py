@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import re
+import sys
+
+from easy_python_requirements import config
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+CONFIG_SECTION = 'easy_python_requirements'
+DEFAULT_CONFIG = dict(config)
+
+# Marker kind -> its key in `config`
+MARKER_KEYS = {
+    'begin': 'requirement_begin',
+    'end': 'requirement_end',
+    'info': 'requirement_info',
+}
+
+
+def as_list(value):
+    """
+    Turn a config value into a list, splitting strings on newlines
+    """
+    if isinstance(value, str):
+        return [item.strip() for item in value.split('\n') if item.strip()]
+
+    return list(value)
+
+
+def as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'yes', 'true', 'on')
+
+    return bool(value)
+
+
+def read_setup_cfg(filename):
+    # Imported here, like tomllib, so short runs like the pre-commit hook only pay for it in configured projects
+    import configparser
+
+    parser = configparser.ConfigParser()
+    parser.read(filename)
+
+    if not parser.has_section(CONFIG_SECTION):
+        return {}
+
+    return dict(parser.items(CONFIG_SECTION))
+
+
+def read_pyproject(filename):
+    try:
+        import tomllib
+    except ImportError:  # pragma: no cover
+        try:
+            import tomli as tomllib
+        except ImportError:
+            logger.warning('Can not read %s without tomllib or tomli installed', filename)
+            return {}
+
+    with open(filename, 'rb') as f:
+        return tomllib.load(f).get('tool', {}).get(CONFIG_SECTION, {})
+
+
+def load_config(path='.'):
+    """
+    Read the settings of a project from its setup.cfg and pyproject.toml
+
+    Settings are read from `[easy_python_requirements]` in setup.cfg and
+    `[tool.easy_python_requirements]` in pyproject.toml, where pyproject.toml wins.
+    Every marker setting can hold several markers, one per line in setup.cfg
+    or as a list in pyproject.toml, to support several dialects.
+    Set `desc_hash` to true to record a hash of each description in its TEST INFO.
+
+    Args:
+        path (str): The directory of the project
+
+    Returns:
+        dict: The settings found, with the same keys as `config`
+    """
+    settings = {}
+
+    setup_cfg = os.path.join(path, 'setup.cfg')
+    if os.path.isfile(setup_cfg):
+        settings.update(read_setup_cfg(setup_cfg))
+
+    pyproject = os.path.join(path, 'pyproject.toml')
+    if os.path.isfile(pyproject):
+        settings.update(read_pyproject(pyproject))
+
+    loaded = {}
+    for key in list(MARKER_KEYS.values()) + ['info_format']:
+        if key in settings:
+            loaded[key] = as_list(settings[key])
+
+    if 'desc_hash' in settings:
+        loaded['desc_hash'] = as_bool(settings['desc_hash'])
+
+    return loaded
+
+
+class MarkerMatcher:
+    """
+    Find every kind of marker, in every dialect, with one compiled pattern
+
+    Args:
+        begin (list): The markers that begin a requirement description
+        end (list): The markers that end a requirement description
+        info (list): The markers of the TEST INFO line
+    """
+
+    def __init__(self, begin, end, info):
+        self.markers = {'begin': as_list(begin), 'end': as_list(end), 'info': as_list(info)}
+
+        groups = []
+        for kind, markers in self.markers.items():
+            # Longest first, so a marker that contains another one still wins
+            alternatives = '|'.join(re.escape(m) for m in sorted(markers, key=len, reverse=True))
+            groups.append('(?P<{0}>{1})'.format(kind, alternatives))
+
+        self.pattern = re.compile('|'.join(groups))
+
+    @classmethod
+    def from_config(cls, settings=None):
+        settings = settings or config
+        return cls(*(settings[MARKER_KEYS[kind]] for kind in ('begin', 'end', 'info')))
+
+    def match(self, line):
+        """
+        Find the first marker in a line
+
+        Returns:
+            re.Match: The match, whose `lastgroup` is the marker kind, or None
+        """
+        return self.pattern.search(line)
+
+    def search(self, text):
+        """
+        Check if a text contains any marker at all
+        """
+        return self.pattern.search(text) is not None
+
+    def scan(self, lines):
+        """
+        Find the lines of every marker kind in one pass
+
+        Returns:
+            dict: kind -> list of line indices
+        """
+        found = {'begin': [], 'end': [], 'info': []}
+
+        for index, line in enumerate(lines):
+            match = self.pattern.search(line)
+            if match is not None:
+                found[match.lastgroup].append(index)
+
+        return found
+
+    def split_info(self, line):
+        """
+        Split a TEST INFO line after its marker
+
+        Returns:
+            (str, str): Everything up to and including the marker, and everything after it.
+                None if the line has no TEST INFO marker.
+        """
+        for match in self.pattern.finditer(line):
+            if match.lastgroup == 'info':
+                return line[:match.end()], line[match.end():]
+
+        return None
+
+    def is_info(self, line):
+        return self.split_info(line) is not None
+
+
+_matcher = None
+_matcher_key = None
+_loaded = {}
+
+
+def _marker_key():
+    """
+    Get the marker settings of `config` as they are now, to tell when the matcher has to be compiled again
+    """
+    return tuple(tuple(value) if isinstance(value, list) else value
+                 for value in (config[MARKER_KEYS[kind]] for kind in ('begin', 'end', 'info')))
+
+
+def configure(path='.'):
+    """
+    Load the settings of a project into `config` and compile its markers
+
+    Settings are merged into `config`: a key that a caller already set to something other
+    than its default is kept, and settings loaded by an earlier call are replaced.
+
+    Returns:
+        MarkerMatcher: The new matcher
+    """
+    global _matcher, _matcher_key, _loaded
+
+    for key, value in _loaded.items():
+        if config.get(key) == value:
+            config[key] = DEFAULT_CONFIG[key]
+
+    _loaded = {}
+    for key, value in load_config(path).items():
+        if config.get(key) == DEFAULT_CONFIG.get(key):
+            config[key] = value
+            _loaded[key] = value
+
+    _matcher = MarkerMatcher.from_config()
+    _matcher_key = _marker_key()
+
+    return _matcher
+
+
+def get_matcher():
+    """
+    Get the marker matcher, loading the settings of the current directory if `configure` was not called yet
+
+    The matcher is compiled again whenever the markers in `config` changed since it was compiled.
+    """
+    global _matcher, _matcher_key
+
+    if _matcher is None:
+        return configure()
+
+    key = _marker_key()
+    if key != _matcher_key:
+        _matcher = MarkerMatcher.from_config()
+        _matcher_key = key
+
+    return _matcher
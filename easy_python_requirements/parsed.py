@@ -1,12 +1,13 @@
 
 import inspect
 
-from easy_python_requirements import config
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.markers import get_matcher
 from easy_python_requirements.util import (
-    trim, index_containing_substring, get_type, get_functions, get_relative_path,
+    trim, get_type, get_functions, get_relative_path,
 )
 from easy_python_requirements.test_info import (
-    info_line_status,
+    info_line_status, description_hash,
 )
 
 
@@ -21,6 +22,7 @@ class Parsed:
         description (str): The test description provided in the docstring
         test_id (int): The unique ID that this test has
         time_stamp (datetime): The time when this requirement was originally created
+        modified (bool): True if the description changed since its `desc_hash` was recorded
         children (list): List of objects that are children of this object.
             For example, a class could have several functions within it.
             Functions could even have functions within it.
@@ -36,6 +38,7 @@ class Parsed:
         self.obj_type = get_type(obj)
         self.obj_docstring = obj.__doc__
         self.description = ''
+        self.modified = False
         self.test_info = TestInfo({})
         self.children = {}
 
@@ -44,6 +47,7 @@ class Parsed:
 
         self.description = obj_dict.pop('description', None)
         self.requires_update = obj_dict.pop('requires_update', True)
+        self.modified = obj_dict.pop('modified', False)
         self.test_info = TestInfo(obj_dict.pop('test_info', {'requires_update': True}))
 
         # Handle differences between functions and classes
@@ -89,6 +93,7 @@ class TestInfo:
         self.requires_update = info.get('requires_update', True)
         self.time_stamp = info.get('time_stamp', '')
         self.test_id = info.get('test_id', -1)
+        self.desc_hash = info.get('desc_hash', None)
 
         # TODO: Map other attributes
 
@@ -111,27 +116,30 @@ def parse_doc(docstring: str):
 
         requires_update: Bool representing whether this docstring needs
         to be updated
+
+        modified: Bool representing whether the description changed since
+        its `desc_hash` was recorded. Only present if the info has a `desc_hash`.
     """
     doclist = trim(docstring).split('\n')
+    found = get_matcher().scan(doclist)
 
-    try:
-        requirement_begin = index_containing_substring(doclist, config['requirement_begin'])
-    except ValueError:
-        return {'requires_update': False, 'description': None}
-
-    try:
-        requirement_end = index_containing_substring(doclist, config['requirement_end'])
-    except ValueError:
+    if not found['begin'] or not found['end']:
         return {'requires_update': False, 'description': None}
 
+    requirement_begin = found['begin'][0]
+    requirement_end = found['end'][0]
     requirement_description = '\n'.join(doclist[requirement_begin + 1:requirement_end])
 
-    try:
-        requirement_info = index_containing_substring(doclist, config['requirement_info'], multiples=False)
-    except ValueError:
+    if not found['info']:
         return {'requires_update': True, 'description': requirement_description}
+    elif len(found['info']) > 1:
+        raise MultipleStringError("Multiple TEST INFO lines found in docstring.")
 
-    info_dict = info_line_status(doclist, requirement_info)
+    info_dict = info_line_status(doclist, found['info'][0])
     info_dict['description'] = requirement_description
 
+    recorded_hash = info_dict.get('test_info', {}).get('desc_hash')
+    if recorded_hash is not None:
+        info_dict['modified'] = recorded_hash != description_hash(requirement_description)
+
     return info_dict
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pre-commit hook: tag the requirements of the staged files, and stage the files again
+
+Use it as the entry of a pre-commit hook, which passes the staged file names as arguments:
+
+    python -m easy_python_requirements.precommit [--root FOLDER] file ...
+
+Only files that contain a marker are parsed. The highest test id of each file in the tree
+is kept between commits, so only the files that changed since the last commit are read.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+from easy_python_requirements import test_info
+from easy_python_requirements.duplicates import IdIndex
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.source import read_source
+from easy_python_requirements.update import update_files
+from easy_python_requirements.util import file_signature
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+LATENCY_BUDGET = 0.1
+DEFAULT_ID_FILE = '.easy_python_requirements_ids.json'
+
+
+def requirement_files(filenames):
+    """
+    Keep the python files that contain a requirement marker, without parsing them
+
+    Returns:
+        list: The file names
+    """
+    matcher = get_matcher()
+    found = []
+
+    for filename in filenames:
+        if not filename.endswith('.py'):
+            continue
+
+        try:
+            source = read_source(filename)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning('Could not read %s: %s', filename, str(e))
+            continue
+
+        if matcher.search(source):
+            found.append(filename)
+
+    return found
+
+
+def list_python_files(root):
+    """
+    List the python files below a folder, skipping hidden folders and `__pycache__`
+
+    Unlike `find_files`, nothing is imported and folders do not need to be packages.
+
+    Returns:
+        list: The file names, inside of `root` unless it is the current directory
+    """
+    files = []
+    folders = [root]
+
+    while folders:
+        folder = folders.pop()
+        prefix = '' if folder == os.curdir else folder
+
+        try:
+            entries = list(os.scandir(folder))
+        except OSError as e:
+            logger.warning('Could not list %s: %s', folder, str(e))
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.') and entry.name != '__pycache__':
+                    folders.append(os.path.join(prefix, entry.name))
+            elif entry.name.endswith('.py'):
+                files.append(os.path.join(prefix, entry.name))
+
+    return files
+
+
+def reserve_tree_ids(root, id_file=DEFAULT_ID_FILE):
+    """
+    Move the id allocator past every test id used in a tree
+
+    Only the highest test id of each file is kept between runs, only changed files are read again,
+    and the id file is only written when something changed.
+
+    Returns:
+        int: The highest test id found
+    """
+    try:
+        with open(id_file) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    highest = {}
+    for filename in list_python_files(root):
+        signature = file_signature(filename)
+        cached = previous.get(filename)
+
+        if cached is not None and cached[0] == signature:
+            highest[filename] = cached
+            continue
+
+        index = IdIndex()
+        try:
+            index.add_file(filename)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning('Could not read the test ids of %s: %s', filename, str(e))
+        highest[filename] = [signature, index.highest_id]
+
+    if highest != previous:
+        with open(id_file, 'w') as f:
+            f.write(json.dumps(highest))
+
+    test_info.highest_id = max([test_info.highest_id] + [cached[1] for cached in highest.values()])
+
+    return test_info.highest_id
+
+
+def tag_staged(filenames, root='.', id_file=DEFAULT_ID_FILE, stage=True, bump_modified=False):
+    """
+    Tag the requirements of staged files with the batched updater, and stage the changed files again
+
+    Staging adds the whole file. pre-commit stashes the changes that are not staged
+    before running hooks, so only the tags are added to what was staged.
+
+    Args:
+        filenames (list): The staged files
+        root (str): The folder whose test ids have to stay unique, None to only look at the staged files
+        id_file (str): The highest test id of each file of `root`, kept between runs
+        stage (bool): Stage the changed files again
+        bump_modified (bool): Give requirements whose description changed a new time stamp
+
+    Returns:
+        list: The names of the changed files
+    """
+    files = requirement_files(filenames)
+    if not files:
+        return []
+
+    if root is not None:
+        reserve_tree_ids(root, id_file)
+
+    changed = update_files(files, bump_modified)
+
+    if changed and stage:
+        subprocess.run(['git', 'add', '--'] + changed, check=True)
+
+    return changed
+
+
+def main(argv=None):
+    start = time.perf_counter()
+
+    parser = argparse.ArgumentParser(description='Tag the requirements of staged files')
+    parser.add_argument('filenames', nargs='*', help='The staged files')
+    parser.add_argument('--root', default='.',
+                        help='The folder whose test ids have to stay unique')
+    parser.add_argument('--ids', dest='id_file', default=DEFAULT_ID_FILE,
+                        help='The file that keeps the highest test id of each file of the root between commits')
+    parser.add_argument('--no-stage', dest='stage', action='store_false',
+                        help='Do not stage the changed files again')
+    parser.add_argument('--bump-modified', action='store_true',
+                        help='Give requirements whose description changed a new time stamp')
+
+    args = parser.parse_args(argv)
+
+    changed = tag_staged(args.filenames, args.root, args.id_file, args.stage, args.bump_modified)
+    for filename in changed:
+        logger.info('Tagged requirements in %s', filename)
+
+    elapsed = time.perf_counter() - start
+    if elapsed > LATENCY_BUDGET:
+        logger.warning('Tagging took %.0f ms, over the budget of %.0f ms', elapsed * 1000, LATENCY_BUDGET * 1000)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
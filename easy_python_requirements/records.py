@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib
+import inspect
+import linecache
+import logging
+import os
+import sys
+import time
+
+from easy_python_requirements.parsed import parse_doc
+from easy_python_requirements.util import (
+    get_classes, get_functions, get_module_name, get_relative_path, get_type,
+)
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class RequirementRecord:
+    """
+    A plain record of a requirement found in a docstring.
+
+    Unlike a `Parsed` object, it keeps no reference to the object it was created from,
+    so the module that defined the object can be released once the record exists.
+
+    Attributes:
+        name (str): The name of the object
+        qualname (str): The qualified name of the object, i.e. `Class.function`
+        obj_type (str): The objects type (i.e., 'class', 'function')
+        filename (str): The file the object was defined in, relative to the current directory
+        line_number (int): The line where the object definition starts
+        description (str): The test description provided in the docstring
+        requires_update (bool): Whether the TEST INFO still has to be written
+        test_id (int): The unique ID of the test, -1 if it does not have one yet
+        time_stamp (str): The time when this requirement was originally created
+        modified (bool): True if the description changed since it was tagged
+    """
+    fields = ['name', 'qualname', 'obj_type', 'filename', 'line_number',
+              'description', 'requires_update', 'test_id', 'time_stamp', 'modified']
+
+    def __init__(self, name, qualname, obj_type, filename, line_number, description,
+                 requires_update=True, test_id=-1, time_stamp='', modified=False):
+        self.name = name
+        self.qualname = qualname
+        self.obj_type = obj_type
+        self.filename = filename
+        self.line_number = line_number
+        self.description = description
+        self.requires_update = requires_update
+        self.test_id = test_id
+        self.time_stamp = time_stamp
+        self.modified = modified
+
+    @classmethod
+    def from_object(cls, obj: object):
+        """
+        Create a record from a class or function
+
+        Returns:
+            RequirementRecord: The record, or None if the docstring has no requirement
+        """
+        obj_dict = parse_doc(obj.__doc__)
+
+        if obj_dict['description'] is None:
+            return None
+
+        test_info = obj_dict.get('test_info', {})
+
+        return cls(obj.__name__,
+                   obj.__qualname__,
+                   get_type(obj),
+                   get_relative_path(obj),
+                   inspect.getsourcelines(obj)[1],
+                   obj_dict['description'],
+                   obj_dict['requires_update'],
+                   test_info.get('test_id', -1),
+                   test_info.get('time_stamp', ''),
+                   obj_dict.get('modified', False),
+                   )
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+    def __eq__(self, other):
+        return isinstance(other, RequirementRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '<RequirementRecord: {0}:{1}>'.format(self.filename, self.qualname)
+
+
+class FileRecord:
+    """
+    The requirement records of a single file.
+
+    Attributes:
+        filename (str): The name of the file
+        requirements (list): The `RequirementRecord` objects found in the file
+        elapsed (float): The seconds it took to import and record the file
+        skipped (bool): True if the file could not be recorded
+        reason (str): Why the file was skipped, None if it was not
+    """
+
+    def __init__(self, filename, requirements=None, elapsed=0.0, skipped=False, reason=None):
+        self.filename = filename
+        self.requirements = requirements if requirements is not None else []
+        self.elapsed = elapsed
+        self.skipped = skipped
+        self.reason = reason
+
+    def __repr__(self):
+        if self.skipped:
+            return '<FileRecord: {0} (skipped after {1:.2f}s)>'.format(self.filename, self.elapsed)
+
+        return '<FileRecord: {0} ({1} requirements)>'.format(self.filename, len(self.requirements))
+
+
+class ModuleSnapshot:
+    """
+    Context manager that removes the modules imported inside of it from `sys.modules`
+
+    Only modules whose file is inside of one of `folders` are removed, so third party
+    and other project modules are imported once, keeping their registries and C extensions intact.
+
+    Args:
+        enabled (bool): Set to False to keep the imported modules
+        folders (list): The folders whose modules are removed, None to remove every new module
+    """
+
+    def __init__(self, enabled=True, folders=None):
+        self.enabled = enabled
+        self.folders = None
+        self.before = None
+
+        if folders is not None:
+            self.folders = [os.path.join(os.path.abspath(folder), '') for folder in folders]
+
+    def __enter__(self):
+        if self.enabled:
+            self.before = set(sys.modules)
+
+        return self
+
+    def contains(self, module):
+        """
+        Check if a module is one of the modules to remove
+        """
+        if self.folders is None:
+            return True
+
+        filename = getattr(module, '__file__', None)
+        if filename is None:
+            return False
+
+        filename = os.path.abspath(filename)
+        return any(filename.startswith(folder) for folder in self.folders)
+
+    def __exit__(self, type, value, traceback):
+        if not self.enabled:
+            return
+
+        for name in set(sys.modules) - self.before:
+            if not self.contains(sys.modules.get(name)):
+                continue
+
+            module = sys.modules.pop(name, None)
+            linecache.cache.pop(getattr(module, '__file__', None), None)
+
+            # The parent package keeps a reference to the module as well
+            parent_name, _, child_name = name.rpartition('.')
+            parent = sys.modules.get(parent_name)
+            if parent is not None and getattr(parent, child_name, None) is module:
+                delattr(parent, child_name)
+
+
+def record_module(module):
+    """
+    Record every requirement defined in a module
+
+    Only objects defined by the module itself are recorded, imported ones are skipped.
+
+    Returns:
+        list: The `RequirementRecord` objects, in the order they were found
+    """
+    requirements = []
+
+    def add(obj):
+        requirement = RequirementRecord.from_object(obj)
+        if requirement is not None:
+            requirements.append(requirement)
+
+    for _, c_member in get_classes(module):
+        if c_member.__module__ != module.__name__:
+            continue
+
+        add(c_member)
+        for _, f_member in get_functions(c_member):
+            add(f_member)
+
+    for _, f_member in get_functions(module):
+        if f_member.__module__ != module.__name__:
+            continue
+
+        add(f_member)
+
+    return requirements
+
+
+def record_file(filename, evict_modules=False, folders=None):
+    """
+    Import a file and record its requirements
+
+    Args:
+        filename (str): The file to record, relative to the current directory
+        evict_modules (bool): Remove the modules of `folders` imported by the file from
+            `sys.modules` once its records are created
+        folders (list): The folders whose modules are removed, the directory of the file by default
+
+    Returns:
+        FileRecord: The records of the file
+    """
+    start = time.perf_counter()
+
+    if folders is None:
+        folders = [os.path.dirname(filename) or '.']
+
+    with ModuleSnapshot(evict_modules, folders):
+        logger.debug('Recording %s', filename)
+        module = importlib.import_module(get_module_name(filename))
+        requirements = record_module(module)
+
+    return FileRecord(filename, requirements, time.perf_counter() - start)
@@ -3,16 +3,21 @@
 
 import json
 import logging
+import os
 import sys
-import yaml
 from collections import OrderedDict
 
+from easy_python_requirements.doorstop import export_doorstop
+from easy_python_requirements.fragments import fragment_key
 from easy_python_requirements.parsed import Parsed
-from easy_python_requirements.update import (explore_folder,
-                                             ExploredFile,
+from easy_python_requirements.records import RequirementRecord, record_file
+from easy_python_requirements.snapshot import write_snapshot
+from easy_python_requirements.update import (FileRecorder,
+                                             find_roots,
                                              )
-from easy_python_requirements.util import (indent_string,
-                                           get_depth_of_file,
+from easy_python_requirements.util import (file_signature,
+                                           indent_string,
+                                           get_sorted_file_directory_structure,
                                            get_type
                                            )
 
@@ -20,20 +25,106 @@ logging.basicConfig(stream=sys.stdout)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Change whenever the rendered output changes, so stored renders are not reused
+RENDERER_VERSION = 1
+# Stands for the section number of a file in its stored render
+NUMBER_SLOT = '\x00'
+
 
 class Report:
     """
     Use to generate reports. Also used to update.
+
+    Only the file names are found up front. A file is recorded the first time it is accessed,
+    and its records are kept for later accesses. The modules it imported are not kept, see `FileRecorder`.
+
+    Args:
+        path (str or list): The folder to report on, or a list of root folders
+            that are scanned together and share one report
+        recursive (bool): Report on the packages inside of the folders as well
+        max_rss (int): Resident memory budget in bytes, beyond it files are imported in subprocesses
+        timeout (float): Seconds a single file may take to import. When set, files are imported
+            in a subprocess, and files that time out or fail to import are reported without requirements
     """
 
-    def __init__(self, path, recursive=True):
+    def __init__(self, path, recursive=True, max_rss=None, timeout=None):
         self.path = path
-        self.explored = explore_folder(self.path, recursive)
+        self.roots = [path] if isinstance(path, str) else list(path)
+        self.file_roots = find_roots(self.roots, recursive)
+        self.recorder = FileRecorder(self.roots, max_rss=max_rss, timeout=timeout)
+
+        # file name -> ReportFile, None until the file is first accessed
+        self._report = OrderedDict((file_name, None) for file_name in self.file_roots)
+
+    @property
+    def files(self):
+        """
+        The names of the files in the report, without parsing any of them
+        """
+        return list(self._report)
+
+    def __len__(self):
+        return len(self._report)
+
+    def __iter__(self):
+        return iter(self._report)
+
+    def __contains__(self, file_name):
+        return self._key(file_name) in self._report
+
+    def _key(self, file_name):
+        if file_name in self._report:
+            return file_name
+
+        return os.path.normpath(file_name)
 
-        self._report = OrderedDict()
+    def __getitem__(self, file_name):
+        """
+        Get the `ReportFile` of a file, recording it on first access
+
+        Raises:
+            KeyError: If the file is not part of the report
+        """
+        key = self._key(file_name)
+        file_report = self._report[key]
+
+        if file_report is None:
+            file_report = ReportFile(key, self.recorder.record(key))
+            self._report[key] = file_report
+
+        return file_report
+
+    def close(self):
+        """
+        Stop the import subprocess of the report, if it started one
+        """
+        self.recorder.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
 
-        for file_name, file_dict in self.explored.items():
-            self._report[file_name] = ReportFile(file_name)
+    def items(self):
+        """
+        Iterate over the files of the report, recording each one as it is reached
+
+        Yields:
+            (str, ReportFile): The file name and its report
+        """
+        for file_name in self._report:
+            yield file_name, self[file_name]
+
+    def iter_requirements(self):
+        """
+        Iterate over every requirement in the report, recording each file as it is reached
+
+        Yields:
+            RequirementRecord: The record of each object with a description
+        """
+        for _, file_report in self.items():
+            yield from file_report.iter_requirements()
 
     def update(self):
         pass
@@ -50,111 +141,228 @@ class Report:
     def to_rst(self):
         pass
 
-    def to_doorstop(self):
-        attributes = {
-            'active': True,
-            'derived': False,
-            'level': '0',
-            'links': [],
-            'normative': True,
-            'ref': '',
-            'reviewed': None,
-            'text': ''
-        }
-
-        return yaml.dump(attributes)
-
-    def to_markdown(self):
+    def to_doorstop(self, path, prefix='REQ', **kwargs):
+        """
+        Export the report as a Doorstop document, see `export_doorstop`
+
+        Args:
+            path (str): The directory of the Doorstop document
+            prefix (str): The prefix of the document and its item UIDs
+
+        Returns:
+            dict: The number of items `written`, `unchanged` and `removed`
+        """
+        return export_doorstop(self.iter_requirements(), path, prefix, **kwargs)
+
+    def to_snapshot(self, filename):
+        """
+        Export the report as a binary snapshot, see `write_snapshot`
+
+        Returns:
+            int: The number of requirements written
+        """
+        return write_snapshot(self.iter_requirements(), filename)
+
+    def to_markdown_shards(self, path, max_workers=None):
+        """
+        Write the report with one markdown file per top level directory, see `write_markdown_shards`
+
+        Returns:
+            dict: The number of shards `written`, `unchanged` and `removed`
+        """
+        from easy_python_requirements.shards import write_markdown_shards
+
+        signatures = {file_name: file_signature(file_name) for file_name in self.files}
+
+        return write_markdown_shards(self.iter_requirements(), path, max_workers, signatures)
+
+    def to_markdown(self, fragments=None):
+        """
+        Create the markdown report, see `render_markdown`
+
+        Args:
+            fragments (FragmentCache): Rendered files to reuse
+        """
         logger.info('Reporting on path: {0}'.format(self.path))
 
-        # TODO: Create a nicer formatting and section formatter
-        # import pprint
-        # pprint.pprint(dict(get_sorted_file_directory_structure(report.keys())))
-        # section_tracker = [-1]
+        files = OrderedDict(
+            (file_name, list(file_report.iter_requirements())) for file_name, file_report in self.items()
+        )
 
-        processed = ''
-        for file_name, file_report in self._report.items():
-            depth_of_dir = get_depth_of_file(file_name)
+        return render_markdown(files, fragments, self._signatures(files, fragments))
 
-            # try:
-            #     section_tracker[depth_of_dir] += 1
-            # except IndexError:
-            #     original_len = len(section_tracker)
-            #     while len(section_tracker) < depth_of_dir:
-            #         section_tracker.append(-1)
+    def to_markdown_per_root(self, fragments=None):
+        """
+        Create one markdown report for each root folder
 
-            #     for item in range(1, original_len):
-            #         section_tracker[item] += 1
+        Args:
+            fragments (FragmentCache): Rendered files to reuse
 
-            # processed += '{2} | {1} File: {0}\n\n'.format(file_name,
-            #                                               '#' * (depth_of_dir),
-            #                                               '.'.join(str(index) for index in section_tracker[0:depth_of_dir]))
-            processed += '{1} File: {0}\n\n'.format(file_name, '#' * (depth_of_dir - 1))
+        Returns:
+            OrderedDict: root folder -> markdown report
+        """
+        files = OrderedDict((root, OrderedDict()) for root in self.roots)
 
-            for class_name, class_dict in file_report.objects.items():
-                # Check if we've come to the function key, which specifies functions without a class
-                if class_name == 'function':
-                    for function_name, function_report in class_dict.items():
-                        if function_report.description is None:
-                            continue
+        for file_name, file_report in self.items():
+            files[self.file_roots[file_name]][file_name] = list(file_report.iter_requirements())
 
-                        name_string = '- {0}'.format(function_name)
+        return OrderedDict((root, render_markdown(root_files, fragments, self._signatures(root_files, fragments)))
+                           for root, root_files in files.items())
 
-                        if function_report.test_info.requires_update:
-                            info_string = '- This function requires an update before being processed'
-                        else:
-                            info_string = '- {0}: {1}'.format(function_report.name, function_report.test_info.test_info)
+    def _signatures(self, files, fragments):
+        # Only worth a stat of every file when there are stored renders to look up
+        if fragments is None:
+            return None
 
-                        desc_string = '- {0}'.format(function_report.description)
+        return {file_name: file_signature(file_name) for file_name in files}
 
-                        processed += indent_string(name_string, 0)
-                        processed += indent_string(info_string, 1)
-                        processed += indent_string(desc_string, 2)
-                    continue
 
-                # Now we know we have classes or defined functions left
-                processed += indent_string('- ' + class_name, 0)
-                if class_dict.type == 'class':
-                    for function_name, function_dict in class_dict.function.items():
-                        if function_dict.description is None:
-                            continue
+def _section(number):
+    return '.'.join(str(index) for index in number)
 
-                        if function_dict.test_info.requires_update:
-                            info_string = '- This function requires an update before being processed'
-                        else:
-                            info_string = '- {0}: {1}'.format(function_dict.name, function_dict.test_info.test_info)
 
-                        desc_string = '- {0}'.format(function_dict.description)
+def _heading(depth, label, title):
+    # Markdown stops at six levels of headings
+    return '{0} {1} {2}\n\n'.format('#' * min(depth, 6), label, title)
 
-                        processed += indent_string(info_string, 1)
-                        processed += indent_string(desc_string, 2)
 
-                elif class_dict.type == 'function':
-                    processed += indent_string('- ' + class_dict.name)
+def _info_string(requirement):
+    if requirement.requires_update:
+        return '- This requirement requires an update before being processed'
 
-                else:
-                    pass
+    return '- Test ID {0}: {1}'.format(requirement.test_id, requirement.time_stamp)
 
-            processed += '\n'
-        return processed
+
+def _render_requirement(requirement, level, processed):
+    processed.append(indent_string(_info_string(requirement), level))
+    processed.append(indent_string('- ' + requirement.description, level + 1))
+    if requirement.modified:
+        processed.append(indent_string('- Modified since tagged', level + 1))
+
+
+def _render_file(requirements, label, depth, processed):
+    """
+    Render the requirements of a file, classes before the functions outside of any class
+    """
+    classes = OrderedDict()
+    functions = []
+
+    for requirement in requirements:
+        if requirement.obj_type == 'class':
+            classes.setdefault(requirement.qualname, [None, []])[0] = requirement
+        elif '.' in requirement.qualname:
+            classes.setdefault(requirement.qualname.rsplit('.', 1)[0], [None, []])[1].append(requirement)
+        else:
+            functions.append(requirement)
+
+    index = 0
+    for class_name, (class_requirement, methods) in classes.items():
+        index += 1
+        class_label = '{0}.{1}'.format(label, index)
+        processed.append(_heading(depth, class_label, 'Class: ' + class_name))
+
+        if class_requirement is not None:
+            _render_requirement(class_requirement, 0, processed)
+
+        for method_index, method in enumerate(methods, 1):
+            processed.append(indent_string('- {0}.{1} {2}'.format(class_label, method_index, method.name), 0))
+            _render_requirement(method, 1, processed)
+
+        processed.append('\n')
+
+    for function in functions:
+        index += 1
+        processed.append(indent_string('- {0}.{1} {2}'.format(label, index, function.name), 0))
+        _render_requirement(function, 1, processed)
+
+    if functions:
+        processed.append('\n')
+
+
+def _render_file_fragment(path, requirements, depth, label=NUMBER_SLOT):
+    if label == NUMBER_SLOT and any(NUMBER_SLOT in requirement.description for requirement in requirements):
+        raise ValueError('{0} can not be stored without its section number'.format(path))
+
+    processed = [_heading(depth, label, 'File: ' + path)]
+    _render_file(requirements, label, depth + 1, processed)
+
+    return ''.join(processed)
+
+
+def render_markdown(files, fragments=None, signatures=None):
+    """
+    Create a markdown report with numbered, nested sections:
+    directories, then files, then classes, then functions
+
+    Files are reported in the order they are given, each directory with its first file.
+
+    Args:
+        files (OrderedDict): file name -> the `RequirementRecord` objects of the file
+        fragments (FragmentCache): Rendered files to reuse, and to keep the newly rendered files in.
+            Files are kept without their section number, so they are reused when other files are added or removed
+        signatures (dict): file name -> a signature that changes whenever the requirements of the file change,
+            i.e. its `file_signature`. Files are looked up by their signature, since hashing the requirements
+            costs as much as rendering them, so files without one are always rendered
+
+    Returns:
+        str: The markdown report
+    """
+    processed = []
+    signatures = signatures or {}
+
+    for kind, number, path, value in get_sorted_file_directory_structure(files, files).walk():
+        label = _section(number)
+
+        if kind == 'directory':
+            processed.append(_heading(len(number), label, 'Directory: ' + path))
+        elif fragments is None or signatures.get(path) is None:
+            processed.append(_render_file_fragment(path, value, len(number), label))
+        else:
+            key = fragment_key('markdown', RENDERER_VERSION, len(number), path, signatures[path])
+            try:
+                fragment = fragments.get(key, lambda: _render_file_fragment(path, value, len(number)))
+            except ValueError:
+                processed.append(_render_file_fragment(path, value, len(number), label))
+            else:
+                processed.append(fragment.replace(NUMBER_SLOT, label))
+
+    return ''.join(processed)
+
+
+def requirements_to_markdown(requirements, fragments=None, signatures=None):
+    """
+    Create a markdown report from requirement records, see `render_markdown`
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects
+        fragments (FragmentCache): Rendered files to reuse
+        signatures (dict): file name -> signature, to look up rendered files by, see `render_markdown`
+
+    Returns:
+        str: The markdown report
+    """
+    files = OrderedDict()
+
+    for requirement in requirements:
+        files.setdefault(requirement.filename, []).append(requirement)
+
+    return render_markdown(files, fragments, signatures)
 
 
 class FileIterator:
+    """
+    Iterate over the (file name, `ReportFile`) pairs of a report, recording each file as it is reached
+    """
+
     def __init__(self, report):
         self.report = report
 
     def __iter__(self):
-        self.index = 0
         self.items = self.report.items()
         return self
 
     def __next__(self):
-        self.index += 1
-
-        if self.index < len(self.items):
-            return self.items[self.index]
-        else:
-            raise StopIteration
+        return next(self.items)
 
 # def report_file(filename):
 #     explored = ExploredFile(filename)
@@ -181,28 +389,35 @@ class FileIterator:
 
 
 class ReportFile:
-    def __init__(self, filename):
-        self.filename = filename
-        self.explored = ExploredFile(self.filename)
-        self.explored.explore()
-        self.objects = OrderedDict()
-        self.objects['function'] = OrderedDict()
+    """
+    The requirements of a single file of a report
 
-        for c_value, c_function in self.explored.module.items():
-            class_report = ReportObject(c_value)
+    Args:
+        filename (str): The file
+        record (FileRecord): The records of the file, None to record it here
 
-            for f_name, f_value in c_function.items():
-                object_report = ReportObject(f_value)
+    Attributes:
+        requirements (list): The `RequirementRecord` objects of the file
+        skipped (bool): True if the file could not be recorded
+    """
 
-                if object_report.description:
-                    class_report.function[object_report.name] = object_report
+    def __init__(self, filename, record=None):
+        self.filename = filename
 
-            self.objects[class_report.name] = class_report
+        if record is None:
+            record = record_file(filename, evict_modules=True)
 
-        for f_name, f_value in self.explored.function.items():
-            function_report = ReportObject(f_value)
-            if function_report.description:
-                self.objects['function'][function_report.name] = function_report
+        self.requirements = record.requirements
+        self.skipped = record.skipped
+
+    def iter_requirements(self):
+        """
+        Iterate over every requirement in the file
+
+        Yields:
+            RequirementRecord: The record of each object with a description
+        """
+        return iter(self.requirements)
 
 
 class ReportObject:
@@ -220,12 +435,15 @@ class ReportObject:
     """
     def __init__(self, obj: object):
         self.name = obj.__name__
+        self.qualname = obj.__qualname__
         self.type = get_type(obj)
 
         p = Parsed(obj)
         p.parse()
 
         self.description = p.description
+        self.requires_update = p.requires_update
+        self.modified = p.modified
         self.test_info = p.test_info
         self.file_info = p.file_info
 
@@ -239,6 +457,22 @@ class ReportObject:
                                      'function'
                                      ]
 
+    def to_record(self):
+        """
+        Create the plain requirement record of this object
+        """
+        return RequirementRecord(self.name,
+                                 self.qualname,
+                                 self.type,
+                                 self.file_info.relative_name,
+                                 self.file_info.line_number,
+                                 self.description,
+                                 self.requires_update,
+                                 self.test_info.test_id,
+                                 self.test_info.time_stamp,
+                                 self.modified,
+                                 )
+
     def to_json(self):
         """
         Take an object and create a JSON object that represents all the pertinent report information
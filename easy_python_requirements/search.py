@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import re
+
+TOKEN_PATTERN = re.compile(r'\w+')
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    """
+    Split a text into lower case word tokens
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchHit:
+    """
+    A requirement that matched a query
+
+    Attributes:
+        test_id (int): The test id of the requirement, -1 if it does not have one yet
+        filename (str): The file of the requirement
+        qualname (str): The qualified name of the requirement
+    """
+
+    def __init__(self, test_id, filename, qualname):
+        self.test_id = test_id
+        self.filename = filename
+        self.qualname = qualname
+
+    def to_dict(self):
+        return {'test_id': self.test_id, 'filename': self.filename, 'qualname': self.qualname}
+
+    def __eq__(self, other):
+        return isinstance(other, SearchHit) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '<SearchHit: {0}:{1}>'.format(self.filename, self.qualname)
+
+
+class SearchIndex:
+    """
+    Inverted index over requirement descriptions, updated one file at a time
+
+    Supports term, "phrase" and prefix* queries. Every term of a query has to match.
+
+    Attributes:
+        postings (dict): term -> {document id -> list of token positions}
+        documents (dict): document id -> `SearchHit`
+        file_documents (dict): file name -> list of document ids
+        terms (list): Every term in the index, sorted, for prefix queries
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.documents = {}
+        self.file_documents = {}
+        self.document_terms = {}
+        self.terms = []
+        self.next_document = 0
+
+    def add_document(self, hit, description):
+        document = self.next_document
+        self.next_document += 1
+        self.documents[document] = hit
+
+        for position, term in enumerate(tokenize(description or '')):
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.terms, term)
+
+            self.postings[term].setdefault(document, []).append(position)
+            self.document_terms.setdefault(document, set()).add(term)
+
+        return document
+
+    def remove_file(self, filename):
+        for document in self.file_documents.pop(filename, []):
+            del self.documents[document]
+
+            for term in self.document_terms.pop(document, ()):
+                documents = self.postings[term]
+                del documents[document]
+
+                if not documents:
+                    del self.postings[term]
+                    del self.terms[bisect.bisect_left(self.terms, term)]
+
+    def update_file(self, filename, requirements):
+        """
+        Replace the documents of a file with its current requirements
+
+        Args:
+            filename (str): The file
+            requirements (list): The `RequirementRecord` objects of the file
+        """
+        self.remove_file(filename)
+
+        self.file_documents[filename] = [
+            self.add_document(SearchHit(r.test_id, r.filename, r.qualname), r.description)
+            for r in requirements
+        ]
+
+    def term(self, term):
+        """
+        Get the documents that contain a term
+
+        Returns:
+            set: The document ids
+        """
+        return set(self.postings.get(term.lower(), {}))
+
+    def prefix(self, prefix):
+        """
+        Get the documents that contain a term starting with `prefix`
+
+        Returns:
+            set: The document ids
+        """
+        prefix = prefix.lower()
+        documents = set()
+
+        index = bisect.bisect_left(self.terms, prefix)
+        while index < len(self.terms) and self.terms[index].startswith(prefix):
+            documents.update(self.postings[self.terms[index]])
+            index += 1
+
+        return documents
+
+    def phrase(self, phrase):
+        """
+        Get the documents that contain the terms of a phrase, next to each other and in order
+
+        Returns:
+            set: The document ids
+        """
+        terms = tokenize(phrase)
+        if not terms:
+            return set()
+
+        documents = set.intersection(*(self.term(term) for term in terms))
+
+        matched = set()
+        for document in documents:
+            starts = set(self.postings[terms[0]][document])
+            for offset, term in enumerate(terms[1:], 1):
+                starts &= set(position - offset for position in self.postings[term][document])
+
+            if starts:
+                matched.add(document)
+
+        return matched
+
+    def search(self, query):
+        """
+        Find the requirements that match every part of a query
+
+        Args:
+            query (str): Terms, "quoted phrases" and prefix* terms, i.e. `"read timeout" retr*`
+
+        Returns:
+            list: The matching `SearchHit` objects, in index order
+        """
+        results = None
+
+        for phrase, word in QUERY_PATTERN.findall(query):
+            if phrase:
+                documents = self.phrase(phrase)
+            elif word.endswith('*'):
+                documents = self.prefix(word[:-1])
+            else:
+                words = tokenize(word)
+                documents = self.phrase(word) if len(words) > 1 else self.term(words[0] if words else '')
+
+            results = documents if results is None else results & documents
+            if not results:
+                return []
+
+        return [self.documents[document] for document in sorted(results or [])]
+
+    def to_dict(self):
+        return {
+            'next_document': self.next_document,
+            'documents': {str(document): hit.to_dict() for document, hit in self.documents.items()},
+            'file_documents': self.file_documents,
+            'postings': {term: {str(document): positions for document, positions in documents.items()}
+                         for term, documents in self.postings.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.next_document = data['next_document']
+        index.documents = {int(document): SearchHit(**hit) for document, hit in data['documents'].items()}
+        index.file_documents = data['file_documents']
+        index.postings = {term: {int(document): positions for document, positions in documents.items()}
+                          for term, documents in data['postings'].items()}
+        index.terms = sorted(index.postings)
+
+        for term, documents in index.postings.items():
+            for document in documents:
+                index.document_terms.setdefault(document, set()).add(term)
+
+        return index
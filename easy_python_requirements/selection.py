@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import subprocess
+import sys
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# The default `python_classes` and `python_functions` of pytest
+TEST_CLASS_PREFIX = 'Test'
+TEST_FUNCTION_PREFIX = 'test'
+
+
+def node_id(requirement):
+    """
+    Get the pytest node id of a requirement, i.e. `test/test_file.py::TestClass::test_method`
+    """
+    return '::'.join([requirement.filename.replace(os.sep, '/')] + requirement.qualname.split('.'))
+
+
+def is_test(requirement):
+    """
+    Check if pytest collects the object of a requirement with its default settings
+    """
+    parts = requirement.qualname.split('.')
+
+    if '<locals>' in parts:
+        return False
+    if requirement.obj_type == 'class':
+        return all(part.startswith(TEST_CLASS_PREFIX) for part in parts)
+
+    return (all(part.startswith(TEST_CLASS_PREFIX) for part in parts[:-1])
+            and parts[-1].startswith(TEST_FUNCTION_PREFIX))
+
+
+class SelectionIndex:
+    """
+    Index of requirements by file and by test id, to select the tests to run
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects
+        tests_only (bool): Leave out the objects pytest would not collect
+
+    Attributes:
+        files (dict): normalized file name -> list of `RequirementRecord`
+        test_ids (dict): test id -> list of `RequirementRecord`
+    """
+
+    def __init__(self, requirements, tests_only=True):
+        self.files = {}
+        self.test_ids = {}
+
+        for requirement in requirements:
+            if tests_only and not is_test(requirement):
+                continue
+
+            self.files.setdefault(os.path.normpath(requirement.filename), []).append(requirement)
+            if requirement.test_id >= 0:
+                self.test_ids.setdefault(requirement.test_id, []).append(requirement)
+
+    def select(self, files=None, test_ids=None):
+        """
+        Select the requirements in any of the files, or with any of the test ids
+
+        Args:
+            files (iterable): File names, i.e. the files changed since the last run
+            test_ids (iterable): Test ids
+
+        Returns:
+            list: The pytest node ids of the selected requirements, each once, in selection order
+        """
+        selected = []
+
+        for filename in files or ():
+            selected.extend(self.files.get(os.path.normpath(filename), ()))
+        for test_id in test_ids or ():
+            selected.extend(self.test_ids.get(int(test_id), ()))
+
+        node_ids = []
+        seen = set()
+        for requirement in selected:
+            current = node_id(requirement)
+            if current not in seen:
+                seen.add(current)
+                node_ids.append(current)
+
+        return node_ids
+
+
+def keyword_expression(node_ids):
+    """
+    Create a pytest `-k` expression that matches the selected tests by name
+
+    It can match more tests than selected, when tests in other files share a name.
+    """
+    names = []
+
+    for current in node_ids:
+        name = current.split('::')[-1]
+        if name not in names:
+            names.append(name)
+
+    return ' or '.join(names)
+
+
+def changed_files(since='HEAD'):
+    """
+    Get the files changed since a git revision, relative to the current directory,
+    including changes that are not committed yet and new files that git does not track yet
+
+    Returns:
+        list: The file names
+    """
+    changed = subprocess.run(['git', 'diff', '--name-only', '--relative', since, '--'],
+                             stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                               stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+
+    return [line for line in (changed + '\n' + untracked).split('\n') if line]
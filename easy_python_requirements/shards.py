@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from easy_python_requirements import config
+from easy_python_requirements.doorstop import write_if_changed
+from easy_python_requirements.fragments import fragment_key
+from easy_python_requirements.report import RENDERER_VERSION, render_markdown
+from easy_python_requirements.util import split_path
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+INDEX_FILE = 'index.md'
+MANIFEST_FILE = '.shards.json'
+ROOT_SHARD = '_root'
+
+
+def shard_name(filename):
+    """
+    Get the shard of a file: its top level directory, or `ROOT_SHARD` for files outside of any directory
+
+    Reserved names never collide with a directory: directories starting with '_' or named
+    like the index get a leading '_', and files outside of the current directory get a shard
+    named after how many levels up they are, i.e. '_up1_other' for '../other/test.py'.
+    """
+    parts = split_path(os.path.normpath(filename))
+
+    up = 0
+    while up < len(parts) - 1 and parts[up] == os.pardir:
+        up += 1
+    parts = parts[up:]
+
+    if len(parts) > 1:
+        name = parts[0]
+        if name.startswith('_') or name == os.path.splitext(INDEX_FILE)[0]:
+            name = '_' + name
+    else:
+        name = ROOT_SHARD
+
+    if up:
+        return '_up{0}{1}'.format(up, '' if name == ROOT_SHARD else '_' + name)
+
+    return name
+
+
+def shard_hash(files, signatures=None):
+    """
+    Hash the input of a shard, so it is only rendered again when its files, the renderer or the config change
+
+    Args:
+        files (OrderedDict): file name -> the `RequirementRecord` objects of the file
+        signatures (dict): file name -> `file_signature` of the file. Files without one
+            are hashed by their requirements instead
+
+    Returns:
+        str: The hash of the shard
+    """
+    signatures = signatures or {}
+
+    parts = []
+    for filename, requirements in files.items():
+        signature = signatures.get(filename)
+        if signature is None:
+            signature = [requirement.to_dict() for requirement in requirements]
+        parts.append((filename, signature))
+
+    return fragment_key('markdown_shard', RENDERER_VERSION, sorted(config.items()), parts)
+
+
+def _render_shard(item):
+    name, files = item
+    return name, render_markdown(files)
+
+
+def write_markdown_shards(requirements, path, max_workers=None, signatures=None):
+    """
+    Write a markdown report with one file per top level directory, and an index linking them
+
+    Shards are rendered in parallel processes, and only when their files changed
+    since the last time they were written to `path`, see `shard_hash`.
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects, ordered by file
+        path (str): The directory to write the report to
+        max_workers (int): Number of rendering processes, see `ProcessPoolExecutor`
+        signatures (dict): file name -> `file_signature` of the file the requirements were read from
+
+    Returns:
+        dict: The number of shards `written`, `unchanged` and `removed`
+    """
+    os.makedirs(path, exist_ok=True)
+
+    shards = OrderedDict()
+    for requirement in requirements:
+        files = shards.setdefault(shard_name(requirement.filename), OrderedDict())
+        files.setdefault(requirement.filename, []).append(requirement)
+
+    manifest_file = os.path.join(path, MANIFEST_FILE)
+    try:
+        with open(manifest_file) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    hashes = OrderedDict((name, shard_hash(files, signatures)) for name, files in shards.items())
+    dirty = [(name, files) for name, files in shards.items()
+             if previous.get(name) != hashes[name] or not os.path.exists(os.path.join(path, name + '.md'))]
+
+    if len(dirty) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers) as executor:
+            rendered = list(executor.map(_render_shard, dirty))
+    else:
+        rendered = [_render_shard(item) for item in dirty]
+
+    written = 0
+    for name, content in rendered:
+        written += write_if_changed(os.path.join(path, name + '.md'), content)
+
+    removed = 0
+    for name in previous:
+        if name not in shards and os.path.exists(os.path.join(path, name + '.md')):
+            os.remove(os.path.join(path, name + '.md'))
+            removed += 1
+
+    index = ['# Requirements\n\n']
+    for name, files in shards.items():
+        index.append('- [{0}]({0}.md): {1} requirements in {2} files\n'.format(
+            name, sum(len(requirements) for requirements in files.values()), len(files)))
+    write_if_changed(os.path.join(path, INDEX_FILE), ''.join(index))
+
+    with open(manifest_file, 'w') as f:
+        json.dump(hashes, f)
+
+    logger.info('Wrote %d of %d report shards to %s', written, len(shards), path)
+
+    return {'written': written, 'unchanged': len(shards) - written, 'removed': removed}
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near duplicate requirement descriptions, found with MinHash signatures and locality sensitive hashing
+
+Every description gets a signature once. Descriptions are only compared when a band of
+their signatures falls in the same bucket, so the work grows with the number of
+descriptions, not with the number of pairs.
+"""
+
+import json
+import logging
+import random
+import sys
+import zlib
+
+from easy_python_requirements.search import tokenize
+from easy_python_requirements.test_info import description_hash
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_SIGNATURE_FILE = '.easy_python_requirements_signatures.json'
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_BANDS = 16
+DEFAULT_ROWS = 4
+SHINGLE_SIZE = 3
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def shingles(description, size=SHINGLE_SIZE):
+    """
+    Split a description into the set of its word `size`-grams
+
+    A description shorter than `size` words is a single shingle.
+    """
+    words = tokenize(description or '')
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+
+    return {' '.join(words[index:index + size]) for index in range(len(words) - size + 1)}
+
+
+def jaccard(first, second):
+    if not first and not second:
+        return 1.0
+
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """
+    Create MinHash signatures of descriptions
+
+    Args:
+        num_perm (int): The length of the signatures
+        seed (int): The seed of the hash permutations, signatures are only comparable with the same seed
+    """
+
+    def __init__(self, num_perm=DEFAULT_BANDS * DEFAULT_ROWS, seed=1):
+        self.num_perm = num_perm
+        self.seed = seed
+
+        generator = random.Random(seed)
+        self.permutations = [(generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+
+    def signature(self, description):
+        """
+        Get the MinHash signature of a description
+
+        Returns:
+            list: `num_perm` integers, empty if the description has no words
+        """
+        hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(description)]
+        if not hashes:
+            return []
+
+        return [min((a * value + b) % MERSENNE_PRIME for value in hashes) & MAX_HASH
+                for a, b in self.permutations]
+
+
+class SignatureCache:
+    """
+    MinHash signatures by description hash, so an unchanged description is never hashed again
+
+    Attributes:
+        signatures (dict): description hash -> signature
+    """
+
+    def __init__(self, hasher=None):
+        self.hasher = hasher or MinHasher()
+        self.signatures = {}
+
+    def signature(self, description):
+        key = description_hash(description or '')
+
+        if key not in self.signatures:
+            self.signatures[key] = self.hasher.signature(description)
+
+        return self.signatures[key]
+
+    def save(self, filename=DEFAULT_SIGNATURE_FILE):
+        data = {
+            'num_perm': self.hasher.num_perm,
+            'seed': self.hasher.seed,
+            'signatures': self.signatures,
+        }
+
+        with open(filename, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_SIGNATURE_FILE, hasher=None):
+        """
+        Load signatures saved with `save`, started over if they were made with another hasher
+        """
+        cache = cls(hasher)
+
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+
+        if data.get('num_perm') != cache.hasher.num_perm or data.get('seed') != cache.hasher.seed:
+            logger.info('Ignoring signatures %s, they were made with other settings', filename)
+            return cache
+
+        cache.signatures = data['signatures']
+
+        return cache
+
+
+class NearDuplicate:
+    """
+    Two requirements with similar descriptions
+
+    Attributes:
+        first (RequirementRecord): The requirement found first
+        second (RequirementRecord): The requirement found second
+        similarity (float): The Jaccard similarity of the description shingles
+    """
+
+    def __init__(self, first, second, similarity):
+        self.first = first
+        self.second = second
+        self.similarity = similarity
+
+    def to_dict(self):
+        return {
+            'similarity': round(self.similarity, 3),
+            'first': {'test_id': self.first.test_id, 'filename': self.first.filename, 'qualname': self.first.qualname},
+            'second': {'test_id': self.second.test_id, 'filename': self.second.filename,
+                       'qualname': self.second.qualname},
+        }
+
+    def __repr__(self):
+        return '<NearDuplicate: {0} ~ {1} ({2:.2f})>'.format(self.first.qualname, self.second.qualname,
+                                                             self.similarity)
+
+
+def find_near_duplicates(requirements, threshold=DEFAULT_THRESHOLD, bands=DEFAULT_BANDS, rows=DEFAULT_ROWS,
+                         cache=None):
+    """
+    Find the pairs of requirements with similar descriptions
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects
+        threshold (float): The lowest similarity to report
+        bands (int): The number of LSH bands, more bands find less similar pairs
+        rows (int): The signature values in each band
+        cache (SignatureCache): Signatures from earlier runs, made with `bands * rows` permutations
+
+    Returns:
+        list: The `NearDuplicate` pairs, most similar first
+    """
+    cache = cache or SignatureCache(MinHasher(bands * rows))
+    if cache.hasher.num_perm != bands * rows:
+        raise ValueError('The signatures have {0} values, {1} bands of {2} rows need {3}'.format(
+            cache.hasher.num_perm, bands, rows, bands * rows))
+
+    requirements = [requirement for requirement in requirements if requirement.description]
+    buckets = {}
+
+    for position, requirement in enumerate(requirements):
+        signature = cache.signature(requirement.description)
+        if not signature:
+            continue
+
+        for band in range(bands):
+            key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            buckets.setdefault(key, []).append(position)
+
+    candidates = set()
+    for members in buckets.values():
+        for index, first in enumerate(members):
+            for second in members[index + 1:]:
+                candidates.add((first, second))
+
+    found = []
+    shingled = {}
+    for first, second in sorted(candidates):
+        for position in (first, second):
+            if position not in shingled:
+                shingled[position] = shingles(requirements[position].description)
+
+        similarity = jaccard(shingled[first], shingled[second])
+        if similarity >= threshold:
+            found.append(NearDuplicate(requirements[first], requirements[second], similarity))
+
+    found.sort(key=lambda pair: -pair.similarity)
+
+    return found
+
+
+def near_duplicates_to_json(pairs):
+    return json.dumps([pair.to_dict() for pair in pairs])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact binary snapshot of a set of requirements
+
+Layout, all little endian:
+
+- Header: magic, version, record size, record count and heap offset
+- Record table: one fixed width record per requirement, sorted by test id
+- String heap: the utf-8 strings the records point to, each stored once
+"""
+
+import mmap
+import os
+import struct
+
+from easy_python_requirements.exceptions import SnapshotError
+from easy_python_requirements.records import RequirementRecord
+
+SNAPSHOT_MAGIC = b'EPRS'
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_FILE = 'requirements.snapshot'
+
+HEADER = struct.Struct('<4sHHQQ')
+# test_id, line_number, flags, then (offset, length) of name, qualname, filename, time_stamp and description
+RECORD = struct.Struct('<qII' + 'II' * 5)
+TEST_ID = struct.Struct('<q')
+
+FLAG_REQUIRES_UPDATE = 1
+FLAG_MODIFIED = 2
+FLAG_CLASS = 4
+
+STRING_FIELDS = ('name', 'qualname', 'filename', 'time_stamp', 'description')
+
+
+def write_snapshot(requirements, filename=DEFAULT_SNAPSHOT_FILE):
+    """
+    Write requirements to a binary snapshot, see `SnapshotReader`
+
+    Args:
+        requirements (iterable): The `RequirementRecord` objects
+        filename (str): The snapshot file, replaced at once when it is complete
+
+    Returns:
+        int: The number of requirements written
+    """
+    requirements = sorted(requirements, key=lambda requirement: requirement.test_id)
+
+    heap = bytearray()
+    strings = {}
+
+    def add_string(value):
+        if value not in strings:
+            encoded = (value or '').encode('utf-8')
+            strings[value] = (len(heap), len(encoded))
+            heap.extend(encoded)
+
+        return strings[value]
+
+    table = bytearray()
+    for requirement in requirements:
+        flags = 0
+        if requirement.requires_update:
+            flags |= FLAG_REQUIRES_UPDATE
+        if requirement.modified:
+            flags |= FLAG_MODIFIED
+        if requirement.obj_type == 'class':
+            flags |= FLAG_CLASS
+
+        references = []
+        for field in STRING_FIELDS:
+            references.extend(add_string(getattr(requirement, field)))
+
+        table.extend(RECORD.pack(requirement.test_id, requirement.line_number or 0, flags, *references))
+
+    temp_file = filename + '.tmp'
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, RECORD.size, len(requirements),
+                            HEADER.size + len(table)))
+        f.write(table)
+        f.write(heap)
+
+    os.replace(temp_file, filename)
+
+    return len(requirements)
+
+
+class SnapshotReader:
+    """
+    Random access to the requirements of a snapshot, without loading the whole file
+
+    The file is mapped into memory, and a record is only decoded when it is asked for.
+
+    Args:
+        filename (str): The snapshot file
+
+    Raises:
+        SnapshotError: If the file is not a snapshot this reader understands
+    """
+
+    def __init__(self, filename=DEFAULT_SNAPSHOT_FILE):
+        self.filename = filename
+
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise SnapshotError('{0} is not a requirement snapshot'.format(filename))
+
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, self.count, self.heap_offset = HEADER.unpack_from(self.data)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError('{0} is not a requirement snapshot'.format(filename))
+        if version != SNAPSHOT_VERSION or record_size != RECORD.size:
+            self.close()
+            raise SnapshotError('{0} has snapshot version {1}, expected {2}'.format(
+                filename, version, SNAPSHOT_VERSION))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('snapshot index out of range')
+
+        test_id, line_number, flags, *references = RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+        values = {}
+        for position, field in enumerate(STRING_FIELDS):
+            offset, length = references[2 * position], references[2 * position + 1]
+            start = self.heap_offset + offset
+            values[field] = self.data[start:start + length].decode('utf-8')
+
+        return RequirementRecord(values['name'],
+                                 values['qualname'],
+                                 'class' if flags & FLAG_CLASS else 'function',
+                                 values['filename'],
+                                 line_number,
+                                 values['description'],
+                                 bool(flags & FLAG_REQUIRES_UPDATE),
+                                 test_id,
+                                 values['time_stamp'],
+                                 bool(flags & FLAG_MODIFIED),
+                                 )
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def test_id_at(self, index):
+        return TEST_ID.unpack_from(self.data, HEADER.size + index * RECORD.size)[0]
+
+    def find(self, test_id):
+        """
+        Find every requirement with a test id, by binary search over the record table
+
+        Returns:
+            list: The `RequirementRecord` objects, more than one only if the id is duplicated
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.test_id_at(middle) < test_id:
+                low = middle + 1
+            else:
+                high = middle
+
+        found = []
+        while low < self.count and self.test_id_at(low) == test_id:
+            found.append(self[low])
+            low += 1
+
+        return found
+
+    def get(self, test_id, default=None):
+        found = self.find(test_id)
+
+        return found[0] if found else default
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
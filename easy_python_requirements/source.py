@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import ast
+import logging
+import sys
+import tokenize
+
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.parsed import parse_doc
+from easy_python_requirements.records import RequirementRecord
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class SourceDocstring:
+    """
+    A docstring found in source code, without importing it
+
+    Attributes:
+        name (str): The name of the object
+        qualname (str): The qualified name of the object, i.e. `Class.function`
+        obj_type (str): The objects type (i.e., 'class', 'function')
+        filename (str): The file the object is defined in
+        line_number (int): The line where the object definition starts, including decorators
+        docstring (str): The docstring, exactly as written in the source
+        doc_line (int): The line where the docstring starts
+        source_lines (list): The lines of the docstring literal as written in the file, from `doc_line` on.
+            They differ from the lines of `docstring` when it contains escapes or line continuations
+    """
+
+    def __init__(self, name, qualname, obj_type, filename, line_number, docstring, doc_line, source_lines=None):
+        self.name = name
+        self.qualname = qualname
+        self.obj_type = obj_type
+        self.filename = filename
+        self.line_number = line_number
+        self.docstring = docstring
+        self.doc_line = doc_line
+        self.source_lines = source_lines
+
+    def info_lines(self):
+        """
+        Find the TEST INFO lines of the docstring
+
+        Returns:
+            list: (index, line) of each TEST INFO line, where index is the 0-based line in the file
+        """
+        matcher = get_matcher()
+        lines = self.source_lines if self.source_lines is not None else self.docstring.split('\n')
+
+        return [(self.doc_line - 1 + offset, line.strip())
+                for offset, line in enumerate(lines)
+                if matcher.is_info(line)]
+
+    def to_record(self):
+        """
+        Parse the docstring into a requirement record
+
+        Returns:
+            RequirementRecord: The record, or None if the docstring has no requirement
+        """
+        obj_dict = parse_doc(self.docstring)
+
+        if obj_dict['description'] is None:
+            return None
+
+        test_info = obj_dict.get('test_info', {})
+
+        return RequirementRecord(self.name,
+                                 self.qualname,
+                                 self.obj_type,
+                                 self.filename,
+                                 self.line_number,
+                                 obj_dict['description'],
+                                 obj_dict['requires_update'],
+                                 test_info.get('test_id', -1),
+                                 test_info.get('time_stamp', ''),
+                                 obj_dict.get('modified', False),
+                                 )
+
+    def __repr__(self):
+        return '<SourceDocstring: {0}:{1}>'.format(self.filename, self.qualname)
+
+
+def _iter_nodes(body, prefix=''):
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            yield prefix + node.name, 'class', node
+            yield from _iter_nodes(node.body, prefix + node.name + '.')
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield prefix + node.name, 'function', node
+
+
+def iter_docstrings(source, filename):
+    """
+    Find the docstrings of the classes and functions in source code
+
+    Classes are searched recursively, function bodies are not.
+
+    Args:
+        source (str): The source code
+        filename (str): The name of the file the source code is from
+
+    Yields:
+        SourceDocstring: Each docstring, in source order
+    """
+    tree = ast.parse(source, filename)
+    lines = source.splitlines()
+
+    for qualname, obj_type, node in _iter_nodes(tree.body):
+        if not node.body or not isinstance(node.body[0], ast.Expr):
+            continue
+
+        value = node.body[0].value
+        if not isinstance(value, ast.Constant) or not isinstance(value.value, str):
+            continue
+
+        line_number = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+
+        yield SourceDocstring(node.name, qualname, obj_type, filename, line_number, value.value, value.lineno,
+                              lines[value.lineno - 1:value.end_lineno])
+
+
+def read_source(filename):
+    """
+    Read a source file, honoring its encoding declaration
+    """
+    with tokenize.open(filename) as f:
+        return f.read()
+
+
+def record_source(source, filename):
+    """
+    Record the requirements of source code, without importing it
+
+    Returns:
+        list: The `RequirementRecord` objects, in source order
+    """
+    requirements = []
+
+    # Most files have no requirements at all, skip parsing them
+    if not get_matcher().search(source):
+        return requirements
+
+    for docstring in iter_docstrings(source, filename):
+        requirement = docstring.to_record()
+        if requirement is not None:
+            requirements.append(requirement)
+
+    return requirements
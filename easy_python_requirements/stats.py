@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+
+from easy_python_requirements import config
+from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.parsed import parse_doc
+from easy_python_requirements.source import iter_docstrings, read_source
+from easy_python_requirements.update import find_files
+from easy_python_requirements.util import file_signature, split_path
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+STATS_VERSION = 1
+DEFAULT_STATS_FILE = '.easy_python_requirements_stats.json'
+METRIC_NAME = 'easy_python_requirements_requirements'
+
+
+class RequirementCounts:
+    """
+    The number of requirements of each status
+
+    Attributes:
+        tagged (int): Requirements with a valid, up to date TEST INFO line
+        untagged (int): Requirements without a TEST INFO line
+        needs_update (int): Requirements with an empty TEST INFO line, or a description changed since tagged
+        malformed (int): Requirements with an unreadable TEST INFO line, or more than one
+    """
+
+    statuses = ('tagged', 'untagged', 'needs_update', 'malformed')
+
+    def __init__(self, tagged=0, untagged=0, needs_update=0, malformed=0):
+        self.tagged = tagged
+        self.untagged = untagged
+        self.needs_update = needs_update
+        self.malformed = malformed
+
+    def add(self, other, sign=1):
+        for status in self.statuses:
+            setattr(self, status, getattr(self, status) + sign * getattr(other, status))
+
+    def total(self):
+        return sum(getattr(self, status) for status in self.statuses)
+
+    def to_dict(self):
+        return OrderedDict((status, getattr(self, status)) for status in self.statuses)
+
+    def __eq__(self, other):
+        return isinstance(other, RequirementCounts) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '<RequirementCounts: {0}>'.format(dict(self.to_dict()))
+
+
+def count_source(source, filename):
+    """
+    Count the requirements of a source file by status, without importing it
+
+    Returns:
+        RequirementCounts: The counts of the file
+    """
+    counts = RequirementCounts()
+    matcher = get_matcher()
+
+    if not matcher.search(source):
+        return counts
+
+    for docstring in iter_docstrings(source, filename):
+        try:
+            obj_dict = parse_doc(docstring.docstring)
+        except MultipleStringError:
+            counts.malformed += 1
+            continue
+
+        if obj_dict['description'] is None:
+            continue
+
+        info_lines = docstring.info_lines()
+        if not obj_dict['requires_update']:
+            if obj_dict.get('modified', False):
+                counts.needs_update += 1
+            else:
+                counts.tagged += 1
+        elif not info_lines:
+            counts.untagged += 1
+        elif not matcher.split_info(info_lines[0][1])[1].strip():
+            counts.needs_update += 1
+        else:
+            counts.malformed += 1
+
+    return counts
+
+
+def directories_of(filename):
+    """
+    Get the directories a file counts towards, from the whole tree ('.') down to its own directory
+    """
+    parts = split_path(filename)[:-1]
+
+    return ['.'] + ['/'.join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+
+
+class RequirementStats:
+    """
+    Requirement counts per file and per directory, where a file is only counted again when it changes
+
+    Directory counts are updated by the difference of each changed file, so they are never summed from scratch.
+
+    Attributes:
+        files (OrderedDict): file name -> (`file_signature`, `RequirementCounts`)
+        directories (dict): directory -> `RequirementCounts` of every file below it, '.' for the whole tree
+    """
+
+    def __init__(self):
+        self.files = OrderedDict()
+        self.directories = {}
+
+    def _apply(self, filename, counts, sign):
+        for directory in directories_of(filename):
+            if directory not in self.directories:
+                self.directories[directory] = RequirementCounts()
+
+            self.directories[directory].add(counts, sign)
+
+            if sign < 0 and self.directories[directory].total() == 0:
+                del self.directories[directory]
+
+    def count(self, filename):
+        try:
+            return count_source(read_source(filename), filename)
+        except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+            logger.warning('Could not count %s: %s', filename, str(e))
+            return RequirementCounts()
+
+    def refresh(self, filenames):
+        """
+        Bring the counts up to date with a list of files
+
+        Args:
+            filenames (list): Every file that should be counted
+
+        Returns:
+            (list, list): The names of the changed or new files, and the names of the removed files
+        """
+        changed = []
+        wanted = set(filenames)
+        removed = [filename for filename in self.files if filename not in wanted]
+
+        for filename in removed:
+            self._apply(filename, self.files.pop(filename)[1], -1)
+
+        refreshed = OrderedDict()
+        for filename in filenames:
+            signature = file_signature(filename)
+            cached = self.files.get(filename)
+
+            if cached is None or cached[0] != signature:
+                if cached is not None:
+                    self._apply(filename, cached[1], -1)
+
+                cached = (signature, self.count(filename))
+                self._apply(filename, cached[1], 1)
+                changed.append(filename)
+
+            refreshed[filename] = cached
+
+        self.files = refreshed
+
+        return changed, removed
+
+    def refresh_folder(self, foldername, recursive=True):
+        return self.refresh(find_files(foldername, recursive))
+
+    def to_dict(self):
+        return OrderedDict([
+            ('directories', OrderedDict((directory, self.directories[directory].to_dict())
+                                        for directory in sorted(self.directories))),
+            ('files', OrderedDict((filename, counts.to_dict()) for filename, (_, counts) in self.files.items())),
+        ])
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def to_prometheus(self, per_file=False):
+        """
+        Create the counts in the Prometheus text format, for the node exporter textfile collector
+
+        Args:
+            per_file (bool): Add a series for each file, not only for each directory
+
+        Returns:
+            str: The metrics
+        """
+        lines = [
+            '# HELP {0} Number of requirements by status'.format(METRIC_NAME),
+            '# TYPE {0} gauge'.format(METRIC_NAME),
+        ]
+
+        series = [('directory', directory, self.directories[directory]) for directory in sorted(self.directories)]
+        if per_file:
+            series.extend(('file', filename, counts) for filename, (_, counts) in self.files.items())
+
+        for label, value, counts in series:
+            for status, number in counts.to_dict().items():
+                lines.append('{0}{{{1}="{2}",status="{3}"}} {4}'.format(
+                    METRIC_NAME, label, _escape_label(value), status, number))
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, filename, per_file=False):
+        """
+        Write the metrics of `to_prometheus`, replacing the file at once so it is never read half written
+        """
+        temp_file = filename + '.tmp'
+
+        with open(temp_file, 'w') as f:
+            f.write(self.to_prometheus(per_file))
+
+        os.replace(temp_file, filename)
+
+    def save(self, filename=DEFAULT_STATS_FILE):
+        data = {
+            'version': STATS_VERSION,
+            'config': config,
+            'files': OrderedDict((name, [signature, counts.to_dict()])
+                                 for name, (signature, counts) in self.files.items()),
+        }
+
+        with open(filename, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename=DEFAULT_STATS_FILE):
+        """
+        Load counts saved with `save`
+
+        Counts that are missing, unreadable, or saved with other settings are started over.
+        """
+        stats = cls()
+
+        # The settings of the project have to be loaded before comparing them with the saved ones
+        get_matcher()
+
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return stats
+
+        if data.get('version') != STATS_VERSION or data.get('config') != config:
+            logger.info('Ignoring stats %s, they were saved with other settings', filename)
+            return stats
+
+        for name, (signature, counts) in data['files'].items():
+            stats.files[name] = (signature, RequirementCounts(**counts))
+            stats._apply(name, stats.files[name][1], 1)
+
+        return stats
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,31 +1,55 @@
+import io
 import json
 import logging
 import sys
+import tokenize
 from datetime import datetime
 
+from easy_python_requirements import config
+from easy_python_requirements.markers import get_matcher
+
 logging.basicConfig(stream=sys.stdout)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-config = {
-    'requirement_begin': 'TEST DESCRIPTION BEGIN',
-    'requirement_end': 'TEST DESCRIPTION END',
-    'requirement_info': 'TEST INFO:',
-    'info_format': ['test_id', 'time_stamp'],
-}
-
 highest_id = 0
 
 
-def create_json_info():
+def description_hash(description: str):
+    """
+    Get the hash of a requirement description, as recorded in `desc_hash`
+    """
+    # Imported here, only projects that record description hashes need it
+    import hashlib
+
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:12]
+
+
+def create_json_info(description=None, test_id=None):
+    """
+    Create the json info of a requirement
+
+    Args:
+        description (str): The description of the requirement,
+            its hash is recorded when `desc_hash` is enabled in the config
+        test_id (int): The id to use, a new one is created if it is None
+
+    Returns:
+        str: The json info
+    """
     global highest_id
 
-    highest_id += 1
-    test_id = highest_id
+    if test_id is None:
+        highest_id += 1
+        test_id = highest_id
 
     time_stamp = str(datetime.today().isoformat())
 
-    return json.dumps({'test_id': test_id, 'time_stamp': time_stamp})
+    info = {'test_id': test_id, 'time_stamp': time_stamp}
+    if config['desc_hash'] and description is not None:
+        info['desc_hash'] = description_hash(description)
+
+    return json.dumps(info)
 
 
 def read_json_info(test_info_line: str):
@@ -42,6 +66,85 @@ def read_json_info(test_info_line: str):
     return json.loads(':'.join(test_info_line.split(':')[1:]))
 
 
+def source_encoding(contents: bytes):
+    """
+    Get the encoding of python source, from its BOM or encoding declaration
+
+    A BOM is kept as part of the first line, so the result never adds one when encoding.
+    """
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(contents).readline)
+
+    if encoding == 'utf-8-sig':
+        return 'utf-8'
+
+    return encoding
+
+
+def line_spans(contents: bytes, indices):
+    """
+    Find where lines start and end in a buffer, without splitting it
+
+    Args:
+        contents (bytes): The buffer
+        indices (iterable): The line numbers to find
+
+    Returns:
+        dict: line number -> (start, end) byte offsets, where end excludes the line ending
+    """
+    spans = {}
+    wanted = sorted(set(indices))
+
+    line = 0
+    start = 0
+    for index in wanted:
+        while line < index:
+            start = contents.index(b'\n', start) + 1
+            line += 1
+
+        end = contents.find(b'\n', start)
+        if end == -1:
+            end = len(contents)
+        if end > start and contents[end - 1:end] == b'\r':
+            end -= 1
+
+        spans[index] = (start, end)
+
+    return spans
+
+
+def splice_lines(filename, edits):
+    """
+    Replace parts of lines of a file, working on its bytes
+
+    Only the edited bytes change. The encoding, line endings and every other line are kept as they are.
+
+    Args:
+        filename (str): The file to edit
+        edits (dict): line number -> function that takes the decoded line and returns the new line
+
+    Returns:
+        None
+    """
+    with open(filename, 'rb') as f:
+        contents = f.read()
+
+    encoding = source_encoding(contents)
+    chunks = []
+    previous = 0
+
+    for index, (start, end) in sorted(line_spans(contents, edits.keys()).items()):
+        line = contents[start:end].decode(encoding)
+
+        chunks.append(contents[previous:start])
+        chunks.append(edits[index](line).encode(encoding))
+        previous = end
+
+    chunks.append(contents[previous:])
+
+    with open(filename, 'wb') as f:
+        f.write(b''.join(chunks))
+
+
 def append_json_info(filename, index, value):
     """
     Append the json info to the correct line in the file.
@@ -55,18 +158,35 @@ def append_json_info(filename, index, value):
     Returns:
         None
     """
-    with open(filename, "r") as f:
-        contents = f.readlines()
-
     logger.debug('Appending {0} to line {1} of {2}'.format(
         value,
         index,
         filename
     ))
-    contents[index] = contents[index].replace('\n', '') + ' ' + value + '\n'
+    splice_lines(filename, {index: lambda line: line + ' ' + value})
+
+
+def write_json_infos(filename, infos):
+    """
+    Write the json info of several TEST INFO lines of a file, reading and writing the file once.
+
+    Args:
+        filename (str): The file to update
+        infos (dict): The line number -> the json info for that line.
+            Anything after the TEST INFO marker on the line is replaced.
+
+    Returns:
+        None
+    """
+    matcher = get_matcher()
+
+    def replace_info(value):
+        return lambda line: matcher.split_info(line)[0] + ' ' + value
+
+    for index, value in infos.items():
+        logger.debug('Writing {0} to line {1} of {2}'.format(value, index, filename))
 
-    with open(filename, "w") as f:
-        f.writelines(contents)
+    splice_lines(filename, {index: replace_info(value) for index, value in infos.items()})
 
 
 def info_line_status(doclist, info_index):
@@ -82,15 +202,16 @@ def info_line_status(doclist, info_index):
     """
     global highest_id
     info_dict = {}
+    _, info_text = get_matcher().split_info(doclist[info_index])
 
     # If the test info line contains just a place holder
-    if doclist[info_index] == config['requirement_info']:
+    if not info_text.strip():
         info_dict['requires_update'] = True
     else:
         # Proper info is automatically recorded in JSON,
         #   so if it doesn't properly load into JSON then it's wrong
         try:
-            info_json = json.loads(doclist[info_index].split(config['requirement_info'])[1])
+            info_json = json.loads(info_text)
 
             if all(x in info_json.keys() for x in config['info_format']):
                 info_dict['requires_update'] = False
@@ -3,16 +3,21 @@ import logging
 import sys
 import os
 import importlib
-import pkgutil
+import time
+import tokenize
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from easy_python_requirements import config
-from easy_python_requirements.parsed import Parsed
+from easy_python_requirements.exceptions import ImportWorkerError
+from easy_python_requirements.markers import get_matcher
+from easy_python_requirements.parsed import Parsed, parse_doc
+from easy_python_requirements.records import record_file, FileRecord
+from easy_python_requirements.source import iter_docstrings, read_source
 from easy_python_requirements.test_info import (
-    create_json_info, append_json_info
+    create_json_info, append_json_info, write_json_infos
 )
 from easy_python_requirements.util import (
-    get_source_lines, get_classes, get_functions, get_depth_of_file
+    get_source_lines, get_classes, get_functions, get_depth_of_file, get_module_name, get_rss
 )
 
 logging.basicConfig(stream=sys.stdout)
@@ -39,17 +44,18 @@ def update_func(function):
         return info_dict
 
     filename = inspect.getfile(function)
-    with open(filename, 'r+') as location:
+    matcher = get_matcher()
+    with tokenize.open(filename) as location:
         for index, line in enumerate(location.readlines()):
             # We have not reached the function yet
             if index < function.__code__.co_firstlineno:
                 continue
 
-            if 'TEST INFO' in line:
+            if matcher.is_info(line):
                 test_info_index = index
                 break
 
-    new_json = create_json_info()
+    new_json = create_json_info(parsed.description)
     append_json_info(filename, test_info_index, new_json)
 
     return new_json
@@ -70,42 +76,133 @@ def update_class(cls):
 
     filename = inspect.getfile(cls)
 
-    with open(filename, 'r+') as location:
+    with tokenize.open(filename) as location:
         lines = location.readlines()
 
     first_line, last_line = get_source_lines(lines, cls)
 
-    with open(filename, 'r+') as location:
+    matcher = get_matcher()
+    with tokenize.open(filename) as location:
         for index, line in enumerate(location.readlines()[first_line:last_line]):
-            if config['requirement_info'] in line:
+            if matcher.is_info(line):
                 test_info_index = index + first_line
                 break
 
-    append_json_info(filename, test_info_index, create_json_info())
+    append_json_info(filename, test_info_index, create_json_info(parsed.description))
 
 
-def update_file(filename):
+def parse_file(filename):
+    """
+    Parse the docstrings of a file, without importing it
+
+    Reading a valid TEST INFO line raises the highest id, so the ids of the file are reserved as well.
+
+    Args:
+        filename (str): The file to parse
+
+    Returns:
+        list: (SourceDocstring, parsed docstring dict) of each docstring, empty when the file has no requirements
+    """
+    source = read_source(filename)
+    if not get_matcher().search(source):
+        return []
+
+    return [(docstring, parse_doc(docstring.docstring)) for docstring in iter_docstrings(source, filename)]
+
+
+def file_updates(filename, bump_modified=False, parsed=None):
+    """
+    Find the TEST INFO lines of a file that have to be written, without importing it
+
+    Args:
+        filename (str): The file to check
+        bump_modified (bool): Also give requirements whose description changed since
+            they were tagged a new time stamp and description hash, keeping their test id
+        parsed (list): The docstrings of the file from `parse_file`, None to parse it here
+
+    Returns:
+        dict: line number -> the new json info for that line
+    """
+    # Parse every docstring first, so new ids come after the ones already in the file
+    if parsed is None:
+        parsed = parse_file(filename)
+
+    infos = {}
+    for docstring, obj_dict in parsed:
+        if obj_dict['description'] is None:
+            continue
+
+        if obj_dict['requires_update']:
+            test_id = None
+        elif bump_modified and obj_dict.get('modified', False):
+            test_id = obj_dict['test_info']['test_id']
+        else:
+            continue
+
+        info_lines = docstring.info_lines()
+        if not info_lines:
+            logger.warning('%s:%s has no TEST INFO line to update', filename, docstring.qualname)
+            continue
+
+        infos[info_lines[0][0]] = create_json_info(obj_dict['description'], test_id)
+
+    return infos
+
+
+def update_file(filename, bump_modified=False, parsed=None):
     """
     Get, parse and update the file with the correct info
+
+    The file is rewritten once, no matter how many of its requirements are updated.
+
+    Args:
+        filename (str): The file to update
+        bump_modified (bool): Also give requirements whose description changed since
+            they were tagged a new time stamp and description hash
+        parsed (list): The docstrings of the file from `parse_file`, None to parse it here
+
+    Returns:
+        dict: line number -> the json info written to that line
     """
-    explored = ExploredFile(filename)
-    explored.explore()
+    infos = file_updates(filename, bump_modified, parsed)
+
+    if infos:
+        write_json_infos(filename, infos)
+
+    return infos
 
-    for c_name, c_value in explored.module.items():
-        update_class(c_name)
-        for _, f_value in c_value.items():
-            update_func(f_value)
 
-    for _, f_value in explored.function.items():
-        update_func(f_value)
+def update_files(filenames, bump_modified=False):
+    """
+    Update every requirement of several files, reading each of them once
 
+    Every file is parsed before any is written, which reserves the test ids
+    already used in all of them, so the new ids are unique across the files.
 
-def update_folder(path, recursive=True):
-    explored = explore_folder(path, recursive)
-    # pprint(explored)
+    Args:
+        filenames (list): The files to update
+        bump_modified (bool): Give requirements whose description changed a new time stamp
 
-    for name in explored.keys():
-        update_file(name)
+    Returns:
+        list: The names of the changed files
+    """
+    parsed = [(filename, parse_file(filename)) for filename in filenames]
+
+    return [filename for filename, docstrings in parsed if update_file(filename, bump_modified, docstrings)]
+
+
+def update_folder(path, recursive=True, bump_modified=False):
+    """
+    Update every requirement of a folder, or of several folders
+
+    The new ids are unique across all of the folders, see `update_files`.
+
+    Args:
+        path (str or list): The folder, or a list of folders
+        recursive (bool): Update the packages inside of the folders as well
+        bump_modified (bool): Give requirements whose description changed a new time stamp
+    """
+    update_files(find_files(path, recursive), bump_modified)
 
     return
 
@@ -115,7 +212,7 @@ class ExploredFile:
         if filename[0:2] == './' or filename[0:2] == '.\\':
             filename = filename[2:]
         self.filename = filename
-        self.mod_name = filename.replace('/', '.').replace('\\', '.')[:-3]
+        self.mod_name = get_module_name(filename)
 
         logger.debug('Importing filename %s from filename %s with cwd: %s', self.mod_name, self.filename, str(os.getcwd()))
         self.imported_module = importlib.import_module(self.mod_name)
@@ -152,32 +249,193 @@ class ExploredFile:
         return get_classes(self.imported_module)
 
 
-def explore_folder(foldername: str, recursive=True):
-    files_to_load = []
-    explored = OrderedDict()
+def find_files(foldername, recursive=True):
+    """
+    Find the python files of a folder, without importing them
+
+    Args:
+        foldername (str or list): The folder, or a list of folders, see `find_roots`
+        recursive (bool): Find the files of the packages inside of the folder as well
+
+    Returns:
+        list: The file names relative to the current directory, sorted by depth
+    """
+    # Imported here, pkgutil pulls in typing, which short runs like the pre-commit hook never need
+    import pkgutil
+
+    if not isinstance(foldername, str):
+        return list(find_roots(foldername, recursive))
 
-    logger.debug('Exploring folder %s from folder %s', foldername, str(os.getcwd()))
-    for load, name, is_pkg in pkgutil.walk_packages([foldername]):
+    files = []
+
+    logger.debug('Finding files in folder %s from folder %s', foldername, str(os.getcwd()))
+    # Unlike `walk_packages`, `iter_modules` does not import the packages it finds
+    for load, name, is_pkg in pkgutil.iter_modules([foldername]):
         if not recursive and is_pkg:
             continue
 
+        path = os.path.relpath(os.path.join(load.path, name))
         if is_pkg:
-            path = load.path + name + os.sep
             logger.debug(path)
-            temp_explored = explore_folder(path)
-            for key, value in temp_explored.items():
-                explored[key] = value
-                # explored.move_to_end(key)
+            files.extend(find_files(path))
         else:
-            files_to_load.append(load.path + name + '.py')
+            files.append(path + '.py')
+
+    # TODO: Get the order sorted by files, then directories
+    return sorted(files, key=get_depth_of_file)
+
+
+def find_roots(roots, recursive=True, max_workers=None):
+    """
+    Find the python files of several folders at once
+
+    The folders are searched in parallel. A file inside of more than one folder
+    belongs to the first of them, so it is only scanned once.
+
+    Args:
+        roots (list): The folders
+        recursive (bool): Find the files of the packages inside of the folders as well
+        max_workers (int): The number of folders to search at the same time
+
+    Returns:
+        OrderedDict: file name -> the folder it was found in, in the order of the folders
+    """
+    files = OrderedDict()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        found = executor.map(lambda root: find_files(root, recursive), roots)
+
+        for root, names in zip(roots, found):
+            for name in names:
+                files.setdefault(name, root)
+
+    return files
+
+
+def explore_folder(foldername, recursive=True):
+    """
+    Import and explore the files of a folder, or of several folders
+
+    The modules stay imported, so helpers shared by several folders are only imported once.
+    Use `record_folder` when only the requirements are needed, it keeps memory bounded.
+
+    Args:
+        foldername (str or list): The folder, or a list of folders
+        recursive (bool): Explore the packages inside of the folders as well
+
+    Returns:
+        OrderedDict: file name -> `ExploredFile`
+    """
+    return explore_files(find_files(foldername, recursive))
 
-    for current_file in files_to_load:
+
+def explore_files(filenames):
+    """
+    Import and explore a list of files
+
+    Returns:
+        OrderedDict: file name -> `ExploredFile`
+    """
+    explored = OrderedDict()
+
+    for current_file in filenames:
         logger.info('File: %s', str(current_file))
         temp = ExploredFile(current_file)
         temp.explore()
         explored[current_file] = temp
 
-    # TODO: Get the order sorted by files, then directories
-    explored = OrderedDict(sorted(explored.items(), key=lambda x: get_depth_of_file(x[0])))
-
     return explored
+
+
+class FileRecorder:
+    """
+    Record files one at a time, without keeping the imported objects around
+
+    Files are recorded in this process until the memory budget is exceeded, and in
+    an `ImportWorker` from then on. With a timeout every file is recorded in the worker.
+
+    Args:
+        folders (list): The folders the files belong to. Their modules are evicted after each file
+        evict_modules (bool): Remove the modules of the folders imported for each file from `sys.modules`
+            once the file is recorded. Modules from outside of the folders stay imported
+        max_rss (int): Resident memory budget in bytes. Once it is exceeded,
+            the remaining files are recorded in fresh subprocesses that are
+            recycled whenever they exceed the same budget.
+        timeout (float): Seconds a single file may take to import and record.
+            When set, every file is recorded in a subprocess, and files that time out
+            or fail to import are recorded as skipped instead of stopping the scan.
+    """
+
+    def __init__(self, folders, evict_modules=True, max_rss=None, timeout=None):
+        self.folders = list(folders)
+        self.evict_modules = evict_modules
+        self.max_rss = max_rss
+        self.timeout = timeout
+        self.worker = None
+
+        if timeout is not None:
+            self.worker = self._start_worker()
+
+    def _start_worker(self):
+        # Imported here, multiprocessing is slow to import and short runs like the pre-commit hook never need it
+        from easy_python_requirements.worker import ImportWorker
+
+        return ImportWorker(self.max_rss)
+
+    def record(self, filename):
+        """
+        Record a single file
+
+        Returns:
+            FileRecord: The records of the file
+        """
+        if self.worker is None and self.max_rss is not None and get_rss() > self.max_rss:
+            logger.info('Memory budget of %d bytes exceeded, recording in a subprocess', self.max_rss)
+            self.worker = self._start_worker()
+
+        logger.info('File: %s', str(filename))
+        if self.worker is None:
+            return record_file(filename, self.evict_modules, self.folders)
+
+        start = time.perf_counter()
+        try:
+            return self.worker.record(filename, self.timeout, self.folders)
+        except ImportWorkerError as e:
+            if self.timeout is None:
+                raise
+
+            elapsed = time.perf_counter() - start
+            logger.warning('Skipping %s after %.2f seconds: %s', filename, elapsed, str(e))
+            return FileRecord(filename, elapsed=elapsed, skipped=True, reason=str(e))
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.close()
+            self.worker = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+def record_folder(foldername, recursive=True, evict_modules=True, max_rss=None, timeout=None):
+    """
+    Record the requirements of a folder, without keeping the imported objects around
+
+    Args:
+        foldername (str or list): The folder to record, or a list of folders
+        recursive (bool): Record the packages inside of the folder as well
+        evict_modules (bool): Remove the modules of the folders imported for each file, see `FileRecorder`
+        max_rss (int): Resident memory budget in bytes, see `FileRecorder`
+        timeout (float): Seconds a single file may take to import and record, see `FileRecorder`
+
+    Returns:
+        OrderedDict: file name -> FileRecord
+    """
+    roots = [foldername] if isinstance(foldername, str) else list(foldername)
+
+    with FileRecorder(roots, evict_modules, max_rss, timeout) as recorder:
+        return OrderedDict((current_file, recorder.record(current_file))
+                           for current_file in find_files(foldername, recursive))
@@ -2,11 +2,15 @@ import inspect
 import os
 import logging
 import sys
-from pathlib import PurePath
 from collections import OrderedDict
 
 from easy_python_requirements.exceptions import MultipleStringError
 
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
 logging.basicConfig(stream=sys.stdout)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -57,6 +61,8 @@ def get_relative_path(obj, current_path=''):
     if current_path == '':
         current_path = os.getcwd()
 
+    from pathlib import PurePath
+
     file_path = PurePath(inspect.getfile(obj))
     try:
         return str(file_path.relative_to(current_path))
@@ -77,45 +83,137 @@ def get_depth_of_file(file_name: str):
     return len(file_name.split('/'))
 
 
-def get_sorted_file_directory_structure(file_list, previous_info=None):
-    # TODO: This is the file to handle the nicer formatting structure
-    # sorted dict
-    sd = OrderedDict()
+def get_module_name(file_name: str):
+    """
+    Get the importable module name of a file relative to the current directory
+    """
+    if file_name[0:2] == './' or file_name[0:2] == '.\\':
+        file_name = file_name[2:]
+
+    return file_name.replace('/', '.').replace('\\', '.')[:-3]
+
+
+def get_rss():
+    """
+    Get the resident set size of the current process
+
+    Returns:
+        int: The resident memory in bytes, or 0 if it can not be determined
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError, AttributeError):
+        pass
+
+    if resource is None:
+        return 0
+
+    # Not the current size, but the peak is the best we can do without /proc
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss
+
+    return max_rss * 1024
+
+
+def file_signature(filename):
+    """
+    Get a signature that changes whenever the file changes
+
+    Returns:
+        list: [modification time in nanoseconds, size in bytes], None if the file does not exist
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def split_path(file_name: str):
+    """
+    Split a path into its parts, ignoring a leading './' and mixed slashes
+    """
+    file_name = file_name.replace('\\', '/')
+
+    if file_name[0:2] == './':
+        file_name = file_name[2:]
+
+    return [part for part in file_name.split('/') if part]
+
+
+class PathTrie:
+    """
+    A directory in a trie of file paths
+
+    Children keep the order they were inserted in, so walking the trie needs no sorting.
+
+    Attributes:
+        path (str): The path of the directory, '' for the root
+        directories (OrderedDict): name -> `PathTrie` of each sub directory
+        files (OrderedDict): file name -> the value inserted with the file
+    """
+
+    def __init__(self, path=''):
+        self.path = path
+        self.directories = OrderedDict()
+        self.files = OrderedDict()
+
+    def insert(self, file_name: str, value=None):
+        """
+        Insert a file, creating the directories on its path as needed
+        """
+        node = self
+        parts = split_path(file_name)
+
+        for part in parts[:-1]:
+            child = node.directories.get(part)
+            if child is None:
+                child = PathTrie(node.path + part + '/')
+                node.directories[part] = child
+            node = child
+
+        node.files[file_name] = value
+
+    def walk(self, number=()):
+        """
+        Walk the trie depth first, directories before files
+
+        Yields:
+            (str, tuple, str, object): The kind ('directory' or 'file'), the section number,
+                the path and the value of a file or the `PathTrie` of a directory
+        """
+        index = 0
+
+        for directory in self.directories.values():
+            index += 1
+            yield 'directory', number + (index,), directory.path.rstrip('/'), directory
+            yield from directory.walk(number + (index,))
+
+        for file_name, value in self.files.items():
+            index += 1
+            yield 'file', number + (index,), file_name, value
+
+
+def get_sorted_file_directory_structure(file_list, values=None):
+    """
+    Build the directory structure of a list of files
+
+    Args:
+        file_list (iterable): The file names, in the order they should be reported
+        values (dict): Optional file name -> value to keep with each file
+
+    Returns:
+        PathTrie: The root of the structure
+    """
+    trie = PathTrie()
 
     for name in file_list:
-        sd[name] = name
-
-    return sd
-    # sd['./'] = []
-    # # print('.' + get_separator(file_list[0]))
-
-    # for name in file_list:
-    #     depth = get_depth_of_file(name) - 1
-
-    #     beginning = name.split(get_separator(name))[0]
-    #     end = get_separator(name).join(name.split(get_separator(name))[1:])
-
-    #     print(beginning, end, depth)
-
-    #     if depth > 0:
-    #         if beginning not in sd.keys():
-    #             if previous_info:
-    #                 previous_info[0][previous_info[1]][beginning] = []
-    #                 print(dict(previous_info[0].items()), previous_info[1] + '/' + beginning)
-    #             else:
-    #                 sd[beginning] = []
-
-    #         # sd[beginning].append(get_sorted_file_directory_structure([end], (sd, beginning)))
-    #         get_sorted_file_directory_structure([end], (sd, beginning))
-    #     else:
-    #         # sd['./'].append(name)
-    #         if previous_info:
-    #             print(previous_info)
-    #             previous_info[0][previous_info[1]].append(name)
-    #         else:
-    #             sd['./'].append(name)
-
-    # return sd
+        trie.insert(name, values.get(name) if values is not None else None)
+
+    return trie
 
 
 def index_containing_substring(search_list, substring, multiples=True):
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import multiprocessing
+import sys
+import time
+
+from easy_python_requirements.exceptions import ImportWorkerError, ImportTimeoutError
+from easy_python_requirements.records import record_file
+from easy_python_requirements.util import get_rss
+
+logging.basicConfig(stream=sys.stdout)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def _worker_main(connection):
+    """
+    Record every (file name, folders) received on the connection until None is received
+    """
+    connection.send('ready')
+
+    while True:
+        received = connection.recv()
+        if received is None:
+            break
+
+        filename, folders = received
+        try:
+            result = ('ok', record_file(filename, evict_modules=True, folders=folders))
+        except Exception as e:
+            result = ('error', '{0}: {1}'.format(type(e).__name__, e))
+
+        connection.send(result + (get_rss(),))
+
+    connection.close()
+
+
+class ImportWorker:
+    """
+    Record files in a fresh subprocess, so their imports never reach this process.
+
+    The subprocess is started on first use and replaced with a new one as soon as
+    its resident memory exceeds `max_rss`.
+
+    Args:
+        max_rss (int): The resident memory budget of the subprocess in bytes,
+            None for no budget
+    """
+
+    def __init__(self, max_rss=None):
+        self.max_rss = max_rss
+        self.process = None
+        self.connection = None
+        self.context = multiprocessing.get_context('spawn')
+
+    def start(self):
+        self.connection, child_connection = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+        # Wait for the interpreter to start, so it does not count towards a timeout
+        self.connection.recv()
+
+    def record(self, filename, timeout=None, folders=None):
+        """
+        Record a file in the subprocess
+
+        Args:
+            filename (str): The file to record
+            timeout (float): Seconds to wait for the file before the subprocess
+                is killed, None to wait forever
+            folders (list): The folders whose modules are removed after the file, see `record_file`
+
+        Raises:
+            ImportTimeoutError: The file took longer than `timeout` to record
+            ImportWorkerError: The file could not be recorded
+
+        Returns:
+            FileRecord: The records of the file
+        """
+        if self.process is None:
+            self.start()
+
+        start = time.perf_counter()
+        self.connection.send((filename, folders))
+        if timeout is not None and not self.connection.poll(timeout):
+            self.kill()
+            raise ImportTimeoutError('Recording {0} took longer than {1} seconds'.format(filename, timeout))
+
+        try:
+            status, value, rss = self.connection.recv()
+        except EOFError:
+            self.close()
+            raise ImportWorkerError('Import worker died after {0:.2f} seconds while recording {1}'.format(
+                time.perf_counter() - start, filename))
+
+        if self.max_rss is not None and rss > self.max_rss:
+            logger.info('Import worker uses %d bytes, recycling it', rss)
+            self.close()
+
+        if status == 'error':
+            raise ImportWorkerError('Could not record {0}: {1}'.format(filename, value))
+
+        return value
+
+    def kill(self):
+        """
+        Stop the subprocess without waiting for its current file
+        """
+        if self.process is None:
+            return
+
+        self.process.kill()
+        self.process.join()
+
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def close(self):
+        if self.process is None:
+            return
+
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
@@ -0,0 +1,12 @@
+import pytest
+
+from easy_python_requirements import test_info
+
+
+@pytest.fixture(scope='module', autouse=True)
+def reset_highest_id():
+    """
+    Every test module starts without any test ids seen, no matter which files earlier modules parsed
+    """
+    test_info.highest_id = 0
+    yield
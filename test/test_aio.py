@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from easy_python_requirements.aio import iter_file_records, iter_requirements, scan_folder
+from easy_python_requirements.cache import ParseCache
+
+
+def test_scan_folder_matches_cache():
+    cache = ParseCache()
+    cache.refresh_folder('mock_functions')
+
+    recorded = asyncio.run(scan_folder('mock_functions', concurrency=2))
+
+    assert list(recorded) == list(cache.files)
+    assert [r for file_record in recorded.values() for r in file_record.requirements] == \
+        list(cache.iter_requirements())
+
+
+def test_iter_requirements():
+    async def collect():
+        return [requirement async for requirement in iter_requirements('mock_functions')]
+
+    requirements = asyncio.run(collect())
+
+    assert any(requirement.test_id == 4 for requirement in requirements)
+
+
+def test_stop_early():
+    async def first():
+        records = iter_file_records('mock_functions', concurrency=1)
+        async for file_record in records:
+            await records.aclose()
+            return file_record
+
+    assert asyncio.run(first()).filename.startswith('mock_functions')
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import tarfile
+import zipfile
+
+from easy_python_requirements.archive import is_archive, record_archive
+from easy_python_requirements.cache import ParseCache
+from easy_python_requirements.source import read_source, record_source
+
+FILES = ['mock_functions/test_module_stuff.py', 'mock_functions/test_example_1.py']
+
+
+def test_is_archive():
+    assert is_archive('dist/package-1.0-py3-none-any.whl')
+    assert is_archive('release.TAR.GZ')
+    assert not is_archive('mock_functions')
+    assert not is_archive(['release.zip'])
+
+
+def expected(archive):
+    return [requirement.to_dict()['description']
+            for filename in FILES
+            for requirement in record_source(read_source(filename), archive + '/' + filename)]
+
+
+def test_zip(tmp_path):
+    archive = str(tmp_path / 'release.whl')
+    with zipfile.ZipFile(archive, 'w') as opened:
+        for filename in FILES:
+            opened.write(filename)
+        opened.writestr('data/not_python.txt', 'TEST INFO:')
+
+    recorded = record_archive(archive)
+
+    assert list(recorded) == [archive + '/' + filename for filename in FILES]
+    assert [r.description for requirements, _ in recorded.values() for r in requirements] == expected(archive)
+
+
+def test_tar_with_broken_member(tmp_path):
+    archive = str(tmp_path / 'release.tar.gz')
+    with tarfile.open(archive, 'w:gz') as opened:
+        for filename in FILES:
+            opened.add(filename)
+
+        broken = b'def broken(:\n    """TEST INFO:"""\n'
+        info = tarfile.TarInfo('mock_functions/test_broken.py')
+        info.size = len(broken)
+        opened.addfile(info, io.BytesIO(broken))
+
+    recorded = record_archive(archive)
+
+    assert recorded[archive + '/mock_functions/test_broken.py'][1] is not None
+    assert [r.description for requirements, _ in recorded.values() for r in requirements] == expected(archive)
+
+
+def test_cache_reads_archive_once(tmp_path):
+    archive = str(tmp_path / 'release.zip')
+    with zipfile.ZipFile(archive, 'w') as opened:
+        for filename in FILES:
+            opened.write(filename)
+
+    cache = ParseCache()
+
+    changed, removed = cache.refresh_folder(archive)
+    assert (len(changed), removed) == (2, [])
+    assert cache.refresh_folder(archive) == ([], [])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import py_compile
+
+from easy_python_requirements.bytecode import record_bytecode, record_compiled
+from easy_python_requirements.source import read_source, record_source
+
+SOURCE = '''
+import functools
+
+
+class TestClass:
+    """
+    TEST INFO: {"test_id": 1, "time_stamp": "2016-07-01T10:45:56.539011"}
+    TEST DESCRIPTION BEGIN
+    A class
+    TEST DESCRIPTION END
+    """
+
+    @functools.lru_cache()
+    def test_method(self):
+        """
+        TEST INFO:
+        TEST DESCRIPTION BEGIN
+        A method
+        TEST DESCRIPTION END
+        """
+        return 'not a docstring'
+
+    def test_without_docstring(self):
+        return 'TEST DESCRIPTION BEGIN'
+
+
+def test_function():
+    """
+    TEST DESCRIPTION BEGIN
+    A function
+    TEST DESCRIPTION END
+    """
+'''
+
+
+def write_source(tmp_path, source):
+    filename = str(tmp_path / 'test_compiled.py')
+    with open(filename, 'w') as f:
+        f.write(source)
+
+    return filename
+
+
+def test_matches_source(tmp_path):
+    filename = write_source(tmp_path, SOURCE)
+    py_compile.compile(filename)
+
+    requirements = record_bytecode(filename)
+
+    assert requirements is not None
+    assert requirements == record_source(read_source(filename), filename)
+    assert [r.line_number for r in requirements] == [5, 13, 27]
+
+
+def test_hash_based(tmp_path):
+    filename = write_source(tmp_path, SOURCE)
+    py_compile.compile(filename, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+
+    assert record_bytecode(filename) == record_source(read_source(filename), filename)
+
+
+def test_missing_or_stale(tmp_path):
+    filename = write_source(tmp_path, SOURCE)
+    assert record_bytecode(filename) is None
+
+    py_compile.compile(filename)
+    write_source(tmp_path, SOURCE.replace('A function', 'A changed function'))
+
+    assert record_bytecode(filename) is None
+    assert record_compiled(filename)[-1].description == 'A changed function'
+
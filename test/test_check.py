@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from easy_python_requirements.check import check_file, check_folder
+from easy_python_requirements.easy_python_requirements import main
+
+
+def test_check_file():
+    violations = check_file('mock_functions/test_module_stuff.py')
+
+    assert [(v.line, v.qualname) for v in violations] == [
+        (28, 'SecondClass'),
+        (36, 'SecondClass.this_doc_string_should_change'),
+    ]
+    assert violations[0].reason == 'TEST INFO is missing or not valid'
+
+
+def test_check_file_fail_fast():
+    assert len(check_file('mock_functions/test_module_stuff.py', fail_fast=True)) == 1
+
+
+def test_check_folder_writes_nothing():
+    files = ['mock_functions/test_module_stuff.py', 'mock_functions/test_example_3.py']
+    before = [os.stat(f).st_mtime_ns for f in files]
+
+    violations = check_folder('./mock_functions/')
+
+    assert len(violations) == 9
+    assert [os.stat(f).st_mtime_ns for f in files] == before
+
+
+def test_check_folder_fail_fast():
+    assert len(check_folder('./mock_functions/', fail_fast=True)) == 1
+
+
+def test_check_clean_file(tmp_path):
+    filename = tmp_path / 'test_clean.py'
+    filename.write_text('def test_clean():\n'
+                        '    """\n'
+                        '    TEST INFO: {"test_id": 1, "time_stamp": "2016-07-02T10:45:57.539011"}\n'
+                        '    TEST DESCRIPTION BEGIN\n'
+                        '    Clean\n'
+                        '    TEST DESCRIPTION END\n'
+                        '    """\n')
+
+    assert check_file(str(filename)) == []
+    assert main([str(tmp_path), 'c']) == 0
+
+
+def test_main_check(capsys):
+    assert main(['./mock_functions/', 'c', '--fail-fast']) == 1
+
+    output = json.loads(capsys.readouterr().out)
+    assert len(output) == 1
+    assert set(output[0].keys()) == {'filename', 'line', 'qualname', 'reason'}
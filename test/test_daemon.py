@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+import pytest
+
+from easy_python_requirements import client
+from easy_python_requirements.cache import ParseCache
+from easy_python_requirements.daemon import RequirementDaemon, create_server
+
+TEMPLATE = '''
+def test_{0}():
+    """
+    TEST INFO:
+    TEST DESCRIPTION BEGIN
+    {1}
+    TEST DESCRIPTION END
+    """
+'''
+
+
+class TestParseCache:
+    def test_only_changed_files_are_parsed(self, tmp_path):
+        first = tmp_path / 'test_first.py'
+        second = tmp_path / 'test_second.py'
+        first.write_text(TEMPLATE.format('first', 'First'))
+        second.write_text(TEMPLATE.format('second', 'Second'))
+
+        cache = ParseCache()
+        assert cache.refresh([str(first), str(second)]) == ([str(first), str(second)], [])
+        assert cache.refresh([str(first), str(second)]) == ([], [])
+
+        second.write_text(TEMPLATE.format('second', 'Second, but longer'))
+        assert cache.refresh([str(first)]) == ([], [str(second)])
+        assert cache.refresh([str(first), str(second)]) == ([str(second)], [])
+        assert [r.description for r in cache.iter_requirements()] == ['First', 'Second, but longer']
+
+    def test_syntax_error(self, tmp_path):
+        broken = tmp_path / 'test_broken.py'
+        broken.write_text('def test_broken(:\n    """TEST DESCRIPTION BEGIN"""\n')
+
+        cache = ParseCache()
+        cache.refresh([str(broken)])
+
+        assert cache.files[str(broken)].error is not None
+
+
+@pytest.fixture
+def daemon():
+    daemon = RequirementDaemon('./mock_functions/')
+    daemon.refresh()
+    return daemon
+
+
+def test_daemon_queries(daemon):
+    status, _, body = daemon.query('/requirements', {'test_id': ['4']})
+    assert status == 200
+    assert [r['qualname'] for r in json.loads(body)] == ['FirstClass']
+
+    _, _, body = daemon.query('/requirements', {'file': ['mock_functions/test_example_1.py']})
+    assert [r['qualname'] for r in json.loads(body)] == ['test_feature_example_1']
+
+    _, _, body = daemon.query('/report', {'requires_update': ['false']})
+    assert '- Test ID 4: 2016-07-02T10:45:57.539011' in body
+    assert 'test_example_1' not in body
+
+    status, _, _ = daemon.query('/unknown', {})
+    assert status == 404
+
+
+@pytest.mark.parametrize('use_socket', [False, True])
+def test_client_round_trip(daemon, tmp_path, capsys, use_socket):
+    if use_socket:
+        socket_path = str(tmp_path / 'daemon.sock')
+        server = create_server(daemon, socket_path=socket_path)
+        options = ['--socket', socket_path]
+    else:
+        server = create_server(daemon, port=0)
+        options = ['--port', str(server.server_address[1])]
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        assert client.main(['status'] + options) == 0
+        assert json.loads(capsys.readouterr().out)['requirements'] == 12
+
+        assert client.main(['requirements', 'test_id=5'] + options) == 0
+        assert json.loads(capsys.readouterr().out)[0]['qualname'] == 'FirstClass.function_that_should_not_change'
+    finally:
+        server.shutdown()
+        server.server_close()
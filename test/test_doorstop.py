@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import yaml
+
+from easy_python_requirements.doorstop import export_doorstop, item_uid
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.report import Report
+
+
+def make_requirement(test_id, description='Some description'):
+    return RequirementRecord('test_func', 'TestClass.test_func', 'function', 'test/test_file.py', 10,
+                             description, requires_update=test_id < 0, test_id=test_id,
+                             time_stamp='2016-07-02T10:45:57.539011')
+
+
+def test_item_uid():
+    assert item_uid(4) == 'REQ004'
+    assert item_uid(1234, 'SYS', 3, '-') == 'SYS-1234'
+
+
+def test_export_writes_items(tmp_path):
+    result = export_doorstop([make_requirement(1), make_requirement(2), make_requirement(-1)], str(tmp_path))
+
+    assert result == {'written': 2, 'unchanged': 0, 'removed': 0}
+    assert sorted(os.listdir(str(tmp_path))) == ['.doorstop.yml', 'REQ001.yml', 'REQ002.yml']
+
+    with open(str(tmp_path / 'REQ001.yml')) as f:
+        item = yaml.safe_load(f)
+
+    assert item['text'] == 'Some description\n'
+    assert item['header'] == 'TestClass.test_func'
+    assert item['references'] == [{'path': 'test/test_file.py', 'type': 'file'}]
+
+
+def test_export_only_rewrites_changes(tmp_path):
+    export_doorstop([make_requirement(1), make_requirement(2)], str(tmp_path))
+    result = export_doorstop([make_requirement(1), make_requirement(2, 'Changed')], str(tmp_path))
+
+    assert result == {'written': 1, 'unchanged': 1, 'removed': 0}
+
+
+def test_export_prune(tmp_path):
+    export_doorstop([make_requirement(1), make_requirement(2)], str(tmp_path))
+    result = export_doorstop([make_requirement(1)], str(tmp_path), prune=True)
+
+    assert result['removed'] == 1
+    assert not (tmp_path / 'REQ002.yml').exists()
+
+
+def test_export_prune_keeps_other_files(tmp_path):
+    (tmp_path / 'REQUIREMENTS.yml').write_text('kept: true\n')
+    (tmp_path / 'REQ01.yml').write_text('kept: true\n')
+
+    result = export_doorstop([make_requirement(1)], str(tmp_path), prune=True)
+
+    assert result['removed'] == 0
+    assert (tmp_path / 'REQUIREMENTS.yml').exists()
+    assert (tmp_path / 'REQ01.yml').exists()
+
+
+def test_export_skips_duplicate_ids(tmp_path):
+    result = export_doorstop([make_requirement(1), make_requirement(1, 'A later duplicate')], str(tmp_path))
+
+    assert result['written'] == 1
+    with open(str(tmp_path / 'REQ001.yml')) as f:
+        assert yaml.safe_load(f)['text'] == 'Some description\n'
+
+
+def test_report_to_doorstop(tmp_path):
+    report = Report('./mock_functions/')
+    report.to_doorstop(str(tmp_path))
+
+    with open(str(tmp_path / 'REQ004.yml')) as f:
+        item = yaml.safe_load(f)
+
+    assert item['header'] == 'FirstClass'
+    assert item['references'] == [{'path': 'mock_functions/test_module_stuff.py', 'type': 'file'}]
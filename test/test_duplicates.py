@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+from easy_python_requirements.duplicates import index_ids, parse_info_line, repair_duplicates
+from easy_python_requirements.easy_python_requirements import main
+from easy_python_requirements.test_info import read_json_info
+
+TEMPLATE = '''
+class Test{0}:
+    def test_{0}(self):
+        """
+        TEST INFO: {1}
+        TEST DESCRIPTION BEGIN
+        Requirement {0}
+        TEST DESCRIPTION END
+        """
+        pass
+'''
+
+
+def write_test(path, name, info):
+    path.write_text(TEMPLATE.format(name, info))
+
+
+def make_tree(tmp_path):
+    write_test(tmp_path / 'test_a.py', 'a', '{"test_id": 1, "time_stamp": "2016-01-01T00:00:00"}')
+    write_test(tmp_path / 'test_b.py', 'b', '{"test_id": 1, "time_stamp": "2017-01-01T00:00:00"}')
+    write_test(tmp_path / 'test_c.py', 'c', '{"test_id": 2, "time_stamp": "2016-01-01T00:00:00"}')
+    write_test(tmp_path / 'test_d.py', 'd', '{"test_id": "oops"')
+    write_test(tmp_path / 'test_e.py', 'e', '')
+
+
+class TestParseInfoLine:
+    def test_placeholder(self):
+        assert parse_info_line('TEST INFO:') == (None, None)
+
+    def test_valid(self):
+        info, error = parse_info_line('TEST INFO: {"test_id": 6, "time_stamp": "2016-06-30T13:51:04.061138"}')
+        assert info['test_id'] == 6
+        assert error is None
+
+    def test_missing_key(self):
+        info, error = parse_info_line('TEST INFO: {"bad_id": 6}')
+        assert info is None
+        assert 'test_id' in error
+
+
+def test_index_ids(tmp_path):
+    make_tree(tmp_path)
+
+    index = index_ids(str(tmp_path))
+
+    assert list(index.duplicates().keys()) == [1]
+    assert [location.qualname for location in index.duplicates()[1]] == ['Testa.test_a', 'Testb.test_b']
+    assert index.duplicates()[1][0].index == 4
+    assert [location.qualname for location in index.malformed] == ['Testd.test_d']
+    assert index.highest_id == 2
+
+
+def test_index_ids_syntax_error(tmp_path):
+    make_tree(tmp_path)
+    (tmp_path / 'test_f.py').write_text(TEMPLATE.format('f', '') + 'def broken(:\n')
+
+    index = index_ids(str(tmp_path))
+
+    assert [location.qualname for location in index.malformed] == ['Testd.test_d', None]
+    assert index.malformed[1].filename.endswith('test_f.py')
+    assert 'Syntax error' in index.malformed[1].error
+    assert index.highest_id == 2
+
+
+def test_index_mock_functions():
+    index = index_ids('./mock_functions/')
+
+    assert index.duplicates() == {}
+    assert index.malformed == []
+    assert sorted(index.locations.keys()) == [1, 4, 5]
+
+
+def test_repair_duplicates(tmp_path):
+    make_tree(tmp_path)
+
+    changes = repair_duplicates(index_ids(str(tmp_path)))
+
+    assert [(location.qualname, test_id) for location, test_id in changes] == [('Testb.test_b', 3)]
+    with open(str(tmp_path / 'test_b.py')) as f:
+        info_line = f.read().split('\n')[4]
+
+    assert info_line.startswith('        TEST INFO: ')
+    assert read_json_info(info_line) == {'test_id': 3, 'time_stamp': '2017-01-01T00:00:00'}
+    assert index_ids(str(tmp_path)).duplicates() == {}
+
+
+def test_main_ids(tmp_path, capsys):
+    make_tree(tmp_path)
+
+    assert main([str(tmp_path), 'i']) == 1
+
+    output = json.loads(capsys.readouterr().out)
+    assert list(output['duplicates'].keys()) == ['1']
+    assert len(output['malformed']) == 1
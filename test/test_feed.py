@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+from easy_python_requirements.easy_python_requirements import main
+from easy_python_requirements.feed import diff_states, requirement_state, update_feed
+from easy_python_requirements.records import RequirementRecord
+
+
+def make_state(filename, qualname, test_id=-1, description='A requirement'):
+    return requirement_state(RequirementRecord(qualname, qualname, 'function', filename, 1, description,
+                                               test_id < 0, test_id))
+
+
+def events(previous, current):
+    return [(event['event'], event['qualname']) for event in diff_states(previous, current)]
+
+
+def test_added_and_removed():
+    assert events([make_state('a.py', 'test_old', 1)], [make_state('a.py', 'test_new', 2)]) == [
+        ('added', 'test_new'),
+        ('removed', 'test_old'),
+    ]
+
+
+def test_moved():
+    previous = [make_state('a.py', 'test_moving', 1)]
+    current = [make_state('b.py', 'test_moving', 1, 'A new description')]
+
+    found = list(diff_states(previous, current))
+
+    assert [event['event'] for event in found] == ['moved', 'description_changed']
+    assert found[0]['previous'] == {'filename': 'a.py', 'qualname': 'test_moving'}
+
+
+def test_id_assigned():
+    assert events([make_state('a.py', 'test_new')], [make_state('a.py', 'test_new', 3)]) == [
+        ('id_assigned', 'test_new'),
+    ]
+
+
+def test_unchanged():
+    assert events([make_state('a.py', 'test_same', 1)], [make_state('a.py', 'test_same', 1)]) == []
+
+
+def test_update_feed(tmp_path):
+    state_file = str(tmp_path / 'state.json')
+    requirement = RequirementRecord('test_a', 'test_a', 'function', 'a.py', 1, 'A', False, 1, 'now')
+
+    stream = io.StringIO()
+    assert update_feed([requirement], stream, state_file) == 1
+    assert json.loads(stream.getvalue())['event'] == 'added'
+
+    assert update_feed([requirement], io.StringIO(), state_file) == 0
+
+
+def test_main_feed_keeps_warnings_out_of_stdout(tmp_path, capsys):
+    folder = tmp_path / 'tests'
+    folder.mkdir()
+    docstring = '    """\n    TEST DESCRIPTION BEGIN\n    A requirement\n    TEST DESCRIPTION END\n    """\n'
+    (folder / 'test_good.py').write_text('def test_good():\n' + docstring)
+    (folder / 'test_broken.py').write_text('def test_broken(:\n' + docstring)
+
+    assert main([str(folder), 'f', '--cache', str(tmp_path / 'cache.json'),
+                 '--state', str(tmp_path / 'state.json')]) == 0
+
+    captured = capsys.readouterr()
+    assert [json.loads(line)['event'] for line in captured.out.splitlines()] == ['added']
+    assert 'Could not record' in captured.err
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from easy_python_requirements.fragments import FragmentCache
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.report import requirements_to_markdown
+
+SIGNATURES = {'pkg/test_a.py': [1, 10], 'pkg/test_b.py': [2, 20]}
+
+
+def make_requirements(description='A'):
+    return [
+        RequirementRecord('test_a', 'test_a', 'function', 'pkg/test_a.py', 1, description, False, 1, 'now'),
+        RequirementRecord('test_b', 'test_b', 'function', 'pkg/test_b.py', 1, 'B', False, 2, 'now'),
+    ]
+
+
+def test_unchanged_files_are_reused():
+    fragments = FragmentCache()
+
+    report = requirements_to_markdown(make_requirements(), fragments, SIGNATURES)
+    assert report == requirements_to_markdown(make_requirements())
+    assert (fragments.hits, fragments.misses) == (0, 2)
+
+    signatures = dict(SIGNATURES, **{'pkg/test_a.py': [3, 11]})
+    changed = requirements_to_markdown(make_requirements('A changed'), fragments, signatures)
+    assert changed == requirements_to_markdown(make_requirements('A changed'))
+    assert (fragments.hits, fragments.misses) == (1, 3)
+
+
+def test_reused_with_new_section_numbers():
+    fragments = FragmentCache()
+    requirements_to_markdown(make_requirements()[1:], fragments, SIGNATURES)
+
+    report = requirements_to_markdown(make_requirements(), fragments, SIGNATURES)
+    assert report == requirements_to_markdown(make_requirements())
+    assert '## 1.2 File: pkg/test_b.py' in report
+    assert (fragments.hits, fragments.misses) == (1, 2)
+
+
+def test_files_without_signature_are_rendered():
+    fragments = FragmentCache()
+    requirements_to_markdown(make_requirements(), fragments)
+
+    assert (fragments.hits, fragments.misses) == (0, 0)
+
+
+def test_save_and_load(tmp_path):
+    filename = str(tmp_path / 'fragments.json')
+
+    fragments = FragmentCache()
+    requirements_to_markdown(make_requirements(), fragments, SIGNATURES)
+    fragments.save(filename)
+
+    loaded = FragmentCache.load(filename)
+    requirements_to_markdown(make_requirements(), loaded, SIGNATURES)
+    assert (loaded.hits, loaded.misses) == (2, 0)
+
+
+def test_least_recently_used_are_dropped():
+    fragments = FragmentCache(max_fragments=1)
+    requirements_to_markdown(make_requirements(), fragments, SIGNATURES)
+
+    assert len(fragments.fragments) == 1
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+from easy_python_requirements.junit import iter_testcases, join_junit
+from easy_python_requirements.records import record_file
+
+JUNIT_XML = '''<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest" tests="4">
+    <testcase classname="mock_functions.test_module_stuff.FirstClass"
+              name="function_that_should_not_change" time="0.5"/>
+    <testcase classname="mock_functions.test_module_stuff.ThirdClass"
+              name="this_should_be_ignored[param]" file="mock_functions/test_module_stuff.py" time="0.25">
+      <failure message="assert False">Traceback</failure>
+    </testcase>
+    <testcase classname="mock_functions.test_module_stuff.ThirdClass" name="this_should_be_ignored" time="0.25"/>
+    <testcase classname="test.test_other" name="test_without_requirement">
+      <skipped message="not today"/>
+    </testcase>
+  </testsuite>
+</testsuites>
+'''
+
+
+def test_iter_testcases():
+    results = list(iter_testcases(io.BytesIO(JUNIT_XML.encode('utf-8'))))
+
+    assert [r.status for r in results] == ['passed', 'failed', 'passed', 'skipped']
+    assert results[1].name == 'this_should_be_ignored'
+    assert results[1].message == 'assert False'
+    assert results[3].full_name == 'test.test_other.test_without_requirement'
+
+
+def test_join_junit():
+    requirements = record_file('mock_functions/test_module_stuff.py').requirements
+    traceability = join_junit(requirements, io.BytesIO(JUNIT_XML.encode('utf-8')))
+
+    statuses = {qualname: status for (_, qualname), status in traceability.statuses.items()}
+
+    assert statuses['FirstClass'].status == 'passed'
+    assert statuses['FirstClass.function_that_should_not_change'].status == 'passed'
+    assert statuses['ThirdClass.this_should_be_ignored'].status == 'failed'
+    assert statuses['ThirdClass.this_should_be_ignored'].tests == 2
+    assert statuses['SecondClass'].status == 'not run'
+    assert traceability.unmatched == 1
+
+    summary = json.loads(traceability.to_json())['summary']
+    assert summary == {'not run': 2, 'skipped': 0, 'passed': 2, 'failed': 1, 'error': 0}
+    assert '| 5 | mock_functions/test_module_stuff.py::FirstClass.function_that_should_not_change | passed | 1 |' \
+        in traceability.to_markdown()
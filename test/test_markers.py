@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from easy_python_requirements import config, markers
+from easy_python_requirements.cache import ParseCache
+from easy_python_requirements.markers import DEFAULT_CONFIG, MarkerMatcher, configure, load_config
+from easy_python_requirements.parsed import parse_doc
+
+
+@pytest.fixture
+def project(tmp_path):
+    yield tmp_path
+    configure('.')
+
+
+class TestMarkerMatcher:
+    def test_scan_dialects(self):
+        matcher = MarkerMatcher(['TEST DESCRIPTION BEGIN', 'REQ BEGIN'],
+                                ['TEST DESCRIPTION END', 'REQ END'],
+                                ['TEST INFO:', 'REQ INFO:'])
+        lines = ['REQ INFO:', 'REQ BEGIN', 'text', 'TEST DESCRIPTION END']
+
+        assert matcher.scan(lines) == {'begin': [1], 'end': [3], 'info': [0]}
+
+    def test_longest_marker_wins(self):
+        matcher = MarkerMatcher(['BEGIN'], ['END'], ['INFO:', 'TEST INFO:'])
+
+        assert matcher.split_info('    TEST INFO: {}') == ('    TEST INFO:', ' {}')
+
+    def test_split_info_without_info(self):
+        matcher = MarkerMatcher.from_config()
+
+        assert matcher.split_info('TEST DESCRIPTION BEGIN') is None
+
+
+class TestLoadConfig:
+    def test_nothing_configured(self, project):
+        assert load_config(str(project)) == {}
+
+    def test_setup_cfg(self, project):
+        (project / 'setup.cfg').write_text('[easy_python_requirements]\n'
+                                           'requirement_begin =\n'
+                                           '    TEST DESCRIPTION BEGIN\n'
+                                           '    REQ BEGIN\n')
+
+        assert load_config(str(project)) == {'requirement_begin': ['TEST DESCRIPTION BEGIN', 'REQ BEGIN']}
+
+    def test_pyproject_wins(self, project):
+        (project / 'setup.cfg').write_text('[easy_python_requirements]\nrequirement_end = SETUP END\n')
+        (project / 'pyproject.toml').write_text('[tool.easy_python_requirements]\n'
+                                                'requirement_end = ["REQ END", "TEST DESCRIPTION END"]\n')
+
+        assert load_config(str(project)) == {'requirement_end': ['REQ END', 'TEST DESCRIPTION END']}
+
+
+def test_parse_doc_with_configured_dialect(project):
+    (project / 'pyproject.toml').write_text('[tool.easy_python_requirements]\n'
+                                            'requirement_begin = ["TEST DESCRIPTION BEGIN", "REQ BEGIN"]\n'
+                                            'requirement_end = ["TEST DESCRIPTION END", "REQ END"]\n'
+                                            'requirement_info = ["TEST INFO:", "REQ INFO:"]\n')
+    configure(str(project))
+
+    docstring = """
+    REQ INFO: {"test_id": 6, "time_stamp": "2016-06-30T13:51:04.061138"}
+    REQ BEGIN
+    Another dialect
+    REQ END
+    """
+    requirement_info = parse_doc(docstring)
+
+    assert requirement_info['description'] == 'Another dialect'
+    assert requirement_info['requires_update'] is False
+    assert config['requirement_begin'] == ['TEST DESCRIPTION BEGIN', 'REQ BEGIN']
+
+
+def test_configure_keeps_caller_settings(project, monkeypatch):
+    monkeypatch.setitem(config, 'desc_hash', True)
+    (project / 'setup.cfg').write_text('[easy_python_requirements]\nrequirement_end = REQ END\ndesc_hash = false\n')
+
+    configure(str(project))
+    assert config['requirement_end'] == ['REQ END']
+    assert config['desc_hash'] is True
+
+    configure(str(project / 'elsewhere'))
+    assert config['requirement_end'] == DEFAULT_CONFIG['requirement_end']
+    assert config['desc_hash'] is True
+
+
+def test_cache_kept_with_project_settings(project, monkeypatch):
+    (project / 'setup.cfg').write_text('[easy_python_requirements]\nrequirement_info =\n    TEST INFO:\n    REQ INFO:\n')
+    (project / 'test_req.py').write_text('def test_req():\n'
+                                         '    """\n'
+                                         '    REQ INFO:\n'
+                                         '    TEST DESCRIPTION BEGIN\n'
+                                         '    A requirement\n'
+                                         '    TEST DESCRIPTION END\n'
+                                         '    """\n')
+    monkeypatch.chdir(project)
+
+    for expected in (['test_req.py'], []):
+        # Every run starts without any settings loaded, like a new process
+        monkeypatch.setattr(markers, '_matcher', None)
+        monkeypatch.setattr(markers, '_loaded', {})
+        for key, value in DEFAULT_CONFIG.items():
+            monkeypatch.setitem(config, key, value)
+        cache = ParseCache.load('cache.json')
+
+        assert cache.refresh(['test_req.py'])[0] == expected
+        cache.save('cache.json')
+
+
+def test_matcher_follows_config(monkeypatch):
+    monkeypatch.setitem(config, 'requirement_info', 'REQ INFO:')
+
+    docstring = """
+    REQ INFO: {"test_id": 6, "time_stamp": "2016-06-30T13:51:04.061138"}
+    TEST DESCRIPTION BEGIN
+    Another marker
+    TEST DESCRIPTION END
+    """
+
+    assert parse_doc(docstring)['requires_update'] is False
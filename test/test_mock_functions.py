@@ -7,6 +7,7 @@ import pathlib
 
 from easy_python_requirements.update import update_func, update_file, update_folder, update_class
 from easy_python_requirements.parsed import Parsed
+from easy_python_requirements.source import read_source
 from easy_python_requirements.test_info import read_json_info
 
 
@@ -185,3 +186,84 @@ def test_mock_class_update():
                     assert(json_info['test_id'] > 1)
 
                 index += 1
+
+
+def test_update_file_bumps_modified(tmp_path, monkeypatch):
+    from easy_python_requirements import config
+
+    monkeypatch.setitem(config, 'desc_hash', True)
+    filename = str(tmp_path / 'test_hashed.py')
+    with open(filename, 'w') as f:
+        f.write('def test_hashed():\n'
+                '    """\n'
+                '    TEST INFO:\n'
+                '    TEST DESCRIPTION BEGIN\n'
+                '    The first description\n'
+                '    TEST DESCRIPTION END\n'
+                '    """\n')
+
+    update_file(filename)
+    with open(filename) as f:
+        contents = f.read()
+    first_info = read_json_info(contents.split('\n')[2])
+    assert 'desc_hash' in first_info
+
+    with open(filename, 'w') as f:
+        f.write(contents.replace('The first description', 'The second description'))
+
+    assert update_file(filename) == {}
+    assert list(update_file(filename, bump_modified=True).keys()) == [2]
+
+    with open(filename) as f:
+        second_info = read_json_info(f.read().split('\n')[2])
+    assert second_info['test_id'] == first_info['test_id']
+    assert second_info['desc_hash'] != first_info['desc_hash']
+
+
+def test_update_folders_share_ids(tmp_path, monkeypatch):
+    from easy_python_requirements import update
+    from easy_python_requirements.update import find_roots
+
+    tagged = ('def test_tagged():\n'
+              '    """\n'
+              '    TEST INFO: {"test_id": 41, "time_stamp": "2016-07-01T10:45:56.539011"}\n'
+              '    TEST DESCRIPTION BEGIN\n'
+              '    Already tagged\n'
+              '    TEST DESCRIPTION END\n'
+              '    """\n')
+    untagged = tagged.replace('test_tagged', 'test_untagged').replace(
+        '{"test_id": 41, "time_stamp": "2016-07-01T10:45:56.539011"}', '')
+
+    roots = [str(tmp_path / 'first'), str(tmp_path / 'second')]
+    for root, source in zip(roots, [untagged, tagged]):
+        pathlib.Path(root).mkdir()
+        (pathlib.Path(root) / 'test_file.py').write_text(source)
+
+    files = find_roots(roots + [roots[0]])
+    assert list(files.values()) == roots
+
+    read = []
+    monkeypatch.setattr(update, 'read_source', lambda filename: read.append(filename) or read_source(filename))
+    update_folder(roots)
+    assert sorted(read) == sorted(files)
+
+    with open(list(files)[0]) as f:
+        assert read_json_info(f.read().split('\n')[2])['test_id'] == 42
+
+
+def test_update_file_with_escaped_docstring(tmp_path):
+    filename = str(tmp_path / 'test_escaped.py')
+    with open(filename, 'w') as f:
+        f.write('def test_escaped():\n'
+                '    """\n'
+                '    Lines are joined with \'\\n\'\n'
+                '    TEST INFO:\n'
+                '    TEST DESCRIPTION BEGIN\n'
+                '    An escaped requirement\n'
+                '    TEST DESCRIPTION END\n'
+                '    """\n')
+
+    assert list(update_file(filename).keys()) == [3]
+
+    with open(filename) as f:
+        assert 'test_id' in read_json_info(f.read().split('\n')[3])
@@ -5,6 +5,7 @@ import pytest
 
 from easy_python_requirements.parsed import parse_doc
 from easy_python_requirements.exceptions import MultipleStringError
+from easy_python_requirements.test_info import description_hash
 
 
 class TestParseDoc:
@@ -137,3 +138,26 @@ class TestParseDoc:
         """
         requirement_info = parse_doc(docstring)
         print(requirement_info)
+
+    def test_parse_doc_desc_hash(self):
+        docstring = """
+        TEST INFO: {"test_id": 6, "time_stamp": "2016-06-30T13:51:04.061138", "desc_hash": "%s"}
+        TEST DESCRIPTION BEGIN
+        This is good
+        TEST DESCRIPTION END
+        """
+        requirement_info = parse_doc(docstring % description_hash('This is good'))
+        assert requirement_info['modified'] is False
+
+        requirement_info = parse_doc(docstring % description_hash('This was good'))
+        assert requirement_info['modified'] is True
+        assert requirement_info['requires_update'] is False
+
+    def test_parse_doc_without_desc_hash(self):
+        docstring = """
+        TEST INFO: {"test_id": 6, "time_stamp": "2016-06-30T13:51:04.061138"}
+        TEST DESCRIPTION BEGIN
+        This is good
+        TEST DESCRIPTION END
+        """
+        assert 'modified' not in parse_doc(docstring)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+from easy_python_requirements import test_info
+from easy_python_requirements.precommit import list_python_files, main, requirement_files, reserve_tree_ids
+from easy_python_requirements.test_info import read_json_info
+
+TAGGED = '''def test_tagged():
+    """
+    TEST INFO: {"test_id": 7, "time_stamp": "2016-07-01T10:45:56.539011"}
+    TEST DESCRIPTION BEGIN
+    Tagged
+    TEST DESCRIPTION END
+    """
+'''
+
+UNTAGGED = '''def test_untagged():
+    """
+    TEST INFO:
+    TEST DESCRIPTION BEGIN
+    Untagged
+    TEST DESCRIPTION END
+    """
+'''
+
+
+def test_requirement_files(tmp_path):
+    with_marker, without_marker = str(tmp_path / 'test_a.py'), str(tmp_path / 'test_b.py')
+    with open(with_marker, 'w') as f:
+        f.write(UNTAGGED)
+    with open(without_marker, 'w') as f:
+        f.write('def test_b():\n    pass\n')
+
+    assert requirement_files([with_marker, without_marker, str(tmp_path / 'notes.txt')]) == [with_marker]
+
+
+def test_ids_stay_unique_in_the_tree(tmp_path, monkeypatch):
+    package = tmp_path / 'tests'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'test_tagged.py').write_text(TAGGED)
+    (package / 'test_untagged.py').write_text(UNTAGGED)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(test_info, 'highest_id', 0)
+
+    staged = os.path.join('tests', 'test_untagged.py')
+    assert main(['--root', 'tests', '--no-stage', staged]) == 0
+
+    with open(staged) as f:
+        assert read_json_info(f.read().split('\n')[2])['test_id'] == 8
+    assert os.path.exists('.easy_python_requirements_ids.json')
+
+
+def test_list_python_files(tmp_path, monkeypatch):
+    for name in ('test_top.py', 'notes.txt', 'plain/test_a.py', 'plain/deeper/test_b.py',
+                 '.hidden/test_c.py', 'plain/__pycache__/test_a.py'):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text('')
+
+    monkeypatch.chdir(tmp_path)
+
+    assert sorted(list_python_files('.')) == [os.path.join('plain', 'deeper', 'test_b.py'),
+                                              os.path.join('plain', 'test_a.py'),
+                                              'test_top.py']
+    assert sorted(list_python_files('plain')) == [os.path.join('plain', 'deeper', 'test_b.py'),
+                                                  os.path.join('plain', 'test_a.py')]
+
+
+def test_id_file_only_written_when_changed(tmp_path, monkeypatch):
+    (tmp_path / 'test_tagged.py').write_text(TAGGED)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(test_info, 'highest_id', 0)
+
+    assert reserve_tree_ids('.', 'ids.json') == 7
+    os.utime('ids.json', ns=(0, 0))
+
+    assert reserve_tree_ids('.', 'ids.json') == 7
+    assert os.stat('ids.json').st_mtime_ns == 0
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+from easy_python_requirements.records import (ModuleSnapshot,
+                                              RequirementRecord,
+                                              record_file,
+                                              )
+from easy_python_requirements.update import find_files, record_folder
+from easy_python_requirements.worker import ImportWorker
+
+
+class TestRequirementRecord:
+    def test_from_object(self):
+        from mock_functions.test_module_stuff import FirstClass
+
+        record = RequirementRecord.from_object(FirstClass)
+
+        assert record.qualname == 'FirstClass'
+        assert record.obj_type == 'class'
+        assert record.filename == 'mock_functions/test_module_stuff.py'
+        assert record.line_number == 5
+        assert record.test_id == 4
+        assert record.requires_update is False
+
+    def test_no_requirement(self):
+        from mock_functions.test_module_stuff import ThirdClass
+
+        assert RequirementRecord.from_object(ThirdClass) is None
+
+
+class TestModuleSnapshot:
+    def test_evicts_new_modules(self):
+        sys.modules.pop('mock_functions.subdir.nested_module', None)
+
+        with ModuleSnapshot():
+            import mock_functions.subdir.nested_module  # noqa
+
+        assert 'mock_functions.subdir.nested_module' not in sys.modules
+
+    def test_keeps_modules_outside_of_folders(self):
+        sys.modules.pop('mock_functions.subdir.nested_module', None)
+        sys.modules.pop('mock_functions.test_example_3', None)
+
+        with ModuleSnapshot(folders=['mock_functions/subdir']):
+            import mock_functions.subdir.nested_module  # noqa
+            import mock_functions.test_example_3  # noqa
+
+        assert 'mock_functions.subdir.nested_module' not in sys.modules
+        assert 'mock_functions.test_example_3' in sys.modules
+
+    def test_disabled(self):
+        with ModuleSnapshot(enabled=False):
+            import mock_functions.subdir.nested_module  # noqa
+
+        assert 'mock_functions.subdir.nested_module' in sys.modules
+
+
+def test_record_file():
+    recorded = record_file('mock_functions/test_module_stuff.py')
+
+    assert [r.qualname for r in recorded.requirements] == [
+        'FirstClass',
+        'FirstClass.function_that_should_not_change',
+        'SecondClass',
+        'SecondClass.this_doc_string_should_change',
+        'ThirdClass.this_should_be_ignored',
+    ]
+
+
+def test_record_folder_evicts_modules():
+    sys.modules.pop('mock_functions.test_example_2', None)
+
+    recorded = record_folder('./mock_functions/')
+
+    assert 'mock_functions/subdir/nested_module.py' in recorded.keys()
+    assert recorded['mock_functions/test_example_2.py'].requirements[0].qualname == 'ExampleClass.function_2'
+    assert 'mock_functions.test_example_2' not in sys.modules
+
+
+def test_record_folder_over_memory_budget():
+    in_process = record_folder('./mock_functions/')
+    in_worker = record_folder('./mock_functions/', max_rss=1)
+
+    assert list(in_worker.keys()) == list(in_process.keys())
+    for filename, file_record in in_process.items():
+        assert in_worker[filename].requirements == file_record.requirements
+
+
+def test_import_worker_recycles():
+    with ImportWorker(max_rss=1) as worker:
+        worker.record('mock_functions/test_example_1.py')
+        assert worker.process is None
+
+
+def test_record_folder_skips_slow_and_failing_files(tmp_path, monkeypatch):
+    package = tmp_path / 'timeout_package'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'test_good.py').write_text('def test_good():\n'
+                                          '    """\n'
+                                          '    TEST INFO:\n'
+                                          '    TEST DESCRIPTION BEGIN\n'
+                                          '    Good\n'
+                                          '    TEST DESCRIPTION END\n'
+                                          '    """\n')
+    (package / 'test_hangs.py').write_text('import time\ntime.sleep(60)\n')
+    (package / 'test_raises.py').write_text('raise RuntimeError("broken on import")\n')
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    recorded = record_folder('timeout_package', timeout=2)
+
+    assert recorded['timeout_package/test_good.py'].skipped is False
+    assert recorded['timeout_package/test_good.py'].requirements[0].description == 'Good'
+
+    assert recorded['timeout_package/test_hangs.py'].skipped is True
+    assert recorded['timeout_package/test_hangs.py'].elapsed >= 2
+
+    assert recorded['timeout_package/test_raises.py'].skipped is True
+    assert 'broken on import' in recorded['timeout_package/test_raises.py'].reason
+
+
+def test_find_files_does_not_import(tmp_path, monkeypatch):
+    package = tmp_path / 'unimported_package'
+    (package / 'subdir').mkdir(parents=True)
+    (package / '__init__.py').write_text('')
+    (package / 'subdir' / '__init__.py').write_text('')
+    (package / 'subdir' / 'test_nested.py').write_text('')
+    (package / 'test_top.py').write_text('')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    found = [os.path.relpath(filename, str(tmp_path)) for filename in find_files(str(tmp_path))]
+
+    assert found == [os.path.join('unimported_package', 'test_top.py'),
+                     os.path.join('unimported_package', 'subdir', 'test_nested.py')]
+    assert 'unimported_package' not in sys.modules
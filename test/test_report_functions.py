@@ -2,8 +2,10 @@
 # -*- coding: utf-8 -*-
 
 # import json
+import sys
 
-from easy_python_requirements.report import (ReportObject,
+from easy_python_requirements.report import (FileIterator,
+                                             ReportObject,
                                              ReportFile,
                                              Report
                                              )
@@ -18,6 +20,24 @@ class TestReportObject:
         print(report.to_markdown())
 
 
+def test_report_parses_files_on_access():
+    report = Report('./mock_functions/')
+
+    assert 'mock_functions/test_module_stuff.py' in report.files
+    assert all(file_report is None for file_report in report._report.values())
+
+    file_report = report['./mock_functions/test_module_stuff.py']
+
+    assert file_report is report['mock_functions/test_module_stuff.py']
+    assert sum(file_report is not None for file_report in report._report.values()) == 1
+
+
+def test_file_iterator():
+    report = Report('./mock_functions/')
+
+    assert [file_name for file_name, _ in FileIterator(report)] == report.files
+
+
 def test_basic_report_object():
     from mock_functions.test_module_stuff import FirstClass
 
@@ -44,7 +64,81 @@ def test_print_file():
     filename = 'mock_functions/test_module_stuff.py'
     rf = ReportFile(filename)
 
-    print(rf.objects)
+    print(rf.requirements)
+    assert [requirement.qualname for requirement in rf.iter_requirements()][:2] == [
+        'FirstClass', 'FirstClass.function_that_should_not_change']
+
+
+def test_report_evicts_modules():
+    sys.modules.pop('mock_functions.test_example_2', None)
+
+    with Report('./mock_functions/') as report:
+        requirements = list(report['mock_functions/test_example_2.py'].iter_requirements())
+
+    assert requirements[0].qualname == 'ExampleClass.function_2'
+    assert 'mock_functions.test_example_2' not in sys.modules
+
+
+def test_report_over_memory_budget():
+    with Report('./mock_functions/') as report:
+        in_process = report.to_markdown()
+
+    with Report('./mock_functions/', max_rss=1) as report:
+        assert report.to_markdown() == in_process
+        assert report.recorder.worker is not None
+
+
+def test_main_report_skips_hanging_files(tmp_path, monkeypatch):
+    from easy_python_requirements.easy_python_requirements import main
+
+    package = tmp_path / 'hanging_package'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'test_good.py').write_text('def test_good():\n'
+                                          '    """\n'
+                                          '    TEST INFO:\n'
+                                          '    TEST DESCRIPTION BEGIN\n'
+                                          '    Good\n'
+                                          '    TEST DESCRIPTION END\n'
+                                          '    """\n')
+    (package / 'test_hangs.py').write_text('import time\ntime.sleep(60)\n')
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert main(['hanging_package', 'r', '--timeout', '1', '-o', 'report.md']) == 0
+
+    with open('report.md') as f:
+        report = f.read()
+    assert 'File: hanging_package/test_good.py' in report
+    assert 'Good' in report
+
+
+def test_markdown_sections():
+    from easy_python_requirements.report import requirements_to_markdown
+    from easy_python_requirements.records import RequirementRecord
+
+    requirements = [
+        RequirementRecord('Klass', 'Klass', 'class', 'pkg/mod.py', 1, 'A class', False, 1, 'now'),
+        RequirementRecord('method', 'Klass.method', 'function', 'pkg/mod.py', 5, 'A method', False, 2, 'now'),
+        RequirementRecord('function', 'function', 'function', 'pkg/mod.py', 9, 'A function'),
+    ]
+
+    assert requirements_to_markdown(requirements) == (
+        '# 1 Directory: pkg\n\n'
+        '## 1.1 File: pkg/mod.py\n\n'
+        '### 1.1.1 Class: Klass\n\n'
+        '- Test ID 1: now\n'
+        '    - A class\n'
+        '- 1.1.1.1 method\n'
+        '    - Test ID 2: now\n'
+        '        - A method\n'
+        '\n'
+        '- 1.1.2 function\n'
+        '    - This requirement requires an update before being processed\n'
+        '        - A function\n'
+        '\n'
+    )
 
 
 class TestYaml:
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from easy_python_requirements.cache import ParseCache
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.search import SearchIndex, tokenize
+
+
+def make_requirement(qualname, description, filename='test/test_file.py'):
+    return RequirementRecord(qualname, qualname, 'function', filename, 1, description, False, len(description))
+
+
+def make_index():
+    index = SearchIndex()
+    index.update_file('test/test_file.py', [
+        make_requirement('test_timeout', 'The read timeout **shall** be configurable'),
+        make_requirement('test_retry', 'Requests shall be retried after a timeout'),
+        make_requirement('test_other', 'Nothing to see here'),
+    ])
+    return index
+
+
+def test_tokenize():
+    assert tokenize('The **shall** be, re-tried') == ['the', 'shall', 'be', 're', 'tried']
+
+
+class TestSearchIndex:
+    def test_term(self):
+        assert [hit.qualname for hit in make_index().search('timeout')] == ['test_timeout', 'test_retry']
+
+    def test_terms_must_all_match(self):
+        assert [hit.qualname for hit in make_index().search('timeout READ')] == ['test_timeout']
+
+    def test_phrase(self):
+        assert [hit.qualname for hit in make_index().search('"read timeout"')] == ['test_timeout']
+        assert make_index().search('"timeout read"') == []
+
+    def test_prefix(self):
+        assert [hit.qualname for hit in make_index().search('retr*')] == ['test_retry']
+        assert [hit.qualname for hit in make_index().search('conf* shall')] == ['test_timeout']
+
+    def test_update_file(self):
+        index = make_index()
+        index.update_file('test/test_file.py', [make_requirement('test_new', 'A new timeout requirement')])
+
+        assert [hit.qualname for hit in index.search('timeout')] == ['test_new']
+        assert index.search('retr*') == []
+        assert 'retried' not in index.terms
+
+    def test_round_trip(self):
+        index = SearchIndex.from_dict(make_index().to_dict())
+
+        assert [hit.qualname for hit in index.search('"read timeout"')] == ['test_timeout']
+        index.remove_file('test/test_file.py')
+        assert index.terms == []
+
+
+def test_cache_keeps_index(tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+
+    cache = ParseCache.load(cache_file, index=True)
+    cache.refresh_folder('./mock_functions/')
+    cache.save(cache_file)
+
+    loaded = ParseCache.load(cache_file, index=True)
+    assert loaded.refresh_folder('./mock_functions/') == ([], [])
+    assert [hit.test_id for hit in loaded.index.search('"never be touched" requires*')] == []
+    assert [hit.test_id for hit in loaded.index.search('"shall be caught"')] == [-1]
+    assert 5 in [hit.test_id for hit in loaded.index.search('"never be touched"')]
+
+
+def test_cache_records_malformed_file(tmp_path):
+    good = tmp_path / 'test_good.py'
+    good.write_text('def test_good():\n'
+                    '    """\n'
+                    '    TEST INFO:\n'
+                    '    TEST DESCRIPTION BEGIN\n'
+                    '    A good requirement\n'
+                    '    TEST DESCRIPTION END\n'
+                    '    """\n')
+    malformed = tmp_path / 'test_malformed.py'
+    malformed.write_text(good.read_text().replace('test_good', 'test_malformed')
+                         .replace('    TEST INFO:\n', '    TEST INFO:\n    TEST INFO:\n'))
+
+    cache = ParseCache()
+    cache.refresh([str(good), str(malformed)])
+
+    assert [requirement.name for requirement in cache.iter_requirements()] == ['test_good']
+    assert 'Multiple TEST INFO' in cache.files[str(malformed)].error
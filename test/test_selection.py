@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import subprocess
+
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.selection import SelectionIndex, changed_files, is_test, keyword_expression, node_id
+
+
+def make_requirements():
+    return [
+        RequirementRecord('TestKlass', 'TestKlass', 'class', 'test/test_a.py', 1, 'A class', False, 1, 'now'),
+        RequirementRecord('test_method', 'TestKlass.test_method', 'function', 'test/test_a.py', 5, 'A', False, 2, 'now'),
+        RequirementRecord('helper', 'helper', 'function', 'test/test_a.py', 9, 'Not a test', False, 3, 'now'),
+        RequirementRecord('test_b', 'test_b', 'function', 'test/test_b.py', 1, 'B', False, 4, 'now'),
+    ]
+
+
+def test_node_id():
+    assert node_id(make_requirements()[1]) == 'test/test_a.py::TestKlass::test_method'
+
+
+def test_is_test():
+    assert [is_test(r) for r in make_requirements()] == [True, True, False, True]
+
+
+def test_select_by_file_and_id():
+    index = SelectionIndex(make_requirements())
+
+    assert index.select(files=['./test/test_a.py'], test_ids=[4, 2]) == [
+        'test/test_a.py::TestKlass',
+        'test/test_a.py::TestKlass::test_method',
+        'test/test_b.py::test_b',
+    ]
+    assert index.select(test_ids=[3]) == []
+
+
+def test_keyword_expression():
+    assert keyword_expression(['a.py::TestKlass::test_x', 'b.py::test_y', 'c.py::test_x']) == 'test_x or test_y'
+
+
+def test_changed_files_includes_untracked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'test_old.py').write_text('')
+    (tmp_path / '.gitignore').write_text('ignored.py\n')
+    subprocess.run(['git', 'init', '-q'], check=True)
+    subprocess.run(['git', 'add', '.'], check=True)
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                    'commit', '-q', '-m', 'old'], check=True)
+
+    (tmp_path / 'test_old.py').write_text('# changed\n')
+    (tmp_path / 'test_new.py').write_text('')
+    (tmp_path / 'ignored.py').write_text('')
+
+    assert sorted(changed_files('HEAD')) == ['test_new.py', 'test_old.py']
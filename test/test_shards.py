@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.shards import shard_name, write_markdown_shards
+
+
+def make_requirements(description='A'):
+    return [
+        RequirementRecord('test_a', 'test_a', 'function', 'first/test_a.py', 1, description, False, 1, 'now'),
+        RequirementRecord('test_b', 'test_b', 'function', 'second/sub/test_b.py', 1, 'B', False, 2, 'now'),
+        RequirementRecord('test_c', 'test_c', 'function', 'test_c.py', 1, 'C', False, 3, 'now'),
+    ]
+
+
+def test_shard_name():
+    assert [shard_name(r.filename) for r in make_requirements()] == ['first', 'second', '_root']
+
+
+def test_shard_name_reserved():
+    assert shard_name('index/test_a.py') == '_index'
+    assert shard_name('_root/test_a.py') == '__root'
+    assert shard_name('./_index/test_a.py') == '__index'
+    assert shard_name('../other/test_a.py') == '_up1_other'
+    assert shard_name('../../test_a.py') == '_up2'
+
+
+def test_only_changed_shards_are_written(tmp_path):
+    path = str(tmp_path / 'report')
+
+    assert write_markdown_shards(make_requirements(), path) == {'written': 3, 'unchanged': 0, 'removed': 0}
+    assert sorted(os.listdir(path)) == ['.shards.json', '_root.md', 'first.md', 'index.md', 'second.md']
+
+    with open(os.path.join(path, 'index.md')) as f:
+        assert '- [first](first.md): 1 requirements in 1 files\n' in f.read()
+
+    assert write_markdown_shards(make_requirements(), path)['written'] == 0
+
+    requirements = make_requirements('A changed')[:2]
+    assert write_markdown_shards(requirements, path) == {'written': 1, 'unchanged': 1, 'removed': 1}
+
+    with open(os.path.join(path, 'first.md')) as f:
+        assert 'A changed' in f.read()
+
+
+def test_shards_keyed_on_signatures(tmp_path, monkeypatch):
+    from easy_python_requirements import config
+
+    path = str(tmp_path / 'report')
+    signatures = {'first/test_a.py': [1, 10], 'second/sub/test_b.py': [1, 20], 'test_c.py': [1, 30]}
+
+    assert write_markdown_shards(make_requirements(), path, signatures=signatures)['written'] == 3
+
+    # The records are not compared, only the signatures of their files
+    assert write_markdown_shards(make_requirements('A changed'), path, signatures=signatures)['written'] == 0
+
+    signatures['first/test_a.py'] = [2, 12]
+    assert write_markdown_shards(make_requirements('A changed'), path, signatures=signatures) == {
+        'written': 1, 'unchanged': 2, 'removed': 0}
+
+    with open(os.path.join(path, '.shards.json')) as f:
+        hashes = json.load(f)
+
+    monkeypatch.setitem(config, 'requirement_begin', 'REQUIREMENT BEGIN')
+    write_markdown_shards(make_requirements('A changed'), path, signatures=signatures)
+
+    with open(os.path.join(path, '.shards.json')) as f:
+        assert all(value != hashes[name] for name, value in json.load(f).items())
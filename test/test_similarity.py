@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+from easy_python_requirements.easy_python_requirements import main
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.similarity import (MinHasher, SignatureCache, find_near_duplicates, jaccard,
+                                                 shingles)
+
+DESCRIPTION = 'The client shall retry a read three times when the socket times out before reporting an error'
+
+
+def make_requirement(name, description):
+    return RequirementRecord(name, name, 'function', 'test_file.py', 1, description)
+
+
+def test_shingles():
+    assert shingles('One two') == {'one two'}
+    assert shingles('One two three four') == {'one two three', 'two three four'}
+    assert shingles('') == set()
+
+
+def test_signature_estimates_similarity():
+    hasher = MinHasher(128)
+    edited = DESCRIPTION.replace('three times', 'three times at most')
+
+    first, second = hasher.signature(DESCRIPTION), hasher.signature(edited)
+    estimate = sum(a == b for a, b in zip(first, second)) / len(first)
+
+    assert abs(estimate - jaccard(shingles(DESCRIPTION), shingles(edited))) < 0.2
+
+
+def test_find_near_duplicates():
+    requirements = [
+        make_requirement('test_original', DESCRIPTION),
+        make_requirement('test_copy', DESCRIPTION.replace('an error', 'the error')),
+        make_requirement('test_other', 'Writing a file shall never truncate the contents already on disk'),
+    ]
+
+    pairs = find_near_duplicates(requirements, threshold=0.7)
+
+    assert [(pair.first.name, pair.second.name) for pair in pairs] == [('test_original', 'test_copy')]
+    assert 0.7 <= pairs[0].similarity < 1
+
+
+def test_signatures_are_cached(tmp_path):
+    filename = str(tmp_path / 'signatures.json')
+
+    cache = SignatureCache()
+    signature = cache.signature(DESCRIPTION)
+    cache.save(filename)
+
+    loaded = SignatureCache.load(filename)
+    assert len(loaded.signatures) == 1
+    assert loaded.signature(DESCRIPTION) == signature
+
+    assert SignatureCache.load(filename, MinHasher(32)).signatures == {}
+
+
+def test_main_near_duplicates_keeps_warnings_out_of_stdout(tmp_path, capsys):
+    folder = tmp_path / 'tests'
+    folder.mkdir()
+    docstring = '    """\n    TEST DESCRIPTION BEGIN\n    {0}\n    TEST DESCRIPTION END\n    """\n'.format(DESCRIPTION)
+    (folder / 'test_good.py').write_text('def test_original():\n' + docstring + 'def test_copy():\n' + docstring)
+    (folder / 'test_broken.py').write_text('def test_broken(:\n' + docstring)
+
+    assert main([str(folder), 'n', '--cache', str(tmp_path / 'cache.json'),
+                 '--signatures', str(tmp_path / 'signatures.json')]) == 0
+
+    captured = capsys.readouterr()
+    assert len(json.loads(captured.out)) == 1
+    assert 'Could not record' in captured.err
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from easy_python_requirements.exceptions import SnapshotError
+from easy_python_requirements.records import RequirementRecord
+from easy_python_requirements.snapshot import SnapshotReader, write_snapshot
+
+
+def make_requirements():
+    return [
+        RequirementRecord('method', 'Klass.method', 'function', 'pkg/mod.py', 5, 'A méthode', False, 7, 'now'),
+        RequirementRecord('Klass', 'Klass', 'class', 'pkg/mod.py', 1, 'A class', False, 3, 'then', True),
+        RequirementRecord('new', 'new', 'function', 'pkg/other.py', 9, 'Not tagged yet'),
+    ]
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / 'requirements.snapshot')
+    requirements = make_requirements()
+
+    assert write_snapshot(requirements, filename) == 3
+
+    with SnapshotReader(filename) as reader:
+        assert len(reader) == 3
+        assert [r.test_id for r in reader] == [-1, 3, 7]
+        assert reader.get(7) == requirements[0]
+        assert reader.get(3) == requirements[1]
+        assert reader.find(-1) == [requirements[2]]
+        assert reader.get(4) is None
+
+
+def test_duplicate_ids(tmp_path):
+    filename = str(tmp_path / 'requirements.snapshot')
+    requirements = make_requirements()
+    requirements[1].test_id = 7
+
+    write_snapshot(requirements, filename)
+
+    with SnapshotReader(filename) as reader:
+        assert len(reader.find(7)) == 2
+
+
+def test_not_a_snapshot(tmp_path):
+    filename = str(tmp_path / 'requirements.snapshot')
+    with open(filename, 'wb') as f:
+        f.write(b'not a snapshot at all, really not')
+
+    with pytest.raises(SnapshotError):
+        SnapshotReader(filename)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from easy_python_requirements.records import record_file
+from easy_python_requirements.source import iter_docstrings, read_source, record_source
+
+
+def test_iter_docstrings():
+    filename = 'mock_functions/test_module_stuff.py'
+    docstrings = list(iter_docstrings(read_source(filename), filename))
+
+    assert [d.qualname for d in docstrings] == [
+        'FirstClass',
+        'FirstClass.function_that_should_not_change',
+        'SecondClass',
+        'SecondClass.this_doc_string_should_change',
+        'ThirdClass.this_should_be_ignored',
+    ]
+    assert docstrings[0].info_lines() == [
+        (6, 'TEST INFO: {"time_stamp": "2016-07-02T10:45:57.539011", "test_id": 4}'),
+    ]
+
+
+def test_record_source_matches_import():
+    filename = 'mock_functions/test_module_stuff.py'
+
+    assert record_source(read_source(filename), filename) == record_file(filename).requirements
+
+
+def test_record_source_without_requirements():
+    assert record_source('def test_nothing():\n    """Nothing here"""\n', 'test_nothing.py') == []
+
+
+ESCAPED = '''def test_escaped():
+    """
+    Lines are joined with '\\n'
+    TEST INFO:
+    TEST DESCRIPTION BEGIN
+    An escaped requirement
+    TEST DESCRIPTION END
+    """
+'''
+
+
+def test_info_lines_with_escapes():
+    docstring, = iter_docstrings(ESCAPED, 'test_escaped.py')
+
+    assert docstring.info_lines() == [(3, 'TEST INFO:')]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+from easy_python_requirements.stats import RequirementCounts, RequirementStats, count_source
+
+SOURCE = '''
+def test_tagged():
+    """
+    TEST INFO: {"test_id": 1, "time_stamp": "2016-07-01T10:45:56.539011"}
+    TEST DESCRIPTION BEGIN
+    Tagged
+    TEST DESCRIPTION END
+    """
+
+
+def test_untagged():
+    """
+    TEST DESCRIPTION BEGIN
+    Untagged
+    TEST DESCRIPTION END
+    """
+
+
+def test_needs_update():
+    """
+    TEST INFO:
+    TEST DESCRIPTION BEGIN
+    Needs an update
+    TEST DESCRIPTION END
+    """
+
+
+def test_malformed():
+    """
+    TEST INFO: {"test_id": 2
+    TEST DESCRIPTION BEGIN
+    Malformed
+    TEST DESCRIPTION END
+    """
+'''
+
+
+def test_count_source():
+    assert count_source(SOURCE, 'test_file.py') == RequirementCounts(1, 1, 1, 1)
+
+
+def test_refresh_only_counts_changed_files(tmp_path):
+    folder = tmp_path / 'folder'
+    folder.mkdir()
+    first, second = str(folder / 'test_first.py'), str(folder / 'test_second.py')
+    for filename in (first, second):
+        with open(filename, 'w') as f:
+            f.write(SOURCE)
+
+    stats = RequirementStats()
+    assert stats.refresh([first, second]) == ([first, second], [])
+    assert stats.directories['.'] == RequirementCounts(2, 2, 2, 2)
+
+    with open(second, 'w') as f:
+        f.write(SOURCE.replace('TEST INFO:\n', 'TEST INFO: {"test_id": 3, "time_stamp": "now"}\n'))
+    os.utime(second, ns=(1, 1))
+
+    assert stats.refresh([first, second]) == ([second], [])
+    assert stats.directories['.'] == RequirementCounts(3, 2, 1, 2)
+
+    assert stats.refresh([second]) == ([], [first])
+    assert stats.directories['.'] == RequirementCounts(2, 1, 0, 1)
+
+
+def test_prometheus(tmp_path):
+    filename = str(tmp_path / 'test_file.py')
+    with open(filename, 'w') as f:
+        f.write(SOURCE)
+
+    stats = RequirementStats()
+    stats.refresh([filename])
+    metrics = stats.to_prometheus()
+
+    assert metrics.startswith('# HELP easy_python_requirements_requirements')
+    assert 'easy_python_requirements_requirements{directory=".",status="untagged"} 1\n' in metrics
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from easy_python_requirements.test_info import (append_json_info,
+                                                line_spans,
+                                                source_encoding,
+                                                write_json_infos,
+                                                )
+
+
+def test_source_encoding():
+    assert source_encoding(b'x = 1\n') == 'utf-8'
+    assert source_encoding(b'\xef\xbb\xbfx = 1\n') == 'utf-8'
+    assert source_encoding(b'# -*- coding: latin-1 -*-\nx = 1\n') == 'iso-8859-1'
+
+
+def test_line_spans():
+    contents = b'first\r\nsecond\nthird'
+
+    assert line_spans(contents, [2, 0, 1]) == {0: (0, 5), 1: (7, 13), 2: (14, 19)}
+
+
+def test_append_keeps_crlf(tmp_path):
+    filename = tmp_path / 'test_crlf.py'
+    filename.write_bytes(b'"""\r\nTEST INFO:\r\nTEST DESCRIPTION BEGIN\r\n"""\r\n')
+
+    append_json_info(str(filename), 1, '{"test_id": 1}')
+
+    assert filename.read_bytes() == b'"""\r\nTEST INFO: {"test_id": 1}\r\nTEST DESCRIPTION BEGIN\r\n"""\r\n'
+
+
+def test_write_keeps_encoding(tmp_path):
+    filename = tmp_path / 'test_latin.py'
+    original = '# -*- coding: latin-1 -*-\n"""\nCafé TEST INFO: old\nTEST INFO:\n"""\n'.encode('latin-1')
+    filename.write_bytes(original)
+
+    write_json_infos(str(filename), {2: '{"test_id": 1}', 3: '{"test_id": 2}'})
+
+    assert filename.read_bytes() == '# -*- coding: latin-1 -*-\n"""\nCafé TEST INFO: {"test_id": 1}\n' \
+                                    'TEST INFO: {"test_id": 2}\n"""\n'.encode('latin-1')
+
+
+def test_write_keeps_bom_and_missing_final_newline(tmp_path):
+    filename = tmp_path / 'test_bom.py'
+    filename.write_bytes(b'\xef\xbb\xbf"""TEST INFO:')
+
+    write_json_infos(str(filename), {0: '{"test_id": 1}'})
+
+    assert filename.read_bytes() == b'\xef\xbb\xbf"""TEST INFO: {"test_id": 1}'
@@ -79,3 +79,22 @@ class TestGetters:
 
         module_list = util.get_modules(mock_functions.test_module_stuff)
         assert any('__loader__' in item[0] for item in module_list)
+
+
+class TestPathTrie:
+    def test_directories_before_files(self):
+        trie = util.get_sorted_file_directory_structure(['./top.py', 'folder/b.py', 'folder\\sub/c.py', 'folder/a.py'])
+
+        assert [(kind, number, path) for kind, number, path, _ in trie.walk()] == [
+            ('directory', (1,), 'folder'),
+            ('directory', (1, 1), 'folder/sub'),
+            ('file', (1, 1, 1), 'folder\\sub/c.py'),
+            ('file', (1, 2), 'folder/b.py'),
+            ('file', (1, 3), 'folder/a.py'),
+            ('file', (2,), './top.py'),
+        ]
+
+    def test_keeps_values(self):
+        trie = util.get_sorted_file_directory_structure(['folder/a.py'], {'folder/a.py': 'value'})
+
+        assert trie.directories['folder'].files['folder/a.py'] == 'value'